@@ -16,11 +16,13 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-from typing import cast
+import json
+from typing import AsyncIterator, cast
 from logging import Logger
 # Librerías externas
 from fastapi import APIRouter, HTTPException
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 # Librerías internas
 import context.singleton as CtxSingleton
 from context.context_manager import ContextManager
@@ -50,8 +52,9 @@ async def get_response(query:BaseQueryDTO) -> BaseResponseDTO:
     """
     # Try-Except para manejo de errores.
     try:
-        # Obtiene la respuesta del modelo
-        response:str = __CONVERSATION_MANAGER.chat(query=query.content)
+        # Obtiene la respuesta del modelo sin bloquear el servidor, de modo que las consultas
+        # concurrentes no se bloqueen entre sí y sus embeddings puedan agruparse.
+        response:str = await __CONVERSATION_MANAGER.achat(query=query.content)
         
         # Retorna la respuesta generada.
         return BaseResponseDTO(content=response)
@@ -63,3 +66,49 @@ async def get_response(query:BaseQueryDTO) -> BaseResponseDTO:
                               type=console.MessageType.ERROR)
         # Lanza una excepción.
         raise HTTPException(status_code=500, detail='Internal Server Error.')
+
+
+
+async def stream_events(query:str) -> AsyncIterator[str]:
+    """
+    Genera los eventos (Server-Sent Events) con los fragmentos de la respuesta. Cada
+    fragmento se envía como un evento `message` con un JSON `{"content": ...}`. Solo si el
+    modelo completa la respuesta se envía un evento `done`; si ocurre algún error o la
+    respuesta queda incompleta, se envía un evento `error` en su lugar.
+    
+    Args:
+        query (str): Consulta del usuario.
+    Returns:
+        AsyncIterator[str]: Eventos a enviar.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Envía cada fragmento de la respuesta.
+        async for part in __CONVERSATION_MANAGER.astream(query=query):
+            yield f"data: {json.dumps({'content': part}, ensure_ascii=False)}\n\n"
+        # Indica el final de la respuesta (astream lanza una excepción si está incompleta).
+        yield "event: done\ndata: {}\n\n"
+    
+    # Si ocurre algún error.
+    except Exception as e:
+        # Imprime información.
+        console.print_message(message=f'chat::stream_events() -> [{type(e).__name__}] No se pudo obtener respuesta. Trace: {e}',
+                              type=console.MessageType.ERROR)
+        # Envía el error (la respuesta ya ha comenzado, por lo que no se puede cambiar el estado).
+        yield f"event: error\ndata: {json.dumps({'detail': 'Internal Server Error.'})}\n\n"
+
+
+@__ROUTER.post('/stream')
+async def get_response_stream(query:BaseQueryDTO) -> StreamingResponse:
+    """
+    Solicita una respuesta al modelo de Ollama y la envía a medida que se genera,
+    mediante Server-Sent Events.
+    
+    Args:
+        query (BaseQueryDTO): Contiene la información de la consulta del cliente.
+    Returns:
+        StreamingResponse: Respuesta con los eventos.
+    """
+    # Retorna la respuesta por streaming.
+    return StreamingResponse(stream_events(query=query.content), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
\ No newline at end of file
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: rag.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene los endpoints del RAG del servidor.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+
+# Librerías externas
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+# Librerías internas
+import context.singleton as CtxSingleton
+from model.query import BatchQueryDTO
+from model.response import RagStatsResponseDTO, ContextBatchResponseDTO
+from core.services.rag import RagService
+from utils import console
+
+
+# ---- PARÁMETROS ---- #
+__ROUTER:APIRouter = APIRouter()
+
+
+# ---- FUNCIONES ---- #
+@__ROUTER.get('/stats')
+async def get_stats() -> RagStatsResponseDTO:
+    """
+    Retorna las estadísticas de las cachés del RAG (aciertos, fallos y ocupación).
+
+    Raises:
+        HTTPException: En caso de que haya algún error.
+    Returns:
+        RagStatsResponseDTO: Estadísticas de las cachés.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Retorna las estadísticas.
+        return CtxSingleton.get_ctx().get_service(key='rag', t=RagService).Stats
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Imprime información.
+        console.print_message(message=f'rag::get_stats() -> [{type(e).__name__}] No se pudo obtener las estadísticas. Trace: {e}',
+                              type=console.MessageType.ERROR)
+        # Lanza una excepción.
+        raise HTTPException(status_code=500, detail='Internal Server Error.')
+
+
+@__ROUTER.post('/context/batch')
+async def get_context_batch(query:BatchQueryDTO) -> ContextBatchResponseDTO:
+    """
+    Retorna el contexto relevante de varias consultas, obtenido con una única búsqueda
+    por lotes.
+
+    Args:
+        query (BatchQueryDTO): Contiene las consultas del cliente.
+    Raises:
+        HTTPException: En caso de que haya algún error.
+    Returns:
+        ContextBatchResponseDTO: Contexto de cada consulta, en el mismo orden.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Obtiene el contexto en otro hilo para no bloquear el servidor.
+        rag_service:RagService = CtxSingleton.get_ctx().get_service(key='rag', t=RagService)
+        contexts = await run_in_threadpool(rag_service.get_relevant_context_batch, queries=query.queries)
+        
+        # Retorna el contexto.
+        return ContextBatchResponseDTO(contexts=contexts)
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Imprime información.
+        console.print_message(message=f'rag::get_context_batch() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}',
+                              type=console.MessageType.ERROR)
+        # Lanza una excepción.
+        raise HTTPException(status_code=500, detail='Internal Server Error.')
\ No newline at end of file
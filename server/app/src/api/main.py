@@ -15,15 +15,36 @@
 
 # ---- IMPORTS ---- #
 # Librerías estándar
+from contextlib import asynccontextmanager
 # Librerías externas
 from fastapi import FastAPI
 # Librerías internas
+import context.singleton as CtxSingleton
+from core.services.ollama import AsyncOllamaService
 from .endpoints.chat import __ROUTER as chat_router
+from .endpoints.rag import __ROUTER as rag_router
+
+
+# ---- FUNCIONES ---- #
+@asynccontextmanager
+async def lifespan(app:FastAPI):
+    """
+    Gestiona el ciclo de vida del servidor: al detenerse, cierra las conexiones del
+    cliente asíncrono de Ollama.
+    
+    Args:
+        app (FastAPI): Aplicación.
+    """
+    # Ejecuta el servidor.
+    yield
+    # Cierra las conexiones con Ollama.
+    await CtxSingleton.get_ctx().get_service(key='ollama_async', t=AsyncOllamaService).close()
 
 
 # ---- PARÁMETROS ---- #
-__APP:FastAPI = FastAPI()
+__APP:FastAPI = FastAPI(lifespan=lifespan)
 
 
 # ---- INICIALIZACIÓN ---- #
-__APP.include_router(chat_router, prefix="/chat", tags=["chat"])      # Endpoint para el chat.
\ No newline at end of file
+__APP.include_router(chat_router, prefix="/chat", tags=["chat"])      # Endpoint para el chat.
+__APP.include_router(rag_router, prefix="/rag", tags=["rag"])         # Endpoint para el RAG.
\ No newline at end of file
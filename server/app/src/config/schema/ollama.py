@@ -16,7 +16,7 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-
+from typing import List
 # Librerías externas
 from pydantic import BaseModel
 from pydantic import Field
@@ -25,6 +25,52 @@ from .common import HostConfig, BaseModelConfig
 
 
 # ---- CLASES ---- #
+class ClientConfig(BaseModel):
+    """
+    Almacena la configuración del cliente HTTP asíncrono de un servicio.
+    
+    Attributes:
+        maxConnections (int): Número máximo de conexiones simultáneas.
+        maxKeepalive (int): Número máximo de conexiones abiertas en reposo.
+        keepaliveExpiry (float): Tiempo (s) que una conexión en reposo permanece abierta.
+        connectTimeout (float): Tiempo máximo (s) para establecer una conexión.
+        readTimeout (float): Tiempo máximo (s) sin recibir datos de una respuesta. Incluye
+            la evaluación del prompt, por lo que debe ser amplio.
+        poolTimeout (float): Tiempo máximo (s) de espera por una conexión libre.
+    """
+    # -- Atributos -- #
+    maxConnections:int      = Field(default=32, ge=1)
+    maxKeepalive:int        = Field(default=16, ge=0)
+    keepaliveExpiry:float   = Field(default=30.0, gt=0)
+    connectTimeout:float    = Field(default=5.0, gt=0)
+    readTimeout:float       = Field(default=300.0, gt=0)
+    poolTimeout:float       = Field(default=30.0, gt=0)
+
+
+class LifecycleConfig(BaseModel):
+    """
+    Almacena la configuración del ciclo de vida del modelo en Ollama.
+    
+    Attributes:
+        enabled (bool): Si se vigila la residencia del modelo en segundo plano.
+        pollInterval (float): Tiempo (s) entre consultas del estado del modelo (/api/ps).
+        refreshMargin (float): Tiempo (s) antes de la expiración en el que se renueva el
+            `keep_alive` del modelo.
+        idleTimeout (float): Tiempo (s) sin peticiones tras el que se descarga el modelo.
+            Con 0 no se descarga nunca.
+        prewarm (List[str]): Horas ('HH:MM') con tráfico previsto. El modelo se carga
+            antes de cada una aunque esté inactivo.
+        prewarmLead (float): Antelación (s) con la que se carga el modelo.
+    """
+    # -- Atributos -- #
+    enabled:bool            = Field(default=True)
+    pollInterval:float      = Field(default=15.0, gt=0)
+    refreshMargin:float     = Field(default=120.0, ge=0)
+    idleTimeout:float       = Field(default=3600.0, ge=0)
+    prewarm:List[str]       = Field(default_factory=list)
+    prewarmLead:float       = Field(default=600.0, ge=0)
+
+
 class ServiceConfig(BaseModel):
     """
     Almacena la configuración de un servicio.
@@ -33,11 +79,19 @@ class ServiceConfig(BaseModel):
         name (str): Nombre del servicio.
         host (HostConfig): Configuración del host.
         model (BaseModelConfig): Configuración del modelo.
+        client (ClientConfig): Configuración del cliente HTTP asíncrono.
+        keepAlive (str): Tiempo que Ollama mantiene el modelo cargado tras cada petición
+            (p. ej. '30m', o '-1m' para no descargarlo). Mantenerlo cargado conserva
+            también la caché del prompt entre turnos.
+        lifecycle (LifecycleConfig): Configuración del ciclo de vida del modelo.
     """
     # -- Atributos -- #
     name:str = Field(default='Default')
     host:HostConfig
     model:BaseModelConfig
+    client:ClientConfig = Field(default_factory=ClientConfig)
+    keepAlive:str = Field(default='30m')
+    lifecycle:LifecycleConfig = Field(default_factory=LifecycleConfig)
 
 
 class OllamaConfig(BaseModel):
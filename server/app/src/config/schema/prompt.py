@@ -29,8 +29,30 @@ class PromptConfig(BaseModel):
     
     Attributes:
         root (str): Directorio raiz de los templates.
+        mode (str): Modo de conversación con el modelo:
+            - GENERATE: Un único prompt por petición (/api/generate).
+            - CHAT: Mensajes estructurados (/api/chat). El sistema y el historial forman
+                un prefijo estable que Ollama reutiliza entre peticiones.
+        layout (str): Disposición del prompt. Solo se aplica en modo GENERATE; en modo
+            CHAT se ignora, ya que el mensaje de sistema ya forma un prefijo estable:
+            - DEFAULT: Prompt completo de `chatPrompt`.
+            - PREFIX: Texto fijo de `chatPrefix` (generado una única vez) seguido de las
+                secciones variables de `chatSuffix`. Las peticiones comparten el mismo
+                prefijo, que Ollama reutiliza de su caché.
         chatPrompt (str): Nombre del fichero con el prompt del chat.
+        chatPrefix (str): Nombre del fichero con el texto fijo del prompt (PREFIX).
+        chatSuffix (str): Nombre del fichero con las secciones variables del prompt
+            (PREFIX).
+        chatSystem (str): Nombre del fichero con el mensaje de sistema del modo CHAT.
+        chatContext (str): Nombre del fichero con el mensaje de contexto y consulta del
+            modo CHAT.
     """
     # -- Atributos -- #
     root:str        = Field(default='.server/etc/template')
-    chatPrompt:str  = Field(default='chatPrompt.j2')
\ No newline at end of file
+    mode:str        = Field(default='GENERATE')
+    layout:str      = Field(default='DEFAULT')
+    chatPrompt:str  = Field(default='chatPrompt.j2')
+    chatPrefix:str  = Field(default='chatPrefix.j2')
+    chatSuffix:str  = Field(default='chatSuffix.j2')
+    chatSystem:str  = Field(default='chatSystem.j2')
+    chatContext:str = Field(default='chatContext.j2')
\ No newline at end of file
@@ -16,7 +16,7 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-
+from typing import Optional
 # Librerías externas
 from pydantic import BaseModel
 from pydantic import Field
@@ -25,17 +25,240 @@ from .common import EmbeddingModelConfig
 
 
 # ---- CLASES ---- #
+class IndexerConfig(BaseModel):
+    """
+    Almacena la configuración del indexador en segundo plano.
+    
+    Attributes:
+        enabled (bool): Si se ejecuta el indexador en segundo plano.
+        debounce (int): Tiempo (ms) sin cambios antes de indexar los ficheros modificados.
+        batchWindow (int): Tiempo máximo (ms) durante el que se agrupan cambios.
+        pollInterval (int): Intervalo (ms) de sondeo en caso de no disponer de inotify.
+    """
+    # -- Atributos -- #
+    enabled:bool        = Field(default=True)
+    debounce:int        = Field(default=1000, ge=1)
+    batchWindow:int     = Field(default=5000, ge=1)
+    pollInterval:int    = Field(default=5000, ge=100)
+
+
+class IngestionConfig(BaseModel):
+    """
+    Almacena la configuración de la etapa de conversión y separación de la ingesta.
+    
+    Attributes:
+        workers (int): Número de procesos que convierten y separan los ficheros. Con 0
+            se separan en el propio proceso.
+        fileTimeout (int): Tiempo máximo (s) para convertir y separar un fichero.
+        maxTasksPerChild (int): Número de ficheros tras los que se reemplaza cada proceso.
+        queueSize (int): Número máximo de ficheros en espera entre dos etapas de la ingesta.
+        checkpointFiles (int): Número de ficheros escritos tras los que se almacena el
+            manifiesto.
+        writeBatchSize (int): Número de puntos por lote de escritura en el almacén.
+        indexingThreshold (int): Umbral de indexado de Qdrant que se restaura al terminar
+            una carga (durante la carga se desactiva el indexado).
+    """
+    # -- Atributos -- #
+    workers:int             = Field(default=2, ge=0)
+    fileTimeout:int         = Field(default=300, ge=1)
+    maxTasksPerChild:int    = Field(default=50, ge=1)
+    queueSize:int           = Field(default=4, ge=1)
+    checkpointFiles:int     = Field(default=100, ge=1)
+    writeBatchSize:int      = Field(default=256, ge=1)
+    indexingThreshold:int   = Field(default=20000, ge=0)
+
+
+class BatchingConfig(BaseModel):
+    """
+    Almacena la configuración del cálculo de embeddings por lotes en la ingesta.
+    
+    Attributes:
+        minBatchSize (int): Tamaño inicial (y mínimo) del lote.
+        maxBatchSize (int): Tamaño máximo del lote.
+        maxBatchTokens (int): Número máximo de tokens (con relleno) por lote. Limita la
+            memoria empleada.
+        maxBatchLatency (int): Latencia máxima (ms) por lote. El lote crece mientras no
+            se alcance.
+    """
+    # -- Atributos -- #
+    minBatchSize:int        = Field(default=8, ge=1)
+    maxBatchSize:int        = Field(default=256, ge=1)
+    maxBatchTokens:int      = Field(default=32768, ge=1)
+    maxBatchLatency:int     = Field(default=2000, ge=1)
+
+
+class EmbeddingCacheConfig(BaseModel):
+    """
+    Almacena la configuración de la caché persistente de embeddings de fragmentos.
+    
+    Attributes:
+        enabled (bool): Si se emplea la caché.
+        cacheDir (str): Directorio raiz de la caché.
+        maxEntries (int): Número máximo de embeddings almacenados.
+    """
+    # -- Atributos -- #
+    enabled:bool        = Field(default=True)
+    cacheDir:str        = Field(default='rag/cache/embeddings')
+    maxEntries:int      = Field(default=100000, ge=1)
+
+
+class QueryCacheConfig(BaseModel):
+    """
+    Almacena la configuración de la caché de embeddings de consultas.
+    
+    Attributes:
+        enabled (bool): Si se emplea la caché.
+        maxEntries (int): Número máximo de consultas almacenadas.
+        ttl (int): Tiempo (s) de vida de cada consulta.
+    """
+    # -- Atributos -- #
+    enabled:bool        = Field(default=True)
+    maxEntries:int      = Field(default=1024, ge=1)
+    ttl:int             = Field(default=3600, ge=1)
+
+
+class QuerySchedulerConfig(BaseModel):
+    """
+    Almacena la configuración de la agrupación de embeddings de consultas concurrentes.
+    
+    Attributes:
+        enabled (bool): Si se agrupan las consultas concurrentes.
+        maxBatch (int): Número máximo de consultas por lote.
+        maxWait (int): Tiempo máximo (ms) que se espera a otras consultas.
+    """
+    # -- Atributos -- #
+    enabled:bool        = Field(default=True)
+    maxBatch:int        = Field(default=32, ge=1)
+    maxWait:int         = Field(default=5, ge=0)
+
+
+class RetrievalCacheConfig(BaseModel):
+    """
+    Almacena la configuración de la caché de resultados de recuperación.
+    
+    Attributes:
+        enabled (bool): Si se emplea la caché.
+        maxEntries (int): Número máximo de resultados almacenados.
+        maxBytes (int): Número máximo de bytes de contenido almacenados.
+    """
+    # -- Atributos -- #
+    enabled:bool        = Field(default=True)
+    maxEntries:int      = Field(default=512, ge=1)
+    maxBytes:int        = Field(default=16777216, ge=1)
+
+
+class EmbedderConfig(BaseModel):
+    """
+    Almacena la configuración del backend de los modelos de embeddings.
+    
+    Attributes:
+        backend (str): Backend de ejecución (TORCH o ONNX).
+        onnxDir (str): Directorio raiz de los modelos exportados a ONNX.
+        quantize (bool): Si el modelo ONNX se cuantiza dinámicamente a int8.
+        quantizationConfig (str): Configuración de cuantización (arm64, avx2, avx512 o avx512_vnni).
+        intraOpThreads (int): Hilos de ONNX Runtime dentro de cada operación (0 para su valor por defecto).
+        interOpThreads (int): Hilos de ONNX Runtime entre operaciones (0 para su valor por defecto).
+    """
+    # -- Atributos -- #
+    backend:str                 = Field(default='TORCH')
+    onnxDir:str                 = Field(default='rag/cache/onnx')
+    quantize:bool               = Field(default=True)
+    quantizationConfig:str      = Field(default='avx2')
+    intraOpThreads:int          = Field(default=0, ge=0)
+    interOpThreads:int          = Field(default=1, ge=0)
+
+
+class HybridConfig(BaseModel):
+    """
+    Almacena la configuración de la recuperación híbrida (léxica BM25 y densa).
+    
+    Attributes:
+        enabled (bool): Si se emplea el índice léxico junto al vectorial.
+        candidates (int): Fragmentos obtenidos del índice léxico antes de la fusión.
+        rrfK (int): Constante de suavizado de Reciprocal Rank Fusion.
+        k1 (float): Parámetro de saturación de la frecuencia de BM25.
+        b (float): Parámetro de normalización por longitud de BM25.
+        identifierShortcut (bool): Si las búsquedas de identificadores se responden solo
+            con el índice léxico, sin calcular el embedding de la consulta.
+    """
+    # -- Atributos -- #
+    enabled:bool                = Field(default=True)
+    candidates:int              = Field(default=50, ge=1)
+    rrfK:int                    = Field(default=60, ge=1)
+    k1:float                    = Field(default=1.2, ge=0)
+    b:float                     = Field(default=0.75, ge=0, le=1)
+    identifierShortcut:bool     = Field(default=True)
+
+
+class RerankerConfig(BaseModel):
+    """
+    Almacena la configuración de la reordenación del contexto con un cross-encoder.
+    
+    Attributes:
+        enabled (bool): Si se reordena el contexto recuperado.
+        tag (str): Modelo cross-encoder (instalado en el directorio de modelos).
+        topN (int): Número de fragmentos que se conservan para el prompt.
+        batchSize (int): Fragmentos puntuados por pasada del modelo.
+        maxLength (int): Número máximo de tokens de cada par consulta-fragmento.
+        budget (int): Tiempo máximo (ms) de reordenación por consulta. Se comprueba
+            una vez puntuados N fragmentos y un lote más; los no puntuados se descartan.
+        margin (float): Diferencia de puntuación a partir de la cual se dejan de puntuar
+            fragmentos: si el último lote queda por debajo del fragmento N en más del
+            margen, los siguientes (peor recuperados) no se puntúan.
+        cacheEntries (int): Número máximo de fragmentos tokenizados en caché.
+    """
+    # -- Atributos -- #
+    enabled:bool        = Field(default=False)
+    tag:str             = Field(default='cross-encoder/mmarco-mMiniLMv2-L12-H384-v1')
+    topN:int            = Field(default=4, ge=1)
+    batchSize:int       = Field(default=4, ge=1)
+    maxLength:int       = Field(default=256, ge=16)
+    budget:int          = Field(default=150, ge=1)
+    margin:float        = Field(default=3.0, ge=0)
+    cacheEntries:int    = Field(default=4096, ge=1)
+
+
+class SelectionConfig(BaseModel):
+    """
+    Almacena la configuración de la selección del contexto que se añade al prompt.
+    
+    Attributes:
+        enabled (bool): Si se selecciona el contexto recuperado.
+        minScore (Optional[float]): Similitud coseno mínima (de -1 a 1) de un fragmento
+            con la consulta en la búsqueda densa. Se aplica a `denseScore`, por lo que no
+            depende de la fusión RRF ni del cross-encoder; los fragmentos solo léxicos no
+            se descartan. None para no aplicarla.
+        gapRatio (float): Fracción del rango de puntuaciones que debe ocupar el mayor salto
+            entre dos fragmentos consecutivos para cortar en él (1 para no cortar).
+        maxTokens (int): Número máximo de tokens (estimados) del contexto.
+        minChunks (int): Número mínimo de fragmentos que se conservan.
+    """
+    # -- Atributos -- #
+    enabled:bool                = Field(default=True)
+    minScore:Optional[float]    = Field(default=None)
+    gapRatio:float              = Field(default=0.5, gt=0, le=1)
+    maxTokens:int               = Field(default=2048, ge=1)
+    minChunks:int               = Field(default=1, ge=1)
+
+
 class DocumentConfig(BaseModel):
     """
     Almacena la configuración del RAG  de documentos.
     
     Attributes:
-        framework (str): Framework empleado.
+        framework (str): Framework empleado (HAYSTACK, LANGCHAIN o NATIVE).
         docDir (str): Directorio raiz con los documentos.
         storeDir (str): Directorio raiz con los almacenes de documentos.
         splitLength (int): Tamaño del chunk en tokens.
         splitOverlap (int): Overlap para mantener xontexto entre chunks.
         topK (int): El número de chunks más relevantes.
+        index (str): Índice del framework NATIVE (FLAT exacto o IVF aproximado).
+        nlist (int): Número de listas del índice IVF (0 para calcularlo según el corpus).
+        nprobe (int): Número de listas recorridas en cada búsqueda IVF.
+        rebuildRatio (float): Variación relativa del corpus que provoca reentrenar el IVF.
+        minTrainSize (int): Número mínimo de chunks para usar el IVF (por debajo es exacto).
+        quantization (str): Cuantización de los vectores del framework NATIVE (NONE, INT8 o BINARY).
+        rescoreFactor (int): Candidatos por chunk que se puntúan con los vectores originales.
     """
     # -- Atributos -- #
     framework:str       = Field(default='HAYSTACK')
@@ -44,6 +267,13 @@ class DocumentConfig(BaseModel):
     splitLength:int     = Field(default=500, ge=1)
     splitOverlap:int    = Field(default=50, ge=1)
     topK:int            = Field(default=10, ge=1)
+    index:str           = Field(default='FLAT')
+    nlist:int           = Field(default=0, ge=0)
+    nprobe:int          = Field(default=16, ge=1)
+    rebuildRatio:float  = Field(default=0.5, gt=0)
+    minTrainSize:int    = Field(default=20000, ge=1)
+    quantization:str    = Field(default='NONE')
+    rescoreFactor:int   = Field(default=10, ge=1)
 
 
 class RagConfig(BaseModel):
@@ -54,8 +284,30 @@ class RagConfig(BaseModel):
         installModelDir (str): Directorio raiz de instalación de modelos.
         model (EmbeddingModelConfig): Configuración del modelo de embeddings.
         document (DocumentConfig): Configuración del RAG de documentos.
+        indexer (IndexerConfig): Configuración del indexador en segundo plano.
+        embeddingCache (EmbeddingCacheConfig): Configuración de la caché de embeddings.
+        ingestion (IngestionConfig): Configuración de la conversión y separación de ficheros.
+        batching (BatchingConfig): Configuración del cálculo de embeddings por lotes.
+        queryCache (QueryCacheConfig): Configuración de la caché de embeddings de consultas.
+        queryScheduler (QuerySchedulerConfig): Configuración de la agrupación de consultas concurrentes.
+        retrievalCache (RetrievalCacheConfig): Configuración de la caché de resultados de recuperación.
+        hybrid (HybridConfig): Configuración de la recuperación híbrida.
+        embedder (EmbedderConfig): Configuración del backend de los modelos de embeddings.
+        reranker (RerankerConfig): Configuración de la reordenación del contexto.
+        selection (SelectionConfig): Configuración de la selección del contexto.
     """
     # -- Atributos -- #
     installModelDir:str
     model:EmbeddingModelConfig
-    document:DocumentConfig
\ No newline at end of file
+    document:DocumentConfig
+    indexer:IndexerConfig                   = Field(default_factory=IndexerConfig)
+    embeddingCache:EmbeddingCacheConfig     = Field(default_factory=EmbeddingCacheConfig)
+    ingestion:IngestionConfig               = Field(default_factory=IngestionConfig)
+    batching:BatchingConfig                 = Field(default_factory=BatchingConfig)
+    queryCache:QueryCacheConfig             = Field(default_factory=QueryCacheConfig)
+    queryScheduler:QuerySchedulerConfig     = Field(default_factory=QuerySchedulerConfig)
+    retrievalCache:RetrievalCacheConfig     = Field(default_factory=RetrievalCacheConfig)
+    hybrid:HybridConfig                     = Field(default_factory=HybridConfig)
+    embedder:EmbedderConfig                 = Field(default_factory=EmbedderConfig)
+    reranker:RerankerConfig                 = Field(default_factory=RerankerConfig)
+    selection:SelectionConfig               = Field(default_factory=SelectionConfig)
\ No newline at end of file
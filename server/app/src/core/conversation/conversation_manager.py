@@ -17,15 +17,23 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-from typing import List, Dict
+import os
+import time
+import asyncio
+from pathlib import Path
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict
 # Librerías externas
 
 # Librerías internas
 from model.context import ContextDTO
+from model.measure import StreamDataDTO
 from context.context_manager import ContextManager
-from core.services.ollama import OllamaService
+from core.services.ollama import OllamaService, AsyncOllamaService
 from core.services.rag import RagService
 from core.services.prompt import PromptService
+from core.services.lifecycle import ModelLifecycleService
+from utils.file.csv import save_in_csv
 
 
 # ---- CLASES ---- #
@@ -59,9 +67,11 @@ class ConversationManager:
         """
         # Try-except para el manejo de errores.
         try:
-            # Comprueba el tamaño del historial
+            # Comprueba el tamaño del historial. Se descarta la mitad más antigua de una vez
+            # (y no un mensaje por turno) para que el inicio de la conversación se mantenga
+            # igual durante varios turnos y Ollama pueda reutilizar su caché del prompt.
             if len(self.__chatHistory) >= self.__maxSize:
-                self.__chatHistory.pop(0)
+                del self.__chatHistory[:self.__maxSize // 2]
             
             # Añade el mensaje al historial.
             self.__chatHistory.append({'role': role, 'content': content})
@@ -75,7 +85,8 @@ class ConversationManager:
     def chat(self, query:str) -> str:
         """
         Genera el prompt a partir de la consulta, el contexto y el historial. Envía el prompt
-        al modelo de Ollama y recibe la respuesta.
+        al modelo de Ollama y recibe la respuesta. En modo CHAT, envía los mensajes de la
+        conversación en su lugar.
         
         Args:
             query (str): Query realizada por el usuario.
@@ -86,23 +97,32 @@ class ConversationManager:
         """
         # Try-Except para el manejo de excepciones.
         try:
+            # Registra la petición para mantener el modelo cargado.
+            self.__ctx.get_service(key='lifecycle', t=ModelLifecycleService).notify_request()
+            
             # TODO: Preprocesar la query.
 
-            # Genera los embeddings.
-            self.__ctx.get_service(key='rag', t=RagService).make_embeddings()
-            
-            # Obtener el contexto.
+            # Obtener el contexto. Los embeddings los mantiene el indexador en segundo plano.
             context:List[ContextDTO] = self.__ctx.get_service(key='rag', t=RagService).get_relevant_context(query=query)
             
-            # Generar el prompt.
-            prompt:str = self.__ctx.get_service(key='prompt', t=PromptService).build_prompt(
-                context=context,
-                history=self.__chatHistory,
-                query=query
-            )
-
-            # Envia el prompt y obtiene la respuesta.
-            resp:str =  self.__ctx.get_service(key='ollama', t=OllamaService).get_response(prompt=prompt)
+            # Obtiene los servicios.
+            promptService:PromptService = self.__ctx.get_service(key='prompt', t=PromptService)
+            ollama:OllamaService = self.__ctx.get_service(key='ollama', t=OllamaService)
+            
+            # En modo CHAT, envía los mensajes y obtiene la respuesta.
+            if promptService.Mode == 'CHAT':
+                resp:str = ollama.chat(messages=promptService.build_messages(
+                    context=context,
+                    history=self.__chatHistory,
+                    query=query
+                ))
+            # En otro caso, genera el prompt, lo envía y obtiene la respuesta.
+            else:
+                resp:str = ollama.get_response(prompt=promptService.build_prompt(
+                    context=context,
+                    history=self.__chatHistory,
+                    query=query
+                ))
             
             # Almacena la pregunta/respuesta en el historial.
             self.__add_message(role='user', content=query)
@@ -114,4 +134,142 @@ class ConversationManager:
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"ConversationManager.chat() -> [{type(e).__name__}] No se pudo conversar con el modelo. Trace: {e}")
\ No newline at end of file
+            raise OSError(f"ConversationManager.chat() -> [{type(e).__name__}] No se pudo conversar con el modelo. Trace: {e}")
+    
+    async def achat(self, query:str) -> str:
+        """
+        Versión asíncrona de `chat`. La recuperación del contexto se ejecuta en otro hilo
+        y la generación emplea el cliente asíncrono de Ollama, por lo que no se bloquea el
+        bucle de eventos mientras el modelo responde.
+        
+        Args:
+            query (str): Query realizada por el usuario.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            str: Respuesta del modelo.
+        """
+        # Try-Except para el manejo de excepciones.
+        try:
+            # Registra la petición para mantener el modelo cargado.
+            self.__ctx.get_service(key='lifecycle', t=ModelLifecycleService).notify_request()
+            
+            # Obtener el contexto en otro hilo (calcula embeddings y consulta el almacén).
+            context:List[ContextDTO] = await asyncio.to_thread(self.__ctx.get_service(key='rag', t=RagService).get_relevant_context, query=query)
+            
+            # Obtiene los servicios.
+            promptService:PromptService = self.__ctx.get_service(key='prompt', t=PromptService)
+            ollama:AsyncOllamaService = self.__ctx.get_service(key='ollama_async', t=AsyncOllamaService)
+            
+            # En modo CHAT, envía los mensajes y espera la respuesta sin bloquear.
+            if promptService.Mode == 'CHAT':
+                resp:str = await ollama.chat(messages=promptService.build_messages(
+                    context=context,
+                    history=self.__chatHistory,
+                    query=query
+                ))
+            # En otro caso, genera el prompt, lo envía y espera la respuesta sin bloquear.
+            else:
+                resp:str = await ollama.get_response(prompt=promptService.build_prompt(
+                    context=context,
+                    history=self.__chatHistory,
+                    query=query
+                ))
+            
+            # Almacena la pregunta/respuesta en el historial.
+            self.__add_message(role='user', content=query)
+            self.__add_message(role='assistant', content=resp)
+            
+            # Retorna la respuesta.
+            return resp
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"ConversationManager.achat() -> [{type(e).__name__}] No se pudo conversar con el modelo. Trace: {e}")
+    
+    async def astream(self, query:str) -> AsyncIterator[str]:
+        """
+        Versión de `achat` que retorna la respuesta a medida que el modelo la genera. La
+        pregunta y la respuesta se añaden al historial solo si Ollama envía el objeto final
+        (`done`); si la respuesta termina sin él, se lanza una excepción. Se almacena el
+        tiempo hasta el primer token.
+        
+        Args:
+            query (str): Query realizada por el usuario.
+        Raises:
+            OSError: En caso de que haya algún error o la respuesta esté incompleta.
+        Returns:
+            AsyncIterator[str]: Fragmentos de la respuesta del modelo.
+        """
+        # Try-Except para el manejo de excepciones.
+        try:
+            # Registra la petición para mantener el modelo cargado.
+            self.__ctx.get_service(key='lifecycle', t=ModelLifecycleService).notify_request()
+            
+            # Obtiene el tiempo inicial.
+            start:float = time.perf_counter()
+            
+            # Obtener el contexto en otro hilo (calcula embeddings y consulta el almacén).
+            context:List[ContextDTO] = await asyncio.to_thread(self.__ctx.get_service(key='rag', t=RagService).get_relevant_context, query=query)
+            retrieve:float = time.perf_counter() - start
+            
+            # Obtiene los servicios.
+            promptService:PromptService = self.__ctx.get_service(key='prompt', t=PromptService)
+            ollama:AsyncOllamaService = self.__ctx.get_service(key='ollama_async', t=AsyncOllamaService)
+            
+            # En modo CHAT envía los mensajes; en otro caso, el prompt.
+            if promptService.Mode == 'CHAT':
+                stream:AsyncIterator[Dict[str,any]] = ollama.stream_chat(messages=promptService.build_messages(
+                    context=context,
+                    history=self.__chatHistory,
+                    query=query
+                ))
+            else:
+                stream:AsyncIterator[Dict[str,any]] = ollama.stream_response(prompt=promptService.build_prompt(
+                    context=context,
+                    history=self.__chatHistory,
+                    query=query
+                ))
+
+            # Retorna cada fragmento de la respuesta.
+            parts:List[str] = []
+            ttft:float = 0.0
+            completed:bool = False
+            # Cierra la respuesta de Ollama (y libera la conexión) en cuanto termina o se
+            # interrumpe la iteración.
+            async with aclosing(stream):
+                async for chunk in stream:
+                    # Si es el último, almacena las medidas.
+                    if chunk.get('done', False):
+                        save_in_csv(file_path=Path(os.path.join('.server', 'etc', 'measure', f"{ollama.Model.tag}_stream.csv")), data=StreamDataDTO(
+                            ttft=ttft,
+                            retrieveDuration=retrieve,
+                            duration=time.perf_counter() - start,
+                            promptEvalCount=chunk.get('prompt_eval_count', 0),
+                            promptEvalDuration=chunk.get('prompt_eval_duration', 0) / 1_000_000_000,
+                            evalCount=chunk.get('eval_count', 0),
+                            loadDuration=chunk.get('load_duration', 0) / 1_000_000_000
+                        ))
+                        completed = True
+                        break
+                    # Si contiene un fragmento (`message.content` en modo CHAT), lo retorna.
+                    text:str = chunk['message'].get('content', '') if 'message' in chunk else chunk.get('response', '')
+                    if text:
+                        if not parts:
+                            ttft = time.perf_counter() - start
+                        parts.append(text)
+                        yield text
+            
+            # Si la respuesta terminó sin el objeto final, está incompleta.
+            if not completed:
+                raise OSError("La respuesta del modelo terminó sin el objeto final (done).")
+            
+            # Almacena la pregunta/respuesta en el historial.
+            self.__add_message(role='user', content=query)
+            self.__add_message(role='assistant', content=''.join(parts))
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"ConversationManager.astream() -> [{type(e).__name__}] No se pudo conversar con el modelo. Trace: {e}")
\ No newline at end of file
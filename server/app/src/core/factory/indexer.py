@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: indexer.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene funciones que permiten crear el indexador de documentos de
+    manera más sencilla.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+
+# Librerías externas
+
+# Librerías internas
+from context.context_manager import ContextManager
+from core.services.indexer import IndexerService
+from core.services.rag import RagService
+from config.schema.rag import RagConfig
+
+
+# ---- FUNCIONES ---- #
+def create_indexer_service(ctx:ContextManager) -> IndexerService:
+    """
+    Crea y retorna un indexador de documentos. Requiere que el servicio de RAG
+    esté registrado.
+
+    Args:
+        ctx (ContextController): Gestor del contexto. Para obtener la configuración.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        IndexerService: Indexador de documentos.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Retorna el servicio.
+        return IndexerService(indexer_cfg=ctx.get_cfg('rag', t=RagConfig).indexer,
+                              rag_service=ctx.get_service(key='rag', t=RagService))
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"indexer::create_indexer_service() -> [{type(e).__name__}] No se pudo crear el indexador. Trace: {e}")
\ No newline at end of file
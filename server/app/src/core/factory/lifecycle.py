@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: lifecycle.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene funciones que permiten crear el gestor del ciclo de vida del
+    modelo de Ollama de manera más sencilla.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+
+# Librerías externas
+
+# Librerías internas
+from context.context_manager import ContextManager
+from core.services.lifecycle import ModelLifecycleService
+from core.services.ollama import OllamaService
+from config.schema.ollama import OllamaConfig
+
+
+# ---- FUNCIONES ---- #
+def create_lifecycle_service(ctx:ContextManager) -> ModelLifecycleService:
+    """
+    Crea y retorna un gestor del ciclo de vida del modelo de Ollama. Requiere que el
+    servicio de Ollama esté registrado.
+
+    Args:
+        ctx (ContextController): Gestor del contexto. Para obtener la configuración.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        ModelLifecycleService: Gestor del ciclo de vida del modelo.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Retorna el servicio.
+        return ModelLifecycleService(lifecycle_cfg=ctx.get_cfg('ollama', t=OllamaConfig).service.lifecycle,
+                                     ollama_service=ctx.get_service(key='ollama', t=OllamaService))
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"lifecycle::create_lifecycle_service() -> [{type(e).__name__}] No se pudo crear el gestor del ciclo de vida. Trace: {e}")
\ No newline at end of file
@@ -22,7 +22,7 @@
 
 # Librerías internas
 from context.context_manager import ContextManager
-from core.services.ollama import OllamaService
+from core.services.ollama import OllamaService, AsyncOllamaService
 from config.schema.ollama import OllamaConfig
 
 
@@ -46,4 +46,26 @@ def create_ollama_service(ctx:ContextManager) -> OllamaService:
     # Si ocurre algún error.
     except Exception as e:
         # Lanza una excepción.
-        raise OSError(f"ollama::create_ollama_service() -> [{type(e).__name__}] No se pudo crear servicio Ollama. Trace: {e}")
\ No newline at end of file
+        raise OSError(f"ollama::create_ollama_service() -> [{type(e).__name__}] No se pudo crear servicio Ollama. Trace: {e}")
+
+
+def create_async_ollama_service(ctx:ContextManager) -> AsyncOllamaService:
+    """
+    Crea y retorna un servicio asíncrono de Ollama.
+    
+    Args:
+        ctx (ContextController): Gestor del contexto. Para obtener la configuración.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        AsyncOllamaService: Servicio asíncrono de Ollama.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Retorna el servicio.
+        return AsyncOllamaService(service_cfg=ctx.get_cfg('ollama', t=OllamaConfig).service)
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"ollama::create_async_ollama_service() -> [{type(e).__name__}] No se pudo crear servicio Ollama asíncrono. Trace: {e}")
\ No newline at end of file
@@ -43,4 +43,18 @@ class BaseRagModule(ABC):
             ContextDTO: Listado con el contexto.
         """
         pass
+
+    @abstractmethod
+    def get_context_batch(self, queries:List[str]) -> List[List[ContextDTO]]:
+        """
+        @Override: Obtiene el contexto de la fuente de datos para varias consultas a la vez.
+        
+        Args:
+            queries (List[str]): Consultas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Listado con el contexto de cada consulta, en el mismo orden.
+        """
+        pass
     
\ No newline at end of file
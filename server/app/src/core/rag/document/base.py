@@ -17,11 +17,36 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
+import os
+import time
+import uuid
+import threading
 from abc import abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
 # Librerías externas
 
 # Librerías internas
 from core.rag.base import BaseRagModule
+from core.rag.document.manifest import IngestionManifest
+from core.rag.document.splitter import DocumentSplitter
+from core.rag.document.ingestion import StreamingPipeline
+from core.rag.document.writer import BulkWriter
+from core.rag.embedding import onnx_backend
+from core.rag.embedding.cache import EmbeddingCache
+from core.rag.embedding.batcher import AdaptiveBatcher
+from core.rag.embedding.query_cache import QueryEmbeddingCache
+from core.rag.embedding.scheduler import QueryBatchScheduler
+from core.rag.index.lexical import LexicalIndex, tokenize, is_identifier_query
+from core.rag.fusion import reciprocal_rank_fusion, with_dense_score
+from model.chunk import ChunkDTO, SplitResultDTO, IngestionItemDTO
+from model.context import ContextDTO
+from model.manifest import ManifestDiffDTO, FileEntryDTO, ChunkEntryDTO, IndexInfoDTO
+from model.measure import CacheStatsDTO, IngestionDataDTO
+from utils.path import list_dir_files
+from utils.file.common import hash_text
+from utils import console
+from config.schema.rag import RagConfig, IngestionConfig, HybridConfig
 
 
 # ---- CLASS ---- #
@@ -29,14 +54,849 @@ class BaseDocumentModule(BaseRagModule):
     """
     Clase base que representa un módulo de RAG. Contiene las funciones a implementar
     por los módulos de documentos.
+
+    La ingesta es incremental: un manifiesto persistente registra los ficheros y fragmentos
+    indexados, de modo que solo se convierten, separan, embeben e insertan los ficheros
+    nuevos o modificados, y se eliminan los vectores de los ficheros borrados. Los embeddings
+    se consultan antes en una caché persistente, por lo que un fragmento ya embebido (en
+    otro fichero o en un índice anterior) no vuelve a pasar por el modelo. La conversión y
+    separación de los ficheros se reparte entre varios procesos y los embeddings se calculan
+    en lotes de textos de longitud parecida. Las etapas se encadenan mediante colas acotadas,
+    por lo que la memoria no crece con el tamaño del corpus, y la escritura se hace en lotes
+    mientras se calculan los embeddings de los siguientes ficheros.
+
+    En la recuperación, el embedding de la consulta se obtiene de una caché en memoria si
+    la misma consulta (o una que solo difiere en mayúsculas, acentos o espacios) se ha
+    realizado recientemente; si no, las consultas concurrentes se embeben en un único
+    lote. Junto al almacén vectorial se mantiene un índice léxico (BM25): los resultados
+    de ambos se fusionan, y las búsquedas de identificadores ("IF750", "ISO 12100") se
+    responden solo con el índice léxico.
     """
+    # -- Métodos por defecto -- #
+    def __init__(self, rag_cfg:RagConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            rag_cfg (RagConfig): Configuración del RAG.
+        """
+        # Inicializa las propiedades.
+        self.__docPath:Path = Path(os.path.join('.server', rag_cfg.document.docDir))
+        self.__manifest:IngestionManifest = IngestionManifest(
+            file_path=Path(os.path.join('.server', rag_cfg.document.storeDir, f"{rag_cfg.document.framework}.manifest.json"))
+        )
+        self.__ingestLock:threading.Lock = threading.Lock()
+        self.__storeLock:threading.RLock = threading.RLock()
+        self.__verified:bool = False
+        self.__ingestionCfg:IngestionConfig = rag_cfg.ingestion
+        self.__splitter:Optional[DocumentSplitter] = None
+        self.__written:int = 0
+        self.__generation:int = 0
+        self.__topK:int = rag_cfg.document.topK
+        self.__hybridCfg:HybridConfig = rag_cfg.hybrid
+        self.__batcher:AdaptiveBatcher = AdaptiveBatcher(embed_fn=self.embed_texts, batching_cfg=rag_cfg.batching)
+        # Las cachés se identifican por el modelo y su backend (o fichero ONNX).
+        variantTag:str = onnx_backend.get_variant_tag(model_tag=rag_cfg.model.tag, embedder_cfg=rag_cfg.embedder)
+        self.__queryCache:Optional[QueryEmbeddingCache] = None
+        # Crea la caché de consultas si está habilitada.
+        if rag_cfg.queryCache.enabled:
+            self.__queryCache = QueryEmbeddingCache(model_tag=variantTag, max_entries=rag_cfg.queryCache.maxEntries,
+                                                    ttl=rag_cfg.queryCache.ttl)
+        self.__scheduler:Optional[QueryBatchScheduler] = None
+        # Crea el planificador de consultas si está habilitado.
+        if rag_cfg.queryScheduler.enabled:
+            self.__scheduler = QueryBatchScheduler(embed_fn=self.embed_texts, scheduler_cfg=rag_cfg.queryScheduler)
+        self.__embeddingCache:Optional[EmbeddingCache] = None
+        # Crea la caché de embeddings si está habilitada.
+        if rag_cfg.embeddingCache.enabled:
+            self.__embeddingCache = EmbeddingCache(
+                root_path=Path(os.path.join('.server', rag_cfg.embeddingCache.cacheDir)),
+                model_tag=variantTag,
+                embedding_dim=rag_cfg.model.embeddingDim,
+                max_entries=rag_cfg.embeddingCache.maxEntries
+            )
+        
+        # Comprueba si el índice almacenado se construyó con los mismos parámetros.
+        index:IndexInfoDTO = IndexInfoDTO(
+            framework=rag_cfg.document.framework,
+            modelTag=rag_cfg.model.tag,
+            embeddingDim=rag_cfg.model.embeddingDim,
+            splitLength=rag_cfg.document.splitLength,
+            splitOverlap=rag_cfg.document.splitOverlap,
+            backend=rag_cfg.embedder.backend,
+            onnxFile=onnx_backend.get_onnx_file(embedder_cfg=rag_cfg.embedder) if rag_cfg.embedder.backend == 'ONNX' else None
+        )
+        self.__indexReusable:bool = self.__manifest.is_compatible(index=index)
+        # Si no es compatible, se reconstruirá el índice completo.
+        if not self.__indexReusable:
+            self.__manifest.reset(index=index)
+
+        self.__lexical:Optional[LexicalIndex] = None
+        # Crea el índice léxico si está habilitado.
+        if rag_cfg.hybrid.enabled:
+            self.__lexical = LexicalIndex(
+                root_path=Path(os.path.join('.server', rag_cfg.document.storeDir, f"{rag_cfg.document.framework}.lexical")),
+                k1=rag_cfg.hybrid.k1,
+                b=rag_cfg.hybrid.b
+            )
+            # Si el índice no es reutilizable, lo vacía.
+            if not self.__indexReusable:
+                self.__lexical.reset()
+    
+    # -- Propiedades -- #
+    @property
+    def DocPath(self) -> Path:
+        """
+        Retorna el directorio raiz con los documentos.
+        
+        Returns:
+            Path: Directorio raiz con los documentos.
+        """
+        # Retorna el directorio.
+        return self.__docPath
+    
+    @property
+    def IsIndexReusable(self) -> bool:
+        """
+        Retorna si el índice almacenado puede reutilizarse. Los módulos deben recrear
+        su almacén en caso contrario.
+        
+        Returns:
+            bool: True si el índice almacenado se construyó con los mismos parámetros.
+        """
+        # Retorna si el índice es reutilizable.
+        return self.__indexReusable
+    
+    @property
+    def StoreLock(self) -> threading.RLock:
+        """
+        Retorna el cerrojo del almacén. Se mantiene únicamente mientras se escribe o se
+        consulta el almacén, nunca mientras se calculan los embeddings de la ingesta.
+        
+        Returns:
+            threading.RLock: Cerrojo del almacén.
+        """
+        # Retorna el cerrojo.
+        return self.__storeLock
+    
+    @property
+    def Generation(self) -> int:
+        """
+        Retorna la generación del índice. Avanza cada vez que la ingesta modifica el
+        almacén, por lo que permite invalidar los resultados de recuperación almacenados.
+        
+        Returns:
+            int: Generación del índice.
+        """
+        # Retorna la generación.
+        return self.__generation
+    
+    @property
+    def EmbeddingCacheStats(self) -> Optional[CacheStatsDTO]:
+        """
+        Retorna las estadísticas de la caché de embeddings.
+        
+        Returns:
+            Optional[CacheStatsDTO]: Estadísticas de la caché o None si está deshabilitada.
+        """
+        # Retorna las estadísticas.
+        return self.__embeddingCache.Stats if self.__embeddingCache else None
+    
+    @property
+    def QueryCacheStats(self) -> Optional[CacheStatsDTO]:
+        """
+        Retorna las estadísticas de la caché de embeddings de consultas.
+        
+        Returns:
+            Optional[CacheStatsDTO]: Estadísticas de la caché o None si está deshabilitada.
+        """
+        # Retorna las estadísticas.
+        return self.__queryCache.Stats if self.__queryCache else None
+
+    # -- Métodos privados -- #
+    def __create_chunks(self, file_path:str, contents:List[str]) -> List[ChunkDTO]:
+        """
+        Crea los fragmentos de un fichero. El identificador de cada fragmento se obtiene
+        a partir de la ruta del fichero y del hash de su contenido, por lo que los fragmentos
+        que no cambian al editar un fichero conservan su identificador.
+
+        Args:
+            file_path (str): Ruta del fichero.
+            contents (List[str]): Contenido de los fragmentos.
+        Returns:
+            List[ChunkDTO]: Fragmentos del fichero.
+        """
+        # Variable a retornar.
+        chunks:List[ChunkDTO] = []
+        # Número de apariciones de cada hash (para fragmentos repetidos).
+        occurrences:Dict[str, int] = {}
+
+        # Para cada fragmento.
+        for content in contents:
+            # Calcula el hash y el número de aparición.
+            chunk_hash:str = hash_text(text=content)
+            occurrences[chunk_hash] = occurrences.get(chunk_hash, 0) + 1
+            # Genera el identificador.
+            chunk_id:str = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{file_path}:{chunk_hash}:{occurrences[chunk_hash]}"))
+            # Añade el fragmento.
+            chunks.append(ChunkDTO(id=chunk_id, sourceDir=file_path, hash=chunk_hash, content=content))
+
+        # Retorna los fragmentos.
+        return chunks
+
+    def __embed_chunks(self, texts:List[str]) -> List[List[float]]:
+        """
+        Calcula los embeddings de los textos consultando antes la caché. Solo se
+        embeben los textos que no están en caché, que se añaden a ella.
+
+        Args:
+            texts (List[str]): Textos a embeber.
+        Returns:
+            List[List[float]]: Embeddings de los textos, en el mismo orden.
+        """
+        # Si no hay caché, calcula todos los embeddings.
+        if self.__embeddingCache is None:
+            return self.__batcher.embed(texts=texts)
+
+        # Obtiene los embeddings almacenados.
+        cached = self.__embeddingCache.get(texts=texts)
+        embeddings:List[List[float]] = [vector.tolist() if vector is not None else None for vector in cached]
+
+        # Obtiene los textos que no están en caché.
+        missing:List[int] = [i for i, vector in enumerate(cached) if vector is None]
+        # Si hay textos sin embeddings.
+        if missing:
+            # Calcula los embeddings.
+            computed:List[List[float]] = self.__batcher.embed(texts=[texts[i] for i in missing])
+            # Añade los embeddings a la caché y al resultado.
+            self.__embeddingCache.put(texts=[texts[i] for i in missing], embeddings=computed)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = list(embedding)
+
+        # Retorna los embeddings.
+        return embeddings
+
+    def __prepare_file(self, entry:FileEntryDTO, result:SplitResultDTO) -> IngestionItemDTO:
+        """
+        Etapa de preparación: crea los fragmentos de un fichero separado y los compara con
+        los indexados previamente.
+
+        Args:
+            entry (FileEntryDTO): Entrada del fichero a indexar.
+            result (SplitResultDTO): Resultado de la separación del fichero.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            IngestionItemDTO: Fichero con los fragmentos a insertar y eliminar.
+        """
+        # Comprueba si no se ha podido separar.
+        if result.error is not None:
+            raise OSError(f"BaseDocumentModule.__prepare_file() -> No se pudo separar el fichero <{entry.path}>. Trace: {result.error}")
+
+        # Obtiene los fragmentos del fichero.
+        chunks:List[ChunkDTO] = self.__create_chunks(file_path=entry.path, contents=result.contents)
+
+        # Obtiene los fragmentos indexados previamente.
+        previous:FileEntryDTO = self.__manifest.get(path=entry.path)
+        old_ids:Set[str] = {chunk.id for chunk in previous.chunks} if previous else set()
+        new_ids:Set[str] = {chunk.id for chunk in chunks}
+
+        # Retorna los fragmentos a insertar y los que ya no existen.
+        return IngestionItemDTO(entry=entry, chunks=chunks, pending=[chunk for chunk in chunks if chunk.id not in old_ids],
+                                stale=list(old_ids - new_ids))
+
+    def __embed_file(self, item:IngestionItemDTO) -> IngestionItemDTO:
+        """
+        Etapa de embeddings: calcula los embeddings de los fragmentos que no estaban
+        indexados. Se ejecuta sin el cerrojo del almacén.
+
+        Args:
+            item (IngestionItemDTO): Fichero a embeber.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            IngestionItemDTO: Fichero con los embeddings calculados.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Calcula los embeddings de los fragmentos nuevos.
+            if item.pending:
+                item.embeddings = self.__embed_chunks(texts=[chunk.content for chunk in item.pending])
+            # Retorna el fichero.
+            return item
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"BaseDocumentModule.__embed_file() -> [{type(e).__name__}] No se pudo embeber el fichero <{item.entry.path}>. Trace: {e}")
+
+    def __write_chunks(self, chunks:List[ChunkDTO], embeddings:List[List[float]]) -> None:
+        """
+        Inserta los fragmentos y avanza la generación del índice. Debe invocarse con el
+        cerrojo del almacén, de modo que ninguna búsqueda vea los cambios con la
+        generación anterior.
+
+        Args:
+            chunks (List[ChunkDTO]): Fragmentos a insertar.
+            embeddings (List[List[float]]): Embeddings de los fragmentos.
+        """
+        # Inserta los fragmentos en el almacén y en el índice léxico.
+        self.write_chunks(chunks=chunks, embeddings=embeddings)
+        if self.__lexical is not None:
+            self.__lexical.add(chunks=chunks)
+        # Avanza la generación.
+        self.__generation += 1
+
+    def __delete_chunks(self, chunk_ids:List[str]) -> None:
+        """
+        Elimina los fragmentos y avanza la generación del índice. Debe invocarse con el
+        cerrojo del almacén.
+
+        Args:
+            chunk_ids (List[str]): Identificadores de los fragmentos.
+        """
+        # Elimina los fragmentos del almacén y del índice léxico.
+        self.delete_chunks(chunk_ids=chunk_ids)
+        if self.__lexical is not None:
+            self.__lexical.remove(ids=chunk_ids)
+        # Avanza la generación.
+        self.__generation += 1
+
+    def __commit_file(self, entry:FileEntryDTO, chunks:List[ChunkDTO]) -> None:
+        """
+        Registra en el manifiesto un fichero cuyos fragmentos ya se han escrito.
+
+        Args:
+            entry (FileEntryDTO): Entrada del fichero.
+            chunks (List[ChunkDTO]): Fragmentos actuales del fichero.
+        """
+        # Actualiza el manifiesto.
+        entry.chunks = [ChunkEntryDTO(id=chunk.id, hash=chunk.hash) for chunk in chunks]
+        self.__manifest.update(entry=entry)
+
+        # Almacena el manifiesto periódicamente para no perder el progreso.
+        self.__written += 1
+        if self.__written % self.__ingestionCfg.checkpointFiles == 0:
+            self.__manifest.save()
+
+    def __save_lexical(self) -> None:
+        """
+        Consolida y almacena el índice léxico. No lanza excepciones: si no se puede
+        almacenar, no coincidirá con el manifiesto y se reindexará el corpus.
+        """
+        # Try-Except para que la ingesta no falle si no se puede almacenar.
+        try:
+            # Almacena el índice léxico.
+            with self.__storeLock:
+                self.__lexical.save()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso.
+            console.print_message(message=f"BaseDocumentModule.__save_lexical() -> [{type(e).__name__}] No se pudo almacenar el índice léxico. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+
+    def __lexical_context(self, tokens:List[str], top_k:int) -> List[ContextDTO]:
+        """
+        Obtiene el contexto del índice léxico. Debe invocarse con el cerrojo del almacén.
+
+        Args:
+            tokens (List[str]): Tokens de la consulta.
+            top_k (int): Número de fragmentos a obtener.
+        Returns:
+            List[ContextDTO]: Fragmentos con mayor puntuación BM25.
+        """
+        # Variable a retornar.
+        context:List[ContextDTO] = []
+
+        # Para cada fragmento obtenido.
+        numbers, scores = self.__lexical.search(tokens=tokens, top_k=top_k)
+        for number, score in zip(numbers.tolist(), scores.tolist()):
+            # Lee el fragmento y añade el contexto.
+            content, source = self.__lexical.get(number=number)
+            context.append(ContextDTO(score=score, sourceType='Document', sourceDir=source, content=content))
+
+        # Retorna el contexto.
+        return context
+
+    def __remove_file(self, path:str) -> None:
+        """
+        Elimina los vectores de un fichero borrado.
+
+        Args:
+            path (str): Ruta del fichero.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene la entrada del fichero.
+            entry:FileEntryDTO = self.__manifest.get(path=path)
+
+            # Elimina los fragmentos del almacén.
+            if entry and entry.chunks:
+                with self.__storeLock:
+                    self.__delete_chunks(chunk_ids=[chunk.id for chunk in entry.chunks])
+
+            # Elimina la entrada del manifiesto.
+            self.__manifest.remove(path=path)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"BaseDocumentModule.__remove_file() -> [{type(e).__name__}] No se pudo eliminar el fichero <{path}>. Trace: {e}")
+
     # -- Métodos abstractos -- #
     @abstractmethod
-    def make_embeddings(self) -> None:
+    def get_split_function(self) -> Callable[[str], List[str]]:
         """
-        @Override: Calcula los embeddings de los documentos.
+        @Override: Retorna la función que convierte un fichero y lo separa en fragmentos.
+        Se ejecuta en otros procesos, por lo que debe poder serializarse (función de
+        módulo o `functools.partial`).
+
+        Returns:
+            Callable[[str], List[str]]: Función que recibe la ruta del fichero y retorna
+                el contenido de los fragmentos.
+        """
+        pass
+
+    @abstractmethod
+    def embed_texts(self, texts:List[str]) -> List[List[float]]:
+        """
+        @Override: Calcula los embeddings de un lote de textos. Los lotes ya llegan
+        ordenados por longitud, por lo que deben embeberse en una única pasada. También
+        embebe los lotes de consultas concurrentes, por lo que el embedding de un texto
+        debe coincidir con el de `embed_query`.
+
+        Args:
+            texts (List[str]): Textos a embeber.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[float]]: Embeddings de los textos, en el mismo orden.
+        """
+        pass
+
+    @abstractmethod
+    def embed_query(self, query:str) -> List[float]:
+        """
+        @Override: Calcula el embedding de una consulta.
+
+        Args:
+            query (str): Consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[float]: Embedding de la consulta.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, embedding:List[float]) -> List[ContextDTO]:
+        """
+        @Override: Obtiene los fragmentos más similares a un embedding. Se invoca con el
+        cerrojo del almacén.
+
+        Args:
+            embedding (List[float]): Embedding de la consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[ContextDTO]: Fragmentos más similares.
+        """
+        pass
+
+    def search_batch(self, embeddings:List[List[float]]) -> List[List[ContextDTO]]:
+        """
+        Obtiene los fragmentos más similares a varios embeddings. Se invoca con el cerrojo
+        del almacén. Por defecto busca cada embedding por separado; los módulos que
+        disponen de búsqueda por lotes la sobrescriben.
+
+        Args:
+            embeddings (List[List[float]]): Embeddings de las consultas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Fragmentos más similares a cada embedding, en el mismo orden.
+        """
+        # Retorna los fragmentos de cada embedding.
+        return [self.search(embedding=embedding) for embedding in embeddings]
+
+    @abstractmethod
+    def write_chunks(self, chunks:List[ChunkDTO], embeddings:List[List[float]]) -> None:
+        """
+        @Override: Inserta (o reemplaza) los fragmentos en el almacén.
+
+        Args:
+            chunks (List[ChunkDTO]): Fragmentos a insertar.
+            embeddings (List[List[float]]): Embeddings de los fragmentos.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        pass
+
+    @abstractmethod
+    def count_chunks(self) -> int:
+        """
+        @Override: Retorna el número de fragmentos del almacén.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            int: Número de fragmentos almacenados.
+        """
+        pass
+
+    @abstractmethod
+    def delete_chunks(self, chunk_ids:List[str]) -> None:
+        """
+        @Override: Elimina los fragmentos del almacén.
+
+        Args:
+            chunk_ids (List[str]): Identificadores de los fragmentos.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        pass
+
+    def begin_bulk_load(self) -> None:
+        """
+        Se invoca antes de escribir un conjunto de ficheros. Permite diferir la
+        optimización del índice hasta el final de la carga. Por defecto no hace nada.
+        No debe lanzar excepciones: la carga puede continuar sin optimizar.
+        """
+        pass
+
+    def end_bulk_load(self) -> None:
+        """
+        Se invoca al terminar de escribir un conjunto de ficheros. Por defecto no hace nada.
+        No debe lanzar excepciones.
+        """
+        pass
+
+    def __verify_store(self) -> None:
+        """
+        Comprueba que el almacén contiene los fragmentos registrados en el manifiesto.
+        Si no coinciden (por ejemplo, el almacén se ha borrado), se vacía el manifiesto
+        para volver a indexar todos los ficheros.
+        
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene el número de fragmentos almacenados.
+            with self.__storeLock:
+                count:int = self.count_chunks()
+                lexical_count:int = self.__lexical.Count if self.__lexical is not None else count
+            
+            # Si el índice léxico no coincide con el manifiesto (por ejemplo, se acaba de habilitar).
+            if count == self.__manifest.ChunkCount and lexical_count != count:
+                # Imprime el aviso.
+                console.print_message(message=f"El índice léxico ({lexical_count} fragmentos) no coincide con el manifiesto ({self.__manifest.ChunkCount} fragmentos). Se reindexará el corpus.",
+                                      type=console.MessageType.WARNING)
+                # Vacía el manifiesto y el índice léxico.
+                self.__manifest.reset(index=self.__manifest.Index)
+                self.__lexical.reset()
+
+            # Si el índice es reutilizable y coincide con el manifiesto.
+            elif self.__indexReusable and count == self.__manifest.ChunkCount:
+                # Imprime la información.
+                console.print_message(message=f"Índice reutilizado ({count} fragmentos). Solo se indexarán los cambios.", type=console.MessageType.INFO)
+            
+            # Si el almacén no coincide con el manifiesto.
+            elif count != self.__manifest.ChunkCount:
+                # Imprime el aviso.
+                console.print_message(message=f"El almacén ({count} fragmentos) no coincide con el manifiesto ({self.__manifest.ChunkCount} fragmentos). Se reindexará el corpus.",
+                                      type=console.MessageType.WARNING)
+                # Vacía el manifiesto manteniendo los parámetros del índice.
+                self.__manifest.reset(index=self.__manifest.Index)
+                if self.__lexical is not None:
+                    self.__lexical.reset()
+            
+            # Marca el almacén como comprobado.
+            self.__verified = True
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"BaseDocumentModule.__verify_store() -> [{type(e).__name__}] No se pudo comprobar el almacén. Trace: {e}")
+
+    def __sync(self, file_paths:List[str], scope:Optional[List[str]]=None) -> Optional[IngestionDataDTO]:
+        """
+        Sincroniza el almacén con los ficheros dados: indexa los ficheros nuevos o
+        modificados y elimina los borrados.
         
+        Args:
+            file_paths (List[str]): Rutas de los ficheros actuales.
+            scope (Optional[List[str]]): Rutas comparadas. Si es None, se compara el
+                manifiesto completo.
         Raises:
             OSError: En caso de que haya algún error.
+        Returns:
+            Optional[IngestionDataDTO]: Medidas de la ingesta o None si no había cambios.
         """
-        pass
\ No newline at end of file
+        # Una única ingesta a la vez.
+        with self.__ingestLock:
+            # Comprueba una única vez que el almacén contiene los fragmentos del manifiesto.
+            if not self.__verified:
+                self.__verify_store()
+
+            # Compara los ficheros con el manifiesto.
+            diff:ManifestDiffDTO = self.__manifest.diff(file_paths=file_paths, scope=scope)
+
+            # Si no hay cambios en el corpus.
+            if not (diff.added or diff.changed or diff.removed):
+                # Actualiza la huella del corpus si se ha comparado completo.
+                if scope is None:
+                    self.__manifest.Fingerprint = diff.fingerprint
+                # Almacena los metadatos actualizados y finaliza.
+                self.__manifest.save()
+                return None
+
+            # Imprime la información.
+            console.print_message(message=f"Se disponen de {len(file_paths)} ficheros: {len(diff.added)} nuevos, {len(diff.changed)} modificados y {len(diff.removed)} eliminados.",
+                                  type=console.MessageType.INFO)
+
+            # Obtiene el tiempo inicial.
+            start:float = time.perf_counter()
+            # Escritor por lotes de la ingesta.
+            writer:BulkWriter = BulkWriter(write_fn=self.__write_chunks, delete_fn=self.__delete_chunks, commit_fn=self.__commit_file,
+                                           batch_size=self.__ingestionCfg.writeBatchSize, lock=self.__storeLock)
+
+            # Try-Finally para almacenar el manifiesto aunque falle algún fichero.
+            try:
+                # Difiere la optimización del índice hasta el final de la carga.
+                self.begin_bulk_load()
+
+                # Elimina los ficheros borrados.
+                for path in diff.removed:
+                    self.__remove_file(path=path)
+
+                # Ficheros nuevos o modificados.
+                entries:Dict[str, FileEntryDTO] = {entry.path:entry for entry in diff.added + diff.changed}
+                self.__written = 0
+                
+                # Crea la etapa de separación si no existe.
+                if self.__splitter is None:
+                    self.__splitter = DocumentSplitter(split_fn=self.get_split_function(), ingestion_cfg=self.__ingestionCfg)
+                
+                # Flujo de ingesta: separación -> preparación -> embeddings -> escritura. Si falla
+                # un fichero, se descarta y se reintentará en la siguiente ingesta.
+                pipeline:StreamingPipeline = StreamingPipeline(
+                    stages=[lambda result: self.__prepare_file(entry=entries[result.path], result=result), self.__embed_file, writer.add],
+                    queue_size=self.__ingestionCfg.queueSize,
+                    on_error=lambda __, e: console.print_message(message=f"BaseDocumentModule.__sync() -> {e}", type=console.MessageType.WARNING)
+                )
+                # Ejecuta el flujo según se separan los ficheros.
+                failed:int = pipeline.run(items=self.__splitter.split(file_paths=list(entries)))
+                
+                # Try-Except para escribir el último lote.
+                try:
+                    writer.flush()
+                # Si ocurre algún error, los ficheros del lote se reintentarán en la siguiente ingesta.
+                except Exception as e:
+                    failed += 1
+                    console.print_message(message=f"BaseDocumentModule.__sync() -> {e}", type=console.MessageType.WARNING)
+                
+                # Actualiza la huella del corpus si se ha sincronizado completo.
+                if scope is None and failed == 0:
+                    self.__manifest.Fingerprint = diff.fingerprint
+
+            # Restaura la optimización del índice y almacena el manifiesto y la caché de embeddings.
+            finally:
+                self.end_bulk_load()
+                if self.__lexical is not None:
+                    self.__save_lexical()
+                self.__manifest.save()
+                if self.__embeddingCache is not None:
+                    self.__embeddingCache.flush()
+                    # Imprime las estadísticas de la caché.
+                    stats:CacheStatsDTO = self.__embeddingCache.Stats
+                    console.print_message(message=f"Caché de embeddings: {stats.hits} aciertos, {stats.misses} fallos ({stats.hitRate:.1%}), {stats.size}/{stats.capacity} entradas.",
+                                          type=console.MessageType.INFO)
+
+            # Obtiene las medidas de la ingesta.
+            duration:float = time.perf_counter() - start
+            data:IngestionDataDTO = IngestionDataDTO(files=self.__written, points=writer.Points, duration=duration,
+                                                     writeDuration=writer.WriteDuration,
+                                                     pointsPerSecond=(writer.Points / duration) if duration > 0 else 0.0)
+            # Imprime la información.
+            console.print_message(message=f"Ingesta: {data.files} ficheros, {data.points} puntos en {data.duration:.2f} s ({data.pointsPerSecond:.1f} puntos/s).",
+                                  type=console.MessageType.INFO)
+            # Retorna las medidas.
+            return data
+
+    # -- Métodos públicos -- #
+    def get_context(self, query:str) -> List[ContextDTO]:
+        """
+        Obtiene el contexto relevante de los documentos. El embedding de la consulta se
+        obtiene de la caché si está disponible. Si el índice léxico está habilitado, sus
+        resultados se fusionan con los del almacén vectorial (RRF), y las búsquedas de
+        identificadores se responden solo con el índice léxico.
+
+        Args:
+            query (str): Consulta del usuario.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[ContextDTO]: Listado con el contexto.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene el contexto léxico.
+            lexical:List[ContextDTO] = []
+            if self.__lexical is not None:
+                tokens:List[str] = tokenize(text=query)
+                with self.__storeLock:
+                    lexical = self.__lexical_context(tokens=tokens, top_k=self.__hybridCfg.candidates)
+
+                # Si es una búsqueda de identificadores con resultados, no se calcula el embedding.
+                if lexical and self.__hybridCfg.identifierShortcut and is_identifier_query(tokens=tokens):
+                    return lexical[:self.__topK]
+
+            # Obtiene el embedding de la caché.
+            embedding:Optional[List[float]] = self.__queryCache.get(query=query) if self.__queryCache else None
+
+            # Si no está en caché, lo calcula (agrupado con las consultas concurrentes) y lo almacena.
+            if embedding is None:
+                embedding = self.__scheduler.embed(query=query) if self.__scheduler else self.embed_query(query=query)
+                if self.__queryCache is not None:
+                    self.__queryCache.put(query=query, embedding=embedding)
+
+            # Obtiene los fragmentos más similares.
+            with self.__storeLock:
+                dense:List[ContextDTO] = with_dense_score(context=self.search(embedding=embedding))
+
+            # Si no hay contexto léxico, retorna el denso.
+            if not lexical:
+                return dense
+            # Retorna la fusión de ambos.
+            return reciprocal_rank_fusion(rankings=[dense, lexical], k=self.__hybridCfg.rrfK, top_k=self.__topK)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"BaseDocumentModule.get_context() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+
+    def get_context_batch(self, queries:List[str]) -> List[List[ContextDTO]]:
+        """
+        Obtiene el contexto relevante de los documentos para varias consultas a la vez. Los
+        embeddings que no están en la caché se calculan en lotes y el almacén se consulta
+        con una única búsqueda por lotes.
+
+        Args:
+            queries (List[str]): Consultas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Listado con el contexto de cada consulta, en el mismo orden.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Variables a retornar.
+            contexts:List[Optional[List[ContextDTO]]] = [None] * len(queries)
+            lexicals:List[List[ContextDTO]] = [[] for __ in queries]
+
+            # Obtiene el contexto léxico de cada consulta.
+            if self.__lexical is not None:
+                with self.__storeLock:
+                    for i, query in enumerate(queries):
+                        tokens:List[str] = tokenize(text=query)
+                        lexicals[i] = self.__lexical_context(tokens=tokens, top_k=self.__hybridCfg.candidates)
+                        # Si es una búsqueda de identificadores con resultados, no se calcula el embedding.
+                        if lexicals[i] and self.__hybridCfg.identifierShortcut and is_identifier_query(tokens=tokens):
+                            contexts[i] = lexicals[i][:self.__topK]
+
+            # Obtiene de la caché los embeddings de las consultas restantes.
+            pending:List[int] = [i for i, context in enumerate(contexts) if context is None]
+            embeddings:Dict[str, List[float]] = {}
+            for i in pending:
+                embedding:Optional[List[float]] = self.__queryCache.get(query=queries[i]) if self.__queryCache else None
+                if embedding is not None:
+                    embeddings[queries[i]] = embedding
+
+            # Calcula en lotes los embeddings que faltan (una vez por consulta distinta) y los almacena.
+            missing:List[str] = list(dict.fromkeys(queries[i] for i in pending if queries[i] not in embeddings))
+            if missing:
+                for query, embedding in zip(missing, self.__batcher.embed(texts=missing)):
+                    embeddings[query] = embedding
+                    if self.__queryCache is not None:
+                        self.__queryCache.put(query=query, embedding=embedding)
+
+            # Obtiene los fragmentos más similares de todas las consultas a la vez.
+            with self.__storeLock:
+                dense:List[List[ContextDTO]] = self.search_batch(embeddings=[embeddings[queries[i]] for i in pending]) if pending else []
+
+            # Para cada consulta, retorna el contexto denso o su fusión con el léxico.
+            for i, context in zip(pending, dense):
+                context = with_dense_score(context=context)
+                contexts[i] = context if not lexicals[i] else reciprocal_rank_fusion(rankings=[context, lexicals[i]],
+                                                                                     k=self.__hybridCfg.rrfK, top_k=self.__topK)
+
+            # Retorna el contexto.
+            return contexts
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"BaseDocumentModule.get_context_batch() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+
+    def make_embeddings(self) -> Optional[IngestionDataDTO]:
+        """
+        Calcula los embeddings de los documentos nuevos o modificados y elimina los de
+        los documentos borrados.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            Optional[IngestionDataDTO]: Medidas de la ingesta o None si no había cambios.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Sincroniza todos los ficheros del directorio.
+            return self.__sync(file_paths=list_dir_files(root_path=self.__docPath, recursive=True))
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"BaseDocumentModule.make_embeddings() -> [{type(e).__name__}] No se pudo calcular los embeddings. Trace: {e}")
+
+    def update_files(self, paths:List[str]) -> Optional[IngestionDataDTO]:
+        """
+        Actualiza únicamente las rutas dadas. Las rutas pueden ser ficheros o directorios,
+        existentes o eliminados.
+
+        Args:
+            paths (List[str]): Rutas modificadas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            Optional[IngestionDataDTO]: Medidas de la ingesta o None si no había cambios.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Variables para las rutas.
+            file_paths:List[str] = []
+            scope:List[str] = []
+
+            # Para cada ruta modificada.
+            for path in paths:
+                # Obtiene la ruta absoluta.
+                resolved:Path = Path(path).resolve()
+                scope.append(str(resolved))
+                
+                # Si es un directorio, añade sus ficheros.
+                if resolved.is_dir():
+                    file_paths.extend(list_dir_files(root_path=resolved, recursive=True))
+                # Si es un fichero, lo añade.
+                elif resolved.is_file():
+                    file_paths.append(str(resolved))
+
+            # Sincroniza las rutas.
+            return self.__sync(file_paths=file_paths, scope=scope)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"BaseDocumentModule.update_files() -> [{type(e).__name__}] No se pudo actualizar los ficheros. Trace: {e}")
\ No newline at end of file
@@ -19,24 +19,100 @@
 # Librerías estándar
 import os
 from pathlib import Path
-from typing import List
+from functools import partial
+from typing import Callable, Dict, List, Tuple
 from contextlib import redirect_stdout, redirect_stderr
 # Librerías externas
-from haystack import Pipeline
+from haystack import Pipeline, Document
+from haystack.document_stores.types import DuplicatePolicy
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from haystack.components.converters import MultiFileConverter
 from haystack.components.preprocessors import DocumentPreprocessor
-from haystack.components.embedders import SentenceTransformersDocumentEmbedder
-from haystack.components.embedders import SentenceTransformersTextEmbedder
-from haystack.components.writers import DocumentWriter
 from haystack_integrations.components.retrievers.qdrant import QdrantEmbeddingRetriever
+from qdrant_client.http.models import OptimizersConfigDiff, QueryRequest
+from sentence_transformers import SentenceTransformer
 # Librerías internas
 from .base import BaseDocumentModule
+from core.rag.embedding import registry
 from model.context import ContextDTO
-from utils.path import list_dir_files
+from model.chunk import ChunkDTO
+from utils import console
 from config.schema.rag import RagConfig
 
 
+# ---- PARÁMETROS ---- #
+__SPLIT_PIPELINES:Dict[Tuple[int, int], Pipeline] = {}
+
+
+# ---- FUNCIONES ---- #
+def __create_split_pipeline(split_length:int, split_overlap:int) -> Pipeline:
+    """
+    Crea el pipeline para convertir y separar los documentos.
+    
+    Args:
+        split_length (int): Tamaño del chunk.
+        split_overlap (int): Overlap entre chunks.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        Pipeline: Pipeline de conversión y separación.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Variable a retornar.
+        pipeline:Pipeline = Pipeline()
+        
+        # Añade los componentes.
+        pipeline.add_component(instance=MultiFileConverter(), name='converter')
+        pipeline.add_component(instance=DocumentPreprocessor(split_by='word', split_length=split_length,
+                                                             split_overlap=split_overlap), name='preprocesor')
+
+        # Conecta los componentes.
+        pipeline.connect("converter", "preprocesor")
+        
+        # Retorna el pipeline.
+        return pipeline
+        
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"haystack_module::__create_split_pipeline() -> [{type(e).__name__}] No se pudo crear el pipeline de separación. Trace: {e}")
+
+def split_file(file_path:str, split_length:int, split_overlap:int) -> List[str]:
+    """
+    Convierte un fichero y lo separa en fragmentos. Se ejecuta en los procesos de la
+    etapa de separación, por lo que el pipeline se crea una única vez por proceso.
+    
+    Args:
+        file_path (str): Ruta del fichero.
+        split_length (int): Tamaño del chunk.
+        split_overlap (int): Overlap entre chunks.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        List[str]: Contenido de los fragmentos.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Obtiene el pipeline del proceso (o lo crea).
+        key:Tuple[int, int] = (split_length, split_overlap)
+        if key not in __SPLIT_PIPELINES:
+            __SPLIT_PIPELINES[key] = __create_split_pipeline(split_length=split_length, split_overlap=split_overlap)
+        
+        # Ejecuta el pipeline de separación.
+        with open(os.devnull, "w") as devnull:
+            with redirect_stdout(devnull), redirect_stderr(devnull):
+                results = __SPLIT_PIPELINES[key].run({"converter": {"sources": [file_path]}})
+        
+        # Retorna el contenido de los fragmentos.
+        return [doc.content for doc in results['preprocesor']['documents'] if doc.content]
+        
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excecpión.
+        raise OSError(f"haystack_module::split_file() -> [{type(e).__name__}] No se pudo separar el fichero. Trace: {e}")
+
+
 # ---- CLASES ---- #
 class HaystackDocumentModule(BaseDocumentModule):
     """
@@ -51,17 +127,25 @@ class HaystackDocumentModule(BaseDocumentModule):
         Args:
             rag_cfg (RagConfig): Configuración del RAG.
         """
+        # Inicializa la clase base.
+        super().__init__(rag_cfg=rag_cfg)
+        
         # Inicializa las propiedades.
         self.__modelPath:Path = Path(os.path.join('.server', rag_cfg.installModelDir, rag_cfg.model.tag))
-        self.__docPath:Path = Path(os.path.join('.server', rag_cfg.document.docDir))
         self.__store:QdrantDocumentStore = self.__crate_doc_store(rag_cfg=rag_cfg)
-        self.__embeddingPipeline:Pipeline = self.__create_embedding_pipeline(rag_cfg=rag_cfg)
-        self.__retrievePipeline:Pipeline = self.__create_retrieve_pipeline(rag_cfg=rag_cfg)
+        self.__splitLength:int = rag_cfg.document.splitLength
+        self.__splitOverlap:int = rag_cfg.document.splitOverlap
+        self.__indexingThreshold:int = rag_cfg.ingestion.indexingThreshold
+        self.__batchSize:int = rag_cfg.batching.maxBatchSize
+        self.__topK:int = rag_cfg.document.topK
+        self.__model:SentenceTransformer = registry.get_model(model_path=self.__modelPath, embedder_cfg=rag_cfg.embedder)
+        self.__retriever:QdrantEmbeddingRetriever = QdrantEmbeddingRetriever(document_store=self.__store, top_k=rag_cfg.document.topK)
         
     # -- Métodos privados -- #
     def __crate_doc_store(self, rag_cfg:RagConfig) -> QdrantDocumentStore:
         """
-        Crea y retorna un almacén de documentos.
+        Crea y retorna un almacén de documentos. El índice almacenado se reutiliza si se
+        construyó con los mismos parámetros.
         
         Args:
             rag_cfg (RagConfig): Configuración del RAG.
@@ -77,7 +161,7 @@ class HaystackDocumentModule(BaseDocumentModule):
                 path=os.path.join('.server', rag_cfg.document.storeDir, rag_cfg.document.framework),
                 index='qdrantStorage',
                 embedding_dim=rag_cfg.model.embeddingDim,
-                recreate_index=True
+                recreate_index=not self.IsIndexReusable
             )
     
         # Si ocurre algún error.
@@ -85,120 +169,176 @@ class HaystackDocumentModule(BaseDocumentModule):
             # Lanza una excepción.
             raise OSError(f"HaystackDocumentModule.__create_doc_store() -> [{type(e).__name__}] No se pudo crear el almacén de documentos. Trace: {e}")
     
-    def __create_embedding_pipeline(self, rag_cfg:RagConfig) -> Pipeline:
+    # -- Métodos BaseDocumentModule -- #
+    def get_split_function(self) -> Callable[[str], List[str]]:
+        """
+        Retorna la función que convierte un fichero y lo separa en fragmentos.
+        
+        Returns:
+            Callable[[str], List[str]]: Función de separación.
+        """
+        # Retorna la función con los parámetros de separación.
+        return partial(split_file, split_length=self.__splitLength, split_overlap=self.__splitOverlap)
+    
+    def embed_texts(self, texts:List[str]) -> List[List[float]]:
         """
-        Crea el pipeline para calcular los embeddings de documentos.
+        Calcula los embeddings de los textos.
         
         Args:
-            rag_cfg (RagConfig): Configuración del RAG.
+            texts (List[str]): Textos a embeber.
         Raises:
             OSError: En caso de que haya algún error.
         Returns:
-            Pipeline: Pipeline de embedding.
+            List[List[float]]: Embeddings de los textos, en el mismo orden.
         """
         # Try-Except para manejo de errores.
         try:
-            # Variable a retornar.
-            pipeline:Pipeline = Pipeline()
-            
-            # Añade los componentes.
-            pipeline.add_component(instance=MultiFileConverter(), name='converter')
-            pipeline.add_component(instance=DocumentPreprocessor(split_by='word', split_length=rag_cfg.document.splitLength,
-                                                                 split_overlap=rag_cfg.document.splitOverlap), name='preprocesor')
-            pipeline.add_component(instance=SentenceTransformersDocumentEmbedder(str(self.__modelPath)), name='embedder')
-            pipeline.add_component(instance=DocumentWriter(document_store=self.__store), name='writer')
-
-            # Conecta los componentes.
-            pipeline.connect("converter", "preprocesor")
-            pipeline.connect("preprocesor", "embedder")
-            pipeline.connect("embedder", "writer")
-            
-            # Retorna el pipeline.
-            return pipeline
+            # Retorna los embeddings, calculados con el modelo compartido.
+            return self.__model.encode(texts, batch_size=self.__batchSize, convert_to_numpy=True, show_progress_bar=False).tolist()
             
         # Si ocurre algún error.
         except Exception as e:
-            # Lanza una excepción.
-            raise OSError(f"HaystackDocumentModule.__create_embedding_pipeline() -> [{type(e).__name__}] No se pudo crear el pipeline de embeddings. Trace: {e}")
+            # Lanza una excecpión.
+            raise OSError(f"HaystackDocumentModule.embed_texts() -> [{type(e).__name__}] No se pudo calcular los embeddings. Trace: {e}")
     
-    def __create_retrieve_pipeline(self, rag_cfg:RagConfig) -> Pipeline:
+    def write_chunks(self, chunks:List[ChunkDTO], embeddings:List[List[float]]) -> None:
         """
-        Crea el pipeline para obtenener el contexto relevante.
+        Inserta (o reemplaza) los fragmentos en el almacén.
         
         Args:
-            rag_cfg (RagConfig): Configuración del RAG.
+            chunks (List[ChunkDTO]): Fragmentos a insertar.
+            embeddings (List[List[float]]): Embeddings de los fragmentos.
         Raises:
             OSError: En caso de que haya algún error.
-        Returns:
-            Pipeline: Pipeline de recuperación.
         """
         # Try-Except para manejo de errores.
         try:
-            # Variable a retornar.
-            pipeline:Pipeline = Pipeline()
+            # Genera los documentos.
+            documents:List[Document] = [Document(id=chunk.id, content=chunk.content, meta={'file_path': chunk.sourceDir}, embedding=embedding)
+                                        for chunk, embedding in zip(chunks, embeddings)]
             
-            # Añade los componentes.
-            pipeline.add_component(instance=SentenceTransformersTextEmbedder(str(self.__modelPath)), name='embedder')
-            pipeline.add_component(instance=QdrantEmbeddingRetriever(document_store=self.__store, top_k=rag_cfg.document.topK),
-                                   name='retriever')
-
-            # Conecta los componentes.
-            pipeline.connect("embedder.embedding", "retriever.query_embedding")
-            
-            # Retorna el pipeline.
-            return pipeline
+            # Inserta los documentos.
+            self.__store.write_documents(documents=documents, policy=DuplicatePolicy.OVERWRITE)
             
         # Si ocurre algún error.
         except Exception as e:
-            # Lanza una excepción.
-            raise OSError(f"HaystackDocumentModule.__create_retrieve_pipeline() -> [{type(e).__name__}] No se pudo crear el pipeline de recuperación. Trace: {e}")
+            # Lanza una excecpión.
+            raise OSError(f"HaystackDocumentModule.write_chunks() -> [{type(e).__name__}] No se pudo insertar los fragmentos. Trace: {e}")
     
-    # -- Métodos BaseDocumentModule -- #
-    def make_embeddings(self):
+    def begin_bulk_load(self) -> None:
+        """
+        Desactiva el indexado de Qdrant durante la carga para no reconstruir el índice
+        con cada lote.
+        """
+        # Try-Except para que la carga continúe aunque no se pueda desactivar.
+        try:
+            # Desactiva el indexado.
+            with self.StoreLock:
+                self.__store.client.update_collection(collection_name=self.__store.index, optimizers_config=OptimizersConfigDiff(indexing_threshold=0))
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso.
+            console.print_message(message=f"HaystackDocumentModule.begin_bulk_load() -> [{type(e).__name__}] No se pudo desactivar el indexado. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+    
+    def end_bulk_load(self) -> None:
         """
-        Calcula los embeddings de los documentos.
+        Restaura el indexado de Qdrant al terminar la carga, de modo que el índice se
+        construye una única vez.
+        """
+        # Try-Except para que la ingesta no falle si no se puede restaurar.
+        try:
+            # Restaura el indexado.
+            with self.StoreLock:
+                self.__store.client.update_collection(collection_name=self.__store.index, optimizers_config=OptimizersConfigDiff(indexing_threshold=self.__indexingThreshold))
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso.
+            console.print_message(message=f"HaystackDocumentModule.end_bulk_load() -> [{type(e).__name__}] No se pudo restaurar el indexado. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+    
+    def count_chunks(self) -> int:
+        """
+        Retorna el número de fragmentos del almacén.
         
         Raises:
             OSError: En caso de que haya algún error.
+        Returns:
+            int: Número de fragmentos almacenados.
         """
         # Try-Except para manejo de errores.
         try:
-            # Obtiene los ficheros disponibles.
-            filePaths:List[str] = list_dir_files(root_path=self.__docPath, recursive=True)
+            # Retorna el número de documentos.
+            return self.__store.count_documents()
             
-            # Imprime la información.
-            print(f"Se disponen de {len(filePaths)} ficheros.")
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"HaystackDocumentModule.count_chunks() -> [{type(e).__name__}] No se pudo contar los fragmentos. Trace: {e}")
+    
+    def delete_chunks(self, chunk_ids:List[str]) -> None:
+        """
+        Elimina los fragmentos del almacén.
+        
+        Args:
+            chunk_ids (List[str]): Identificadores de los fragmentos.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Elimina los documentos.
+            self.__store.delete_documents(document_ids=chunk_ids)
             
-            # Ejecuta el pipeline de embedding.
-            with open(os.devnull, "w") as devnull:
-                with redirect_stdout(devnull), redirect_stderr(devnull):
-                    self.__embeddingPipeline.run({"converter": {"sources": filePaths}})
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"HaystackDocumentModule.delete_chunks() -> [{type(e).__name__}] No se pudo eliminar los fragmentos. Trace: {e}")
+    
+    def embed_query(self, query:str) -> List[float]:
+        """
+        Calcula el embedding de una consulta.
         
+        Args:
+            query (str): Consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[float]: Embedding de la consulta.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Retorna el embedding, calculado con el modelo compartido.
+            return self.__model.encode(query, convert_to_numpy=True, show_progress_bar=False).tolist()
             
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excecpión.
-            raise OSError(f"HaystackDocumentModule.make_embeddings() -> [{type(e).__name__}] No se pudo calcular los embeddings. Trace: {e}")
+            raise OSError(f"HaystackDocumentModule.embed_query() -> [{type(e).__name__}] No se pudo calcular el embedding de la consulta. Trace: {e}")
     
-    def get_context(self, query:str):
+    def search(self, embedding:List[float]) -> List[ContextDTO]:
         """
-        Obtiene el contexto de la fuente de datos.
+        Obtiene los fragmentos más similares a un embedding.
         
+        Args:
+            embedding (List[float]): Embedding de la consulta.
         Raises:
             OSError: En caso de que haya algún error.
+        Returns:
+            List[ContextDTO]: Fragmentos más similares.
         """
         # Try-Except para manejo de errores.
         try:
             # Obtiene los documentos más relevantes.
-            with open(os.devnull, "w") as devnull:
-                with redirect_stdout(devnull), redirect_stderr(devnull):
-                    results = self.__retrievePipeline.run({"embedder" : {"text" : query}})
+            results = self.__retriever.run(query_embedding=embedding)
             
             # Variable a devolver.
             context:List[ContextDTO] = []
             
             # Para cada document obtenido.
-            for doc in results['retriever']['documents']:
+            for doc in results['documents']:
                 # Añade el contexto.
                 context.append(ContextDTO(score=doc.score, sourceType='Document', sourceDir=doc.meta['file_path'], content=doc.content))
             
@@ -208,4 +348,33 @@ class HaystackDocumentModule(BaseDocumentModule):
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excecpión.
-            raise OSError(f"HaystackDocumentModule.get_context() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
\ No newline at end of file
+            raise OSError(f"HaystackDocumentModule.search() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+    
+    def search_batch(self, embeddings:List[List[float]]) -> List[List[ContextDTO]]:
+        """
+        Obtiene los fragmentos más similares a varios embeddings con una única petición
+        por lotes a Qdrant.
+        
+        Args:
+            embeddings (List[List[float]]): Embeddings de las consultas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Fragmentos más similares a cada embedding, en el mismo orden.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene los puntos más relevantes de todas las consultas.
+            responses = self.__store.client.query_batch_points(
+                collection_name=self.__store.index,
+                requests=[QueryRequest(query=embedding, limit=self.__topK, with_payload=True) for embedding in embeddings]
+            )
+            
+            # Retorna el contexto de cada consulta (los puntos se almacenan con el formato de Haystack).
+            return [[ContextDTO(score=point.score, sourceType='Document', sourceDir=point.payload['meta']['file_path'], content=point.payload['content'])
+                     for point in response.points] for response in responses]
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excecpión.
+            raise OSError(f"HaystackDocumentModule.search_batch() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
\ No newline at end of file
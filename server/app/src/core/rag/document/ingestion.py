@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: ingestion.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el flujo de ingesta. Cada
+    etapa se ejecuta en su propio hilo y se comunica con la siguiente mediante colas
+    acotadas, por lo que la memoria no depende del tamaño del corpus.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional
+# Librerías externas
+
+# Librerías internas
+
+
+# ---- CLASES ---- #
+class StreamingPipeline:
+    """
+    Flujo de etapas encadenadas mediante colas acotadas. Cada etapa recibe un elemento y
+    retorna el elemento para la siguiente etapa (o None para descartarlo). Si una etapa
+    está saturada, las anteriores se bloquean hasta que haya hueco.
+    """
+    # -- Atributos -- #
+    __END:object = object()
+
+    # -- Métodos por defecto -- #
+    def __init__(self, stages:List[Callable[[Any], Optional[Any]]], queue_size:int,
+                 on_error:Callable[[Any, Exception], None]):
+        """
+        Inicializa la instancia.
+
+        Args:
+            stages (List[Callable[[Any], Optional[Any]]]): Etapas del flujo, en orden.
+            queue_size (int): Número máximo de elementos en cada cola.
+            on_error (Callable[[Any, Exception], None]): Función a la que se notifican los
+                elementos descartados por un error. El error de un elemento no detiene el flujo.
+        """
+        # Inicializa las propiedades.
+        self.__stages:List[Callable[[Any], Optional[Any]]] = stages
+        self.__queueSize:int = queue_size
+        self.__onError:Callable[[Any, Exception], None] = on_error
+        self.__failed:int = 0
+        self.__lock:threading.Lock = threading.Lock()
+
+    # -- Métodos privados -- #
+    def __run_stage(self, stage:Callable[[Any], Optional[Any]], source:queue.Queue, target:Optional[queue.Queue]) -> None:
+        """
+        Ejecuta una etapa hasta recibir el final del flujo.
+
+        Args:
+            stage (Callable[[Any], Optional[Any]]): Etapa.
+            source (queue.Queue): Cola de entrada.
+            target (Optional[queue.Queue]): Cola de salida o None si es la última etapa.
+        """
+        # Mientras no se reciba el final del flujo.
+        while True:
+            # Obtiene el siguiente elemento.
+            item = source.get()
+            # Si es el final, lo propaga y finaliza.
+            if item is self.__END:
+                if target is not None:
+                    target.put(self.__END)
+                return
+
+            # Try-Except para que un elemento no detenga el flujo.
+            try:
+                # Procesa el elemento.
+                result = stage(item)
+            # Si ocurre algún error, descarta el elemento.
+            except Exception as e:
+                with self.__lock:
+                    self.__failed += 1
+                self.__onError(item, e)
+                continue
+
+            # Envía el elemento a la siguiente etapa.
+            if target is not None and result is not None:
+                target.put(result)
+
+    # -- Métodos públicos -- #
+    def run(self, items:Iterable[Any]) -> int:
+        """
+        Ejecuta el flujo sobre los elementos y espera a que terminen todas las etapas.
+
+        Args:
+            items (Iterable[Any]): Elementos de entrada. Se consumen según hay hueco en
+                la primera cola.
+        Returns:
+            int: Número de elementos descartados por un error.
+        """
+        # Crea las colas y los hilos de cada etapa.
+        self.__failed = 0
+        queues:List[queue.Queue] = [queue.Queue(maxsize=self.__queueSize) for __ in self.__stages]
+        threads:List[threading.Thread] = [
+            threading.Thread(target=self.__run_stage, args=(stage, queues[i], queues[i + 1] if i + 1 < len(queues) else None),
+                             name=f"ingestion-{i}", daemon=True)
+            for i, stage in enumerate(self.__stages)
+        ]
+        # Inicia los hilos.
+        for thread in threads:
+            thread.start()
+
+        # Try-Finally para finalizar las etapas aunque falle la entrada.
+        try:
+            # Envía los elementos a la primera etapa.
+            for item in items:
+                queues[0].put(item)
+
+        # Señala el final del flujo y espera a las etapas.
+        finally:
+            queues[0].put(self.__END)
+            for thread in threads:
+                thread.join()
+
+        # Retorna el número de elementos descartados.
+        return self.__failed
\ No newline at end of file
@@ -19,123 +19,163 @@
 # Librerías estándar
 import os
 from pathlib import Path
-from typing import List, TypedDict, Dict
+from functools import partial
+from typing import Callable, List, Dict, Tuple
 from contextlib import redirect_stdout, redirect_stderr
 # Librerías externas
 from langchain_core.documents import Document
-from langchain_community.document_loaders import DirectoryLoader
+from langchain_community.document_loaders import UnstructuredFileLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
-from langgraph.graph import START, StateGraph
-from langgraph.graph.state import CompiledStateGraph
+from qdrant_client.http.models import Distance, VectorParams, PointStruct, PointIdsList, OptimizersConfigDiff, QueryRequest
+from sentence_transformers import SentenceTransformer
 # Librerías internas
 from .base import BaseDocumentModule
+from core.rag.embedding import registry
 from model.context import ContextDTO
-from utils.path import list_dir_files
-from config.schema.rag import RagConfig
+from model.chunk import ChunkDTO
+from utils import console
+from config.schema.rag import RagConfig, EmbedderConfig
 
 
-# ---- CLASES ---- #
-class State(TypedDict):
+# ---- PARÁMETROS ---- #
+__SPLITTERS:Dict[Tuple[int, int], RecursiveCharacterTextSplitter] = {}
+
+
+# ---- FUNCIONES ---- #
+def split_file(file_path:str, split_length:int, split_overlap:int) -> List[str]:
     """
+    Convierte un fichero y lo separa en fragmentos. Se ejecuta en los procesos de la
+    etapa de separación, por lo que el separador se crea una única vez por proceso.
     
+    Args:
+        file_path (str): Ruta del fichero.
+        split_length (int): Tamaño del chunk.
+        split_overlap (int): Overlap entre chunks.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        List[str]: Contenido de los fragmentos.
     """
-    # -- Atributos -- #
-    question:str
-    context:List[Document]
-    answer:str
+    # Try-Except para manejo de errores.
+    try:
+        # Obtiene el separador del proceso (o lo crea).
+        key:Tuple[int, int] = (split_length, split_overlap)
+        if key not in __SPLITTERS:
+            __SPLITTERS[key] = RecursiveCharacterTextSplitter(chunk_size=split_length, chunk_overlap=split_overlap,
+                                                              length_function=len, add_start_index=True)
+        
+        # Carga el documento y lo separa.
+        splits:List[Document] = __SPLITTERS[key].split_documents(UnstructuredFileLoader(file_path).load())
+        
+        # Retorna el contenido de los fragmentos.
+        return [split.page_content for split in splits if split.page_content]
+        
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"langchain_module::split_file() -> [{type(e).__name__}] No se pudo separar el fichero. Trace: {e}")
 
-class LangChainDocumentModule(BaseDocumentModule):
+
+# ---- CLASES ---- #
+class SharedEmbeddings(Embeddings):
     """
-    Clase base que representa un módulo de RAG. Contiene las funciones a implementar
-    por los módulos de documentos. Implementado con LangChain
+    Embeddings de LangChain calculados con el modelo compartido del registro, de modo que
+    el almacén no carga una segunda copia del modelo.
     """
     # -- Métodos por defecto -- #
-    def __init__(self, rag_cfg:RagConfig):
+    def __init__(self, model_path:Path, embedder_cfg:EmbedderConfig, batch_size:int):
         """
         Inicializa la instancia.
         
         Args:
-            rag_cfg (RagConfig): Configuración del RAG.
+            model_path (Path): Directorio del modelo.
+            embedder_cfg (EmbedderConfig): Configuración del backend del modelo.
+            batch_size (int): Tamaño de lote.
         """
         # Inicializa las propiedades.
-        self.__modelPath:Path = Path(os.path.join('.server', rag_cfg.installModelDir, rag_cfg.model.tag))
-        self.__storePath:Path = Path(os.path.join('.server', rag_cfg.document.storeDir, rag_cfg.document.framework))
-        self.__docPath:Path = Path(os.path.join('.server', rag_cfg.document.docDir))
-        
-        self.__embedder:HuggingFaceEmbeddings = self.__create_embedder()
-        self.__loader:DirectoryLoader = self.__create_loader()
-        self.__splitter:RecursiveCharacterTextSplitter = self.__create_splitter(rag_cfg=rag_cfg)
-        self.__qdrantClient:QdrantClient = self.__create_qdrant_client()
-        self.__store:QdrantVectorStore = self.__create_store(rag_cfg=rag_cfg)
-        
-        self.__graph:CompiledStateGraph = self.__create_graph()
+        self.__model:SentenceTransformer = registry.get_model(model_path=model_path, embedder_cfg=embedder_cfg)
+        self.__batchSize:int = batch_size
     
-    # -- Métodos privados -- #
-    def __create_embedder(self) -> HuggingFaceEmbeddings:
+    # -- Métodos Embeddings -- #
+    def embed_documents(self, texts:List[str]) -> List[List[float]]:
         """
-        Crea y retorna el embedder.
+        Calcula los embeddings de los textos.
         
         Args:
-            rag_cfg: Configuración del RAG.
-        Raises:
-            OSError: En caso de que haya algún error.
+            texts (List[str]): Textos a embeber.
         Returns:
-            HuggingFaceEmbeddings: Embedder.
+            List[List[float]]: Embeddings de los textos.
         """
-        # Try-Except para manejo de errores.
-        try:
-            # Retorna el objeto.
-            return HuggingFaceEmbeddings(model_name=str(self.__modelPath))
-
-        # Si ocurre algún error.
-        except Exception as e:
-            # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.__create_embedder() -> [{type(e).__name__}] No se pudo crear el embedder. Trace: {e}")
+        # Retorna los embeddings.
+        return self.__model.encode(texts, batch_size=self.__batchSize, convert_to_numpy=True, show_progress_bar=False).tolist()
     
-    def __create_loader(self) -> DirectoryLoader:
+    def embed_query(self, text:str) -> List[float]:
         """
-        Crea y retorna el cargador de documentos.
+        Calcula el embedding de una consulta.
         
-        Raises:
-            OSError: En caso de que haya algún error.
+        Args:
+            text (str): Consulta.
         Returns:
-            DirectoryLoader: Cargador de documentos.
+            List[float]: Embedding de la consulta.
         """
-        # Try-Except para manejo de errores.
-        try:
-            # Retorna el objeto.
-            return DirectoryLoader(self.__docPath)
+        # Retorna el embedding.
+        return self.__model.encode(text, convert_to_numpy=True, show_progress_bar=False).tolist()
 
-        # Si ocurre algún error.
-        except Exception as e:
-            # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.__create_loader() -> [{type(e).__name__}] No se pudo crear el cargador de documentos. Trace: {e}")
+
+class LangChainDocumentModule(BaseDocumentModule):
+    """
+    Clase base que representa un módulo de RAG. Contiene las funciones a implementar
+    por los módulos de documentos. Implementado con LangChain
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, rag_cfg:RagConfig):
+        """
+        Inicializa la instancia.
+        
+        Args:
+            rag_cfg (RagConfig): Configuración del RAG.
+        """
+        # Inicializa la clase base.
+        super().__init__(rag_cfg=rag_cfg)
+        
+        # Inicializa las propiedades.
+        self.__modelPath:Path = Path(os.path.join('.server', rag_cfg.installModelDir, rag_cfg.model.tag))
+        self.__storePath:Path = Path(os.path.join('.server', rag_cfg.document.storeDir, rag_cfg.document.framework))
+        self.__collectionName:str = rag_cfg.document.framework
+        self.__topK:int = rag_cfg.document.topK
+        self.__indexingThreshold:int = rag_cfg.ingestion.indexingThreshold
+        
+        self.__embedder:SharedEmbeddings = self.__create_embedder(rag_cfg=rag_cfg)
+        self.__splitLength:int = rag_cfg.document.splitLength
+        self.__splitOverlap:int = rag_cfg.document.splitOverlap
+        self.__qdrantClient:QdrantClient = self.__create_qdrant_client()
+        self.__store:QdrantVectorStore = self.__create_store(rag_cfg=rag_cfg)
     
-    def __create_splitter(self, rag_cfg:RagConfig) -> RecursiveCharacterTextSplitter:
+    # -- Métodos privados -- #
+    def __create_embedder(self, rag_cfg:RagConfig) -> SharedEmbeddings:
         """
-        Crea y retorna el separador.
+        Crea y retorna el embedder, que emplea el modelo compartido. El tamaño de lote es
+        el máximo para que cada lote de la ingesta se embeba en una única pasada.
         
         Args:
-            rag_cfg (RagConfig): Configuración del Rag.
+            rag_cfg (RagConfig): Configuración del RAG.
         Raises:
             OSError: En caso de que haya algún error.
         Returns:
-            RecursiveCharacterTextSplitter: Separador de documentos.
+            SharedEmbeddings: Embedder.
         """
         # Try-Except para manejo de errores.
         try:
             # Retorna el objeto.
-            return RecursiveCharacterTextSplitter(chunk_size=rag_cfg.document.splitLength, chunk_overlap=rag_cfg.document.splitOverlap,
-                                                  length_function=len, add_start_index=True)
+            return SharedEmbeddings(model_path=self.__modelPath, embedder_cfg=rag_cfg.embedder, batch_size=rag_cfg.batching.maxBatchSize)
 
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.__create_splitter() -> [{type(e).__name__}] No se pudo crear el separador de documentos. Trace: {e}")
+            raise OSError(f"LangChainDocumentModule.__create_embedder() -> [{type(e).__name__}] No se pudo crear el embedder. Trace: {e}")
     
     def __create_qdrant_client(self) -> QdrantClient:
         """
@@ -158,7 +198,8 @@ class LangChainDocumentModule(BaseDocumentModule):
 
     def __create_store(self, rag_cfg:RagConfig) -> QdrantVectorStore:
         """
-        Crea y retorna el almacén de Qdrant.
+        Crea y retorna el almacén de Qdrant. La colección existente se reutiliza si se
+        construyó con los mismos parámetros.
         
         Args:
             rag_cfg (RagConfig): Configuración del Rag.
@@ -174,8 +215,8 @@ class LangChainDocumentModule(BaseDocumentModule):
                 # Obtiene la información.
                 collection_info = self.__qdrantClient.get_collection(collection_name=rag_cfg.document.framework)
                 
-                # Comprueba si las dimensiones son diferentes.
-                if collection_info.config.params.vectors.size != rag_cfg.model.embeddingDim:
+                # Comprueba si el índice no es reutilizable o las dimensiones son diferentes.
+                if not self.IsIndexReusable or collection_info.config.params.vectors.size != rag_cfg.model.embeddingDim:
                     # Recrea la colección.
                     self.__qdrantClient.recreate_collection(collection_name=rag_cfg.document.framework, 
                                                     vectors_config=VectorParams(size=rag_cfg.model.embeddingDim, distance=Distance.COSINE))
@@ -194,83 +235,180 @@ class LangChainDocumentModule(BaseDocumentModule):
             # Lanza una excepción.
             raise OSError(f"LangChainDocumentModule.__create_store() -> [{type(e).__name__}] No se pudo crear el almacén de documentos. Trace: {e}")
     
-    def __retrieve(self, state:State) -> Dict:
+    # -- Métodos BaseDocumentModule -- #
+    def get_split_function(self) -> Callable[[str], List[str]]:
+        """
+        Retorna la función que convierte un fichero y lo separa en fragmentos.
+        
+        Returns:
+            Callable[[str], List[str]]: Función de separación.
+        """
+        # Retorna la función con los parámetros de separación.
+        return partial(split_file, split_length=self.__splitLength, split_overlap=self.__splitOverlap)
+    
+    def embed_texts(self, texts:List[str]) -> List[List[float]]:
         """
-        Obtiene el contexto relevante. Función necesaria para poder usar grafos compilados.
+        Calcula los embeddings de los textos.
         
+        Args:
+            texts (List[str]): Textos a embeber.
         Raises:
             OSError: En caso de que haya algún error.
         Returns:
-            Dict: Diccionario con el contexto.
+            List[List[float]]: Embeddings de los textos, en el mismo orden.
         """
         # Try-Except para manejo de errores.
         try:
-            # Obtiene los documentos relevantes y los retorna.
-            return {"context":self.__store.similarity_search(state["question"])}
+            # Retorna los embeddings.
+            return self.__embedder.embed_documents(texts)
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"LangChainDocumentModule.embed_texts() -> [{type(e).__name__}] No se pudo calcular los embeddings. Trace: {e}")
+    
+    def write_chunks(self, chunks:List[ChunkDTO], embeddings:List[List[float]]) -> None:
+        """
+        Inserta (o reemplaza) los fragmentos en el almacén. Los puntos se escriben con el
+        mismo formato que `QdrantVectorStore` para que puedan recuperarse con él.
         
+        Args:
+            chunks (List[ChunkDTO]): Fragmentos a insertar.
+            embeddings (List[List[float]]): Embeddings de los fragmentos.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera los puntos.
+            points:List[PointStruct] = [PointStruct(id=chunk.id, vector=embedding,
+                                                    payload={'page_content': chunk.content, 'metadata': {'source': chunk.sourceDir}})
+                                        for chunk, embedding in zip(chunks, embeddings)]
+            
+            # Inserta los puntos.
+            self.__qdrantClient.upsert(collection_name=self.__collectionName, points=points)
+            
+        # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.__retrieve() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+            raise OSError(f"LangChainDocumentModule.write_chunks() -> [{type(e).__name__}] No se pudo insertar los fragmentos. Trace: {e}")
     
-    def __create_graph(self) -> CompiledStateGraph:
+    def begin_bulk_load(self) -> None:
+        """
+        Desactiva el indexado de Qdrant durante la carga para no reconstruir el índice
+        con cada lote.
         """
-        Crea y retorna un stategraph compilado.
+        # Try-Except para que la carga continúe aunque no se pueda desactivar.
+        try:
+            # Desactiva el indexado.
+            with self.StoreLock:
+                self.__qdrantClient.update_collection(collection_name=self.__collectionName, optimizers_config=OptimizersConfigDiff(indexing_threshold=0))
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso.
+            console.print_message(message=f"LangChainDocumentModule.begin_bulk_load() -> [{type(e).__name__}] No se pudo desactivar el indexado. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+    
+    def end_bulk_load(self) -> None:
+        """
+        Restaura el indexado de Qdrant al terminar la carga, de modo que el índice se
+        construye una única vez.
+        """
+        # Try-Except para que la ingesta no falle si no se puede restaurar.
+        try:
+            # Restaura el indexado.
+            with self.StoreLock:
+                self.__qdrantClient.update_collection(collection_name=self.__collectionName, optimizers_config=OptimizersConfigDiff(indexing_threshold=self.__indexingThreshold))
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso.
+            console.print_message(message=f"LangChainDocumentModule.end_bulk_load() -> [{type(e).__name__}] No se pudo restaurar el indexado. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+    
+    def count_chunks(self) -> int:
+        """
+        Retorna el número de fragmentos del almacén.
         
         Raises:
             OSError: En caso de que haya algún error.
         Returns:
-            CompiledStateGraph
+            int: Número de fragmentos almacenados.
         """
         # Try-Except para manejo de errores.
         try:
-            # Retorna el contexto relevante.
-            graph_builder:StateGraph = StateGraph(State).add_node(self.__retrieve)
-            graph_builder.add_edge(START, "__retrieve")
-            # Retorna el graph.
-            return graph_builder.compile()
+            # Retorna el número de puntos.
+            return self.__qdrantClient.count(collection_name=self.__collectionName, exact=True).count
             
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.__create_graph() -> [{type(e).__name__}] No se pudo crear el graph. Trace: {e}")
-      
-    # -- Métodos BaseDocumentModule -- #
-    def make_embeddings(self):
+            raise OSError(f"LangChainDocumentModule.count_chunks() -> [{type(e).__name__}] No se pudo contar los fragmentos. Trace: {e}")
+    
+    def delete_chunks(self, chunk_ids:List[str]) -> None:
         """
-        Calcula los embeddings de los documentos.
+        Elimina los fragmentos del almacén.
         
+        Args:
+            chunk_ids (List[str]): Identificadores de los fragmentos.
         Raises:
             OSError: En caso de que haya algún error.
         """
         # Try-Except para manejo de errores.
         try:
-            # Obtiene los documentos y los separa.
-            splits = self.__splitter.split_documents(self.__loader.load())
+            # Elimina los puntos.
+            self.__qdrantClient.delete(collection_name=self.__collectionName, points_selector=PointIdsList(points=chunk_ids))
             
-            # Añade los documentos al almacén.
-            self.__store.add_documents(splits)
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"LangChainDocumentModule.delete_chunks() -> [{type(e).__name__}] No se pudo eliminar los fragmentos. Trace: {e}")
+    
+    def embed_query(self, query:str) -> List[float]:
+        """
+        Calcula el embedding de una consulta.
+        
+        Args:
+            query (str): Consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[float]: Embedding de la consulta.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Retorna el embedding.
+            return self.__embedder.embed_query(query)
             
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.make_embeddings() -> [{type(e).__name__}] No se pudo calcular los embeddings. Trace: {e}")
+            raise OSError(f"LangChainDocumentModule.embed_query() -> [{type(e).__name__}] No se pudo calcular el embedding de la consulta. Trace: {e}")
     
-    def get_context(self, query):
+    def search(self, embedding:List[float]) -> List[ContextDTO]:
         """
-        Obtiene el contexto de la fuente de datos.
+        Obtiene los fragmentos más similares a un embedding.
         
+        Args:
+            embedding (List[float]): Embedding de la consulta.
         Raises:
             OSError: En caso de que haya algún error.
+        Returns:
+            List[ContextDTO]: Fragmentos más similares.
         """
         # Try-Except para manejo de errores.
         try:
             # Variable a retornar.
             context:List[ContextDTO] = []
             
+            # Obtiene los documentos relevantes y su puntuación.
+            docs:List[Tuple[Document, float]] = self.__store.similarity_search_with_score_by_vector(embedding, k=self.__topK)
+            
             # Procesa la respuesta.
-            for doc in self.__graph.invoke({"question": query})['context']:
+            for doc, score in docs:
                 # Añade el contexto.
-                context.append(ContextDTO(score=0, sourceType='Document', sourceDir=doc.metadata['source'], content=doc.page_content))
+                context.append(ContextDTO(score=score, sourceType='Document', sourceDir=doc.metadata['source'], content=doc.page_content))
             
             # Retorna el contexto.
             return context
@@ -278,4 +416,33 @@ class LangChainDocumentModule(BaseDocumentModule):
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"LangChainDocumentModule.get_context() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
\ No newline at end of file
+            raise OSError(f"LangChainDocumentModule.search() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+    
+    def search_batch(self, embeddings:List[List[float]]) -> List[List[ContextDTO]]:
+        """
+        Obtiene los fragmentos más similares a varios embeddings con una única petición
+        por lotes a Qdrant.
+        
+        Args:
+            embeddings (List[List[float]]): Embeddings de las consultas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Fragmentos más similares a cada embedding, en el mismo orden.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene los puntos más relevantes de todas las consultas.
+            responses = self.__qdrantClient.query_batch_points(
+                collection_name=self.__collectionName,
+                requests=[QueryRequest(query=embedding, limit=self.__topK, with_payload=True) for embedding in embeddings]
+            )
+            
+            # Retorna el contexto de cada consulta (los puntos se almacenan con el formato de LangChain).
+            return [[ContextDTO(score=point.score, sourceType='Document', sourceDir=point.payload['metadata']['source'], content=point.payload['page_content'])
+                     for point in response.points] for response in responses]
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"LangChainDocumentModule.search_batch() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
\ No newline at end of file
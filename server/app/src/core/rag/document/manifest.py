@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: manifest.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el manifiesto de ingesta.
+    Registra la ruta, tamaño, fecha de modificación y hash de cada fichero y de sus
+    fragmentos, lo que permite indexar únicamente los ficheros nuevos o modificados.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Set
+# Librerías externas
+
+# Librerías internas
+from model.manifest import ManifestDTO, ManifestDiffDTO, FileEntryDTO, IndexInfoDTO
+from utils.file.common import hash_file
+
+
+# ---- CLASES ---- #
+class IngestionManifest:
+    """
+    Gestiona el manifiesto de ingesta persistente.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, file_path:Path):
+        """
+        Inicializa la instancia.
+
+        Args:
+            file_path (Path): Ruta del fichero del manifiesto.
+        """
+        # Inicializa las propiedades.
+        self.__filePath:Path = Path(file_path)
+        self.__manifest:ManifestDTO = self.__load()
+        self.__dirty:bool = False
+
+    # -- Métodos privados -- #
+    def __load(self) -> ManifestDTO:
+        """
+        Carga el manifiesto del fichero. Si el fichero no existe o no se puede leer,
+        retorna un manifiesto vacío, lo que fuerza a indexar todos los ficheros.
+
+        Returns:
+            ManifestDTO: Manifiesto cargado.
+        """
+        # Comprueba si no existe el fichero.
+        if not self.__filePath.exists():
+            # Retorna un manifiesto vacío.
+            return ManifestDTO()
+
+        # Try-Except para manejo de errores.
+        try:
+            # Carga el manifiesto.
+            return ManifestDTO.model_validate_json(self.__filePath.read_text(encoding='utf-8'))
+
+        # Si ocurre algún error.
+        except Exception:
+            # Retorna un manifiesto vacío.
+            return ManifestDTO()
+
+    def __in_scope(self, path:str, scope:List[str]) -> bool:
+        """
+        Comprueba si la ruta está dentro de alguna de las rutas dadas.
+
+        Args:
+            path (str): Ruta a comprobar.
+            scope (List[str]): Rutas de ficheros o directorios.
+        Returns:
+            bool: True si la ruta coincide o está contenida en alguna de ellas.
+        """
+        # Retorna si coincide con alguna ruta o está dentro de algún directorio.
+        return any(path == root or path.startswith(f"{root.rstrip(os.sep)}{os.sep}") for root in scope)
+
+    # -- Propiedades -- #
+    @property
+    def Fingerprint(self) -> str:
+        """
+        Retorna la huella del corpus en la última sincronización completa.
+
+        Returns:
+            str: Huella del corpus.
+        """
+        # Retorna la huella.
+        return self.__manifest.fingerprint
+
+    @Fingerprint.setter
+    def Fingerprint(self, fingerprint:str) -> None:
+        """
+        Establece la huella del corpus.
+
+        Args:
+            fingerprint (str): Huella del corpus.
+        """
+        # Establece la huella si ha cambiado.
+        if self.__manifest.fingerprint != fingerprint:
+            self.__manifest.fingerprint = fingerprint
+            self.__dirty = True
+
+    @property
+    def Index(self) -> Optional[IndexInfoDTO]:
+        """
+        Retorna los parámetros con los que se construyó el índice.
+
+        Returns:
+            Optional[IndexInfoDTO]: Parámetros del índice.
+        """
+        # Retorna los parámetros.
+        return self.__manifest.index
+
+    @property
+    def ChunkCount(self) -> int:
+        """
+        Retorna el número de fragmentos registrados.
+
+        Returns:
+            int: Número de fragmentos.
+        """
+        # Retorna el número de fragmentos.
+        return sum(len(entry.chunks) for entry in self.__manifest.files.values())
+
+    # -- Métodos públicos -- #
+    def is_compatible(self, index:IndexInfoDTO) -> bool:
+        """
+        Comprueba si el índice registrado se construyó con los mismos parámetros.
+
+        Args:
+            index (IndexInfoDTO): Parámetros actuales del índice.
+        Returns:
+            bool: True si el índice almacenado puede reutilizarse.
+        """
+        # Retorna si coinciden los parámetros.
+        return self.__manifest.index is not None and self.__manifest.index == index
+
+    def reset(self, index:IndexInfoDTO) -> None:
+        """
+        Vacía el manifiesto y registra los nuevos parámetros del índice. Todos los ficheros
+        se volverán a indexar.
+
+        Args:
+            index (IndexInfoDTO): Parámetros del índice.
+        """
+        # Reinicia el manifiesto.
+        self.__manifest = ManifestDTO(index=index)
+        self.__dirty = True
+
+    def diff(self, file_paths:List[str], scope:Optional[List[str]]=None) -> ManifestDiffDTO:
+        """
+        Compara los ficheros dados con el manifiesto. Solo se calcula el hash de los
+        ficheros cuyo tamaño o fecha de modificación han cambiado, por lo que con
+        un corpus sin cambios el coste se reduce a un `stat()` por fichero.
+
+        Args:
+            file_paths (List[str]): Rutas de los ficheros actuales.
+            scope (Optional[List[str]]): Rutas (ficheros o directorios) que se han comparado.
+                Solo se consideran eliminados los ficheros del manifiesto dentro de estas
+                rutas. Si es None, se compara el manifiesto completo.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            ManifestDiffDTO: Diferencias encontradas.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Variable a retornar.
+            diff:ManifestDiffDTO = ManifestDiffDTO()
+            # Huella de los ficheros.
+            fingerprint = hashlib.sha256()
+            # Ficheros que siguen existiendo.
+            current_paths:Set[str] = set()
+
+            # Para cada fichero (ordenados para que la huella sea estable).
+            for path in sorted(file_paths):
+                # Obtiene la información del fichero. Si se ha eliminado desde que se listó
+                # (p. ej. un editor que lo reemplaza mediante un fichero temporal), se trata
+                # como eliminado.
+                try:
+                    stat:os.stat_result = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entry:Optional[FileEntryDTO] = self.__manifest.files.get(path, None)
+
+                # Si ha cambiado el tamaño o la fecha de modificación, calcula el hash del fichero.
+                current:Optional[FileEntryDTO] = None
+                if not (entry and entry.size == stat.st_size and entry.mtime == stat.st_mtime_ns):
+                    try:
+                        current = FileEntryDTO(path=path, size=stat.st_size, mtime=stat.st_mtime_ns,
+                                               hash=hash_file(file_path=Path(path)))
+                    # Si se ha eliminado mientras se leía, se trata como eliminado.
+                    except OSError:
+                        if os.path.exists(path):
+                            raise
+                        continue
+
+                # Actualiza la huella y los ficheros existentes.
+                fingerprint.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+                current_paths.add(path)
+
+                # Si no ha cambiado el tamaño ni la fecha de modificación, continua.
+                if current is None:
+                    continue
+
+                # Si es un fichero nuevo.
+                if not entry:
+                    diff.added.append(current)
+                # Si el contenido es el mismo, solo actualiza los metadatos.
+                elif entry.hash == current.hash:
+                    entry.size, entry.mtime = current.size, current.mtime
+                    self.__dirty = True
+                # Si el contenido ha cambiado.
+                else:
+                    diff.changed.append(current)
+
+            # Obtiene los ficheros eliminados.
+            diff.removed = [path for path in self.__manifest.files
+                            if path not in current_paths and (scope is None or self.__in_scope(path=path, scope=scope))]
+            diff.fingerprint = fingerprint.hexdigest()
+
+            # Retorna las diferencias.
+            return diff
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"IngestionManifest.diff() -> [{type(e).__name__}] No se pudo comparar el manifiesto. Trace: {e}")
+
+    def get(self, path:str) -> Optional[FileEntryDTO]:
+        """
+        Retorna la entrada del fichero.
+
+        Args:
+            path (str): Ruta del fichero.
+        Returns:
+            Optional[FileEntryDTO]: Entrada del fichero o None si no está indexado.
+        """
+        # Retorna la entrada.
+        return self.__manifest.files.get(path, None)
+
+    def update(self, entry:FileEntryDTO) -> None:
+        """
+        Añade o reemplaza la entrada de un fichero.
+
+        Args:
+            entry (FileEntryDTO): Entrada del fichero.
+        """
+        # Actualiza la entrada.
+        self.__manifest.files[entry.path] = entry
+        self.__dirty = True
+
+    def remove(self, path:str) -> None:
+        """
+        Elimina la entrada de un fichero.
+
+        Args:
+            path (str): Ruta del fichero.
+        """
+        # Elimina la entrada si existe.
+        if self.__manifest.files.pop(path, None):
+            self.__dirty = True
+
+    def save(self) -> None:
+        """
+        Almacena el manifiesto en disco si ha cambiado. La escritura es atómica para
+        no dejar un manifiesto corrupto si el proceso se interrumpe.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Si no hay cambios, no hace nada.
+        if not self.__dirty:
+            return
+
+        # Try-Except para manejo de errores.
+        try:
+            # Crea el directorio si no existe.
+            os.makedirs(self.__filePath.parent, exist_ok=True)
+
+            # Escribe en un fichero temporal y lo reemplaza.
+            tmp_path:Path = self.__filePath.with_suffix(f"{self.__filePath.suffix}.tmp")
+            tmp_path.write_text(self.__manifest.model_dump_json(), encoding='utf-8')
+            os.replace(tmp_path, self.__filePath)
+
+            # Marca el manifiesto como guardado.
+            self.__dirty = False
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"IngestionManifest.save() -> [{type(e).__name__}] No se pudo almacenar el manifiesto. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: native_module.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones base relaciondas con el módulo de RAG
+    de documentos. Implementado con un índice vectorial propio en NumPy.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+from pathlib import Path
+from functools import partial
+from typing import Callable, List, Union
+# Librerías externas
+import numpy as np
+from sentence_transformers import SentenceTransformer
+# Librerías internas
+from .base import BaseDocumentModule
+from core.rag.embedding import registry
+from .haystack_module import split_file
+from core.rag.index.flat import FlatIndex
+from core.rag.index.ivf import IVFIndex
+from core.rag.index.chunk_store import ChunkStore
+from model.context import ContextDTO
+from model.chunk import ChunkDTO
+from utils import console
+from config.schema.rag import RagConfig
+
+
+# ---- CLASES ---- #
+class NativeDocumentModule(BaseDocumentModule):
+    """
+    Clase base que representa un módulo de RAG. Contiene las funciones a implementar
+    por los módulos de documentos. Implementado con un índice exacto en NumPy: los
+    embeddings normalizados se mapean en memoria y la búsqueda es un único producto
+    matricial, sin framework ni base de datos vectorial.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, rag_cfg:RagConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            rag_cfg (RagConfig): Configuración del RAG.
+        """
+        # Inicializa la clase base.
+        super().__init__(rag_cfg=rag_cfg)
+
+        # Inicializa las propiedades.
+        self.__modelPath:Path = Path(os.path.join('.server', rag_cfg.installModelDir, rag_cfg.model.tag))
+        self.__storePath:Path = Path(os.path.join('.server', rag_cfg.document.storeDir, rag_cfg.document.framework))
+        self.__splitLength:int = rag_cfg.document.splitLength
+        self.__splitOverlap:int = rag_cfg.document.splitOverlap
+        self.__topK:int = rag_cfg.document.topK
+        self.__batchSize:int = rag_cfg.batching.maxBatchSize
+
+        self.__model:SentenceTransformer = registry.get_model(model_path=self.__modelPath, embedder_cfg=rag_cfg.embedder)
+        self.__index:Union[FlatIndex, IVFIndex] = self.__create_index(rag_cfg=rag_cfg)
+        self.__chunks:ChunkStore = ChunkStore(root_path=self.__storePath)
+
+        # Si el índice almacenado no es reutilizable, lo vacía.
+        if not self.IsIndexReusable:
+            self.__index.reset()
+            self.__chunks.reset()
+
+    # -- Métodos privados -- #
+    def __create_index(self, rag_cfg:RagConfig) -> Union[FlatIndex, IVFIndex]:
+        """
+        Crea el índice vectorial configurado.
+
+        Args:
+            rag_cfg (RagConfig): Configuración del RAG.
+        Raises:
+            ValueError: Si el índice no se reconoce.
+        Returns:
+            Union[FlatIndex, IVFIndex]: Índice vectorial.
+        """
+        # Comprueba el índice empleado.
+        match (rag_cfg.document.index):
+            # Si es exacto.
+            case 'FLAT':
+                # Retorna el índice exacto.
+                return FlatIndex(root_path=self.__storePath, embedding_dim=rag_cfg.model.embeddingDim,
+                                 quantization=rag_cfg.document.quantization, rescore_factor=rag_cfg.document.rescoreFactor)
+
+            # Si es aproximado.
+            case 'IVF':
+                # Retorna el índice IVF.
+                return IVFIndex(root_path=self.__storePath, embedding_dim=rag_cfg.model.embeddingDim, nlist=rag_cfg.document.nlist,
+                                nprobe=rag_cfg.document.nprobe, rebuild_ratio=rag_cfg.document.rebuildRatio,
+                                min_train_size=rag_cfg.document.minTrainSize, quantization=rag_cfg.document.quantization,
+                                rescore_factor=rag_cfg.document.rescoreFactor)
+
+        # Si es un índice desconocido, lanza una excepción.
+        raise ValueError(f"El índice <{rag_cfg.document.index}> no se reconoce.")
+
+    # -- Métodos BaseDocumentModule -- #
+    def get_split_function(self) -> Callable[[str], List[str]]:
+        """
+        Retorna la función que convierte un fichero y lo separa en fragmentos. Se emplean
+        los conversores de Haystack.
+
+        Returns:
+            Callable[[str], List[str]]: Función de separación.
+        """
+        # Retorna la función con los parámetros de separación.
+        return partial(split_file, split_length=self.__splitLength, split_overlap=self.__splitOverlap)
+
+    def embed_texts(self, texts:List[str]) -> List[List[float]]:
+        """
+        Calcula los embeddings de los textos.
+
+        Args:
+            texts (List[str]): Textos a embeber.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[float]]: Embeddings de los textos, en el mismo orden.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Retorna los embeddings.
+            return self.__model.encode(texts, batch_size=self.__batchSize, normalize_embeddings=True,
+                                       convert_to_numpy=True, show_progress_bar=False).tolist()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"NativeDocumentModule.embed_texts() -> [{type(e).__name__}] No se pudo calcular los embeddings. Trace: {e}")
+
+    def embed_query(self, query:str) -> List[float]:
+        """
+        Calcula el embedding de una consulta.
+
+        Args:
+            query (str): Consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[float]: Embedding de la consulta.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Retorna el embedding.
+            return self.__model.encode(query, normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False).tolist()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"NativeDocumentModule.embed_query() -> [{type(e).__name__}] No se pudo calcular el embedding de la consulta. Trace: {e}")
+
+    def search(self, embedding:List[float]) -> List[ContextDTO]:
+        """
+        Obtiene los fragmentos más similares a un embedding.
+
+        Args:
+            embedding (List[float]): Embedding de la consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[ContextDTO]: Fragmentos más similares.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Variable a retornar.
+            context:List[ContextDTO] = []
+
+            # Obtiene las posiciones más similares.
+            slots, scores = self.__index.search(query=np.asarray(embedding, dtype=np.float32), top_k=self.__topK)
+
+            # Para cada posición obtenida.
+            for slot, score in zip(slots.tolist(), scores.tolist()):
+                # Lee el fragmento y añade el contexto.
+                content, source = self.__chunks.get(slot=slot)
+                context.append(ContextDTO(score=score, sourceType='Document', sourceDir=source, content=content))
+
+            # Retorna el contexto.
+            return context
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"NativeDocumentModule.search() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+
+    def search_batch(self, embeddings:List[List[float]]) -> List[List[ContextDTO]]:
+        """
+        Obtiene los fragmentos más similares a varios embeddings con una única búsqueda.
+
+        Args:
+            embeddings (List[List[float]]): Embeddings de las consultas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Fragmentos más similares a cada embedding, en el mismo orden.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Variable a retornar.
+            contexts:List[List[ContextDTO]] = []
+
+            # Obtiene las posiciones más similares de todas las consultas.
+            results = self.__index.search_batch(queries=np.asarray(embeddings, dtype=np.float32), top_k=self.__topK)
+
+            # Para cada consulta.
+            for slots, scores in results:
+                # Lee los fragmentos y añade el contexto.
+                context:List[ContextDTO] = []
+                for slot, score in zip(slots.tolist(), scores.tolist()):
+                    content, source = self.__chunks.get(slot=slot)
+                    context.append(ContextDTO(score=score, sourceType='Document', sourceDir=source, content=content))
+                contexts.append(context)
+
+            # Retorna el contexto.
+            return contexts
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"NativeDocumentModule.search_batch() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+
+    def write_chunks(self, chunks:List[ChunkDTO], embeddings:List[List[float]]) -> None:
+        """
+        Inserta (o reemplaza) los fragmentos en el índice.
+
+        Args:
+            chunks (List[ChunkDTO]): Fragmentos a insertar.
+            embeddings (List[List[float]]): Embeddings de los fragmentos.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Inserta los vectores y el contenido en las mismas posiciones.
+            slots:List[int] = self.__index.add(ids=[chunk.id for chunk in chunks], vectors=np.asarray(embeddings, dtype=np.float32))
+            self.__chunks.put(slots=slots, chunks=chunks)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"NativeDocumentModule.write_chunks() -> [{type(e).__name__}] No se pudo insertar los fragmentos. Trace: {e}")
+
+    def count_chunks(self) -> int:
+        """
+        Retorna el número de fragmentos del índice.
+
+        Returns:
+            int: Número de fragmentos almacenados.
+        """
+        # Retorna el número de vectores.
+        return self.__index.Count
+
+    def delete_chunks(self, chunk_ids:List[str]) -> None:
+        """
+        Elimina los fragmentos del índice.
+
+        Args:
+            chunk_ids (List[str]): Identificadores de los fragmentos.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Elimina los vectores y libera el contenido.
+            self.__chunks.remove(slots=self.__index.remove(ids=chunk_ids))
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"NativeDocumentModule.delete_chunks() -> [{type(e).__name__}] No se pudo eliminar los fragmentos. Trace: {e}")
+
+    def end_bulk_load(self) -> None:
+        """
+        Almacena el índice y el contenido en disco al terminar la carga. Si el corpus ha
+        variado lo suficiente, reentrena el índice aproximado.
+        """
+        # Try-Except para que la ingesta no falle si no se puede almacenar.
+        try:
+            # Almacena el índice y el contenido.
+            with self.StoreLock:
+                # Reentrena el índice IVF si es necesario.
+                if isinstance(self.__index, IVFIndex) and self.__index.needs_rebuild():
+                    self.__index.rebuild()
+                self.__index.save()
+                self.__chunks.save()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso. El almacén no coincidirá con el manifiesto y se reindexará.
+            console.print_message(message=f"NativeDocumentModule.end_bulk_load() -> [{type(e).__name__}] No se pudo almacenar el índice. Trace: {e}",
+                                  type=console.MessageType.WARNING)
\ No newline at end of file
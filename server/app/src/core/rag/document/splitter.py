@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: splitter.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la etapa de conversión y
+    separación de la ingesta. Reparte los ficheros entre un conjunto de procesos y
+    devuelve los fragmentos según se obtienen.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.pool import Pool, AsyncResult
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+# Librerías externas
+
+# Librerías internas
+from model.chunk import SplitResultDTO
+from config.schema.rag import IngestionConfig
+
+
+# ---- CLASES ---- #
+class DocumentSplitter:
+    """
+    Convierte y separa ficheros en un conjunto de procesos. Cada fichero tiene un tiempo
+    máximo: si se supera (o el proceso muere), se descarta ese fichero y se reinicia el
+    conjunto de procesos, de modo que un fichero corrupto no detiene la ingesta.
+    """
+    # -- Atributos -- #
+    __WAIT_STEP:float = 0.05
+
+    # -- Métodos por defecto -- #
+    def __init__(self, split_fn:Callable[[str], List[str]], ingestion_cfg:IngestionConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            split_fn (Callable[[str], List[str]]): Función que convierte y separa un fichero.
+                Debe poder serializarse (función de módulo o `functools.partial`).
+            ingestion_cfg (IngestionConfig): Configuración de la ingesta.
+        """
+        # Inicializa las propiedades.
+        self.__splitFn:Callable[[str], List[str]] = split_fn
+        self.__cfg:IngestionConfig = ingestion_cfg
+        self.__pool:Optional[Pool] = None
+
+    # -- Métodos privados -- #
+    def __get_pool(self) -> Pool:
+        """
+        Retorna el conjunto de procesos, creándolo si no existe. Se emplea `spawn` para
+        no heredar los hilos ni los modelos cargados en el proceso principal.
+
+        Returns:
+            Pool: Conjunto de procesos.
+        """
+        # Crea el conjunto de procesos si no existe.
+        if self.__pool is None:
+            self.__pool = multiprocessing.get_context('spawn').Pool(processes=self.__cfg.workers,
+                                                                    maxtasksperchild=self.__cfg.maxTasksPerChild)
+        # Retorna el conjunto de procesos.
+        return self.__pool
+
+    def __split_local(self, path:str) -> SplitResultDTO:
+        """
+        Convierte y separa un fichero en el propio proceso.
+
+        Args:
+            path (str): Ruta del fichero.
+        Returns:
+            SplitResultDTO: Resultado de la separación.
+        """
+        # Try-Except para aislar los errores del fichero.
+        try:
+            # Retorna los fragmentos.
+            return SplitResultDTO(path=path, contents=self.__splitFn(path))
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Retorna el error.
+            return SplitResultDTO(path=path, error=f"[{type(e).__name__}] {e}")
+
+    # -- Métodos públicos -- #
+    def split(self, file_paths:List[str]) -> Iterator[SplitResultDTO]:
+        """
+        Convierte y separa los ficheros. Los resultados se devuelven según terminan, sin
+        esperar al resto de ficheros, y como mucho hay `workers` ficheros en curso.
+
+        Args:
+            file_paths (List[str]): Rutas de los ficheros.
+        Returns:
+            Iterator[SplitResultDTO]: Resultado de cada fichero.
+        """
+        # Si no hay procesos, separa los ficheros en el propio proceso.
+        if self.__cfg.workers == 0:
+            for path in file_paths:
+                yield self.__split_local(path=path)
+            return
+
+        # Ficheros pendientes y en curso (con su tiempo límite).
+        pending:Deque[str] = deque(file_paths)
+        running:Dict[str, Tuple[AsyncResult, float]] = {}
+
+        # Mientras queden ficheros.
+        while pending or running:
+            # Envía ficheros hasta ocupar todos los procesos.
+            pool:Pool = self.__get_pool()
+            while pending and len(running) < self.__cfg.workers:
+                path:str = pending.popleft()
+                running[path] = (pool.apply_async(self.__splitFn, (path,)), time.monotonic() + self.__cfg.fileTimeout)
+
+            # Espera brevemente al fichero más antiguo.
+            next(iter(running.values()))[0].wait(timeout=self.__WAIT_STEP)
+
+            # Devuelve los ficheros terminados.
+            for path, (result, __) in list(running.items()):
+                # Si no ha terminado, continúa.
+                if not result.ready():
+                    continue
+                # Elimina el fichero de los ficheros en curso.
+                del running[path]
+                # Try-Except para aislar los errores del fichero.
+                try:
+                    yield SplitResultDTO(path=path, contents=result.get())
+                except Exception as e:
+                    yield SplitResultDTO(path=path, error=f"[{type(e).__name__}] {e}")
+
+            # Obtiene los ficheros que han superado el tiempo límite.
+            now:float = time.monotonic()
+            expired:List[str] = [path for path, (__, deadline) in running.items() if now > deadline]
+            # Si hay ficheros bloqueados.
+            if expired:
+                # Detiene los procesos (no es posible cancelar una única tarea).
+                self.close()
+                # Descarta los ficheros bloqueados.
+                for path in expired:
+                    del running[path]
+                    yield SplitResultDTO(path=path, error=f"[TimeoutError] Se ha superado el tiempo máximo ({self.__cfg.fileTimeout} s).")
+                # Vuelve a encolar el resto de ficheros en curso.
+                pending.extendleft(reversed(list(running)))
+                running.clear()
+
+    def close(self) -> None:
+        """
+        Detiene el conjunto de procesos. Se vuelve a crear en la siguiente separación.
+        """
+        # Si existe el conjunto de procesos.
+        if self.__pool is not None:
+            # Detiene los procesos.
+            self.__pool.terminate()
+            self.__pool.join()
+            self.__pool = None
\ No newline at end of file
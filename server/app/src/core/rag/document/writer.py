@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: writer.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la escritura por lotes de
+    los fragmentos en el almacén de vectores.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import time
+import threading
+from typing import Callable, List
+# Librerías externas
+
+# Librerías internas
+from model.chunk import ChunkDTO, IngestionItemDTO
+from model.manifest import FileEntryDTO
+
+
+# ---- CLASES ---- #
+class BulkWriter:
+    """
+    Agrupa los fragmentos de varios ficheros y los inserta en lotes de tamaño fijo. Un
+    fichero se confirma (en el manifiesto) una vez se han escrito todos sus fragmentos.
+    Lleva la cuenta de los puntos escritos para medir el rendimiento de la ingesta.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, write_fn:Callable[[List[ChunkDTO], List[List[float]]], None], delete_fn:Callable[[List[str]], None],
+                 commit_fn:Callable[[FileEntryDTO, List[ChunkDTO]], None], batch_size:int, lock:threading.RLock):
+        """
+        Inicializa la instancia.
+
+        Args:
+            write_fn (Callable[[List[ChunkDTO], List[List[float]]], None]): Función que inserta
+                un lote de fragmentos.
+            delete_fn (Callable[[List[str]], None]): Función que elimina fragmentos.
+            commit_fn (Callable[[FileEntryDTO, List[ChunkDTO]], None]): Función que registra
+                un fichero escrito con sus fragmentos.
+            batch_size (int): Número de puntos por lote.
+            lock (threading.RLock): Cerrojo del almacén.
+        """
+        # Inicializa las propiedades.
+        self.__writeFn:Callable[[List[ChunkDTO], List[List[float]]], None] = write_fn
+        self.__deleteFn:Callable[[List[str]], None] = delete_fn
+        self.__commitFn:Callable[[FileEntryDTO, List[ChunkDTO]], None] = commit_fn
+        self.__batchSize:int = batch_size
+        self.__lock:threading.RLock = lock
+
+        # Elementos pendientes de escribir.
+        self.__chunks:List[ChunkDTO] = []
+        self.__embeddings:List[List[float]] = []
+        self.__stale:List[str] = []
+        self.__items:List[IngestionItemDTO] = []
+
+        # Medidas.
+        self.__points:int = 0
+        self.__writeDuration:float = 0.0
+
+    # -- Propiedades -- #
+    @property
+    def Points(self) -> int:
+        """
+        Retorna el número de puntos escritos.
+
+        Returns:
+            int: Número de puntos escritos.
+        """
+        # Retorna el número de puntos.
+        return self.__points
+
+    @property
+    def WriteDuration(self) -> float:
+        """
+        Retorna el tiempo (s) empleado en escribir en el almacén.
+
+        Returns:
+            float: Tiempo de escritura.
+        """
+        # Retorna el tiempo de escritura.
+        return self.__writeDuration
+
+    # -- Métodos públicos -- #
+    def add(self, item:IngestionItemDTO) -> None:
+        """
+        Añade un fichero a escribir. Si se alcanza el tamaño de lote, se escriben los
+        ficheros pendientes.
+
+        Args:
+            item (IngestionItemDTO): Fichero con los fragmentos y embeddings.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Añade los elementos pendientes.
+        self.__chunks.extend(item.pending)
+        self.__embeddings.extend(item.embeddings)
+        self.__stale.extend(item.stale)
+        self.__items.append(item)
+
+        # Si se ha alcanzado el tamaño de lote, escribe.
+        if len(self.__chunks) >= self.__batchSize or len(self.__stale) >= self.__batchSize:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Escribe los fragmentos pendientes en lotes, elimina los fragmentos que ya no
+        existen y confirma los ficheros.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene el tiempo inicial.
+            start:float = time.perf_counter()
+
+            # Bloquea el almacén.
+            with self.__lock:
+                # Inserta los fragmentos en lotes.
+                for i in range(0, len(self.__chunks), self.__batchSize):
+                    self.__writeFn(self.__chunks[i:i + self.__batchSize], self.__embeddings[i:i + self.__batchSize])
+                # Elimina los fragmentos que ya no existen.
+                if self.__stale:
+                    self.__deleteFn(self.__stale)
+
+            # Actualiza las medidas.
+            self.__writeDuration += time.perf_counter() - start
+            self.__points += len(self.__chunks)
+
+            # Confirma los ficheros escritos.
+            for item in self.__items:
+                self.__commitFn(item.entry, item.chunks)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"BulkWriter.flush() -> [{type(e).__name__}] No se pudo escribir el lote. Trace: {e}")
+
+        # Vacía los elementos pendientes (aunque falle, se reintentarán en la siguiente ingesta).
+        finally:
+            self.__chunks, self.__embeddings, self.__stale, self.__items = [], [], [], []
\ No newline at end of file
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: batcher.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el cálculo de embeddings
+    por lotes. Los textos se ordenan por longitud para reducir el relleno y el tamaño
+    del lote se ajusta según la latencia medida.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import time
+from typing import Callable, List, Optional
+# Librerías externas
+
+# Librerías internas
+from config.schema.rag import BatchingConfig
+
+
+# ---- FUNCIONES ---- #
+def estimate_tokens(text:str) -> int:
+    """
+    Estima el número de tokens de un texto (aproximadamente 4 caracteres por token).
+
+    Args:
+        text (str): Texto.
+    Returns:
+        int: Número de tokens estimado.
+    """
+    # Retorna la estimación.
+    return len(text) // 4 + 1
+
+
+# ---- CLASES ---- #
+class AdaptiveBatcher:
+    """
+    Calcula embeddings por lotes. Los textos se ordenan de mayor a menor longitud, de modo
+    que cada lote contiene textos de longitud parecida y apenas hay relleno. El tamaño del
+    lote se duplica mientras la latencia está por debajo del máximo y se reduce a la mitad
+    si lo supera; además, ningún lote supera el máximo de tokens (con relleno).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, embed_fn:Callable[[List[str]], List[List[float]]], batching_cfg:BatchingConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            embed_fn (Callable[[List[str]], List[List[float]]]): Función que calcula los
+                embeddings de un lote.
+            batching_cfg (BatchingConfig): Configuración del cálculo por lotes.
+        """
+        # Inicializa las propiedades.
+        self.__embedFn:Callable[[List[str]], List[List[float]]] = embed_fn
+        self.__cfg:BatchingConfig = batching_cfg
+        self.__batchSize:int = batching_cfg.minBatchSize
+
+    # -- Propiedades -- #
+    @property
+    def BatchSize(self) -> int:
+        """
+        Retorna el tamaño de lote actual.
+
+        Returns:
+            int: Tamaño de lote.
+        """
+        # Retorna el tamaño de lote.
+        return self.__batchSize
+
+    # -- Métodos privados -- #
+    def __adapt(self, size:int, latency:float) -> None:
+        """
+        Ajusta el tamaño del lote según la latencia del último lote.
+
+        Args:
+            size (int): Tamaño del último lote.
+            latency (float): Latencia (ms) del último lote.
+        """
+        # Si se ha superado la latencia máxima, reduce el lote.
+        if latency > self.__cfg.maxBatchLatency:
+            self.__batchSize = max(self.__cfg.minBatchSize, size // 2)
+        # Si el lote estaba completo y queda margen, lo duplica.
+        elif size >= self.__batchSize and latency * 2 <= self.__cfg.maxBatchLatency:
+            self.__batchSize = min(self.__cfg.maxBatchSize, self.__batchSize * 2)
+
+    # -- Métodos públicos -- #
+    def embed(self, texts:List[str]) -> List[List[float]]:
+        """
+        Calcula los embeddings de los textos por lotes.
+
+        Args:
+            texts (List[str]): Textos a embeber.
+        Returns:
+            List[List[float]]: Embeddings de los textos, en el orden original.
+        """
+        # Variable a retornar.
+        embeddings:List[Optional[List[float]]] = [None] * len(texts)
+
+        # Ordena los textos de mayor a menor longitud.
+        lengths:List[int] = [estimate_tokens(text=text) for text in texts]
+        order:List[int] = sorted(range(len(texts)), key=lambda i: lengths[i], reverse=True)
+
+        # Mientras queden textos.
+        start:int = 0
+        while start < len(order):
+            # El primer texto del lote es el más largo, por lo que limita el número de textos.
+            size:int = max(1, min(self.__batchSize, self.__cfg.maxBatchTokens // lengths[order[start]]))
+            batch:List[int] = order[start:start + size]
+
+            # Calcula los embeddings del lote.
+            begin:float = time.perf_counter()
+            results:List[List[float]] = self.__embedFn([texts[i] for i in batch])
+            self.__adapt(size=len(batch), latency=(time.perf_counter() - begin) * 1000)
+
+            # Coloca los embeddings en su posición original.
+            for i, embedding in zip(batch, results):
+                embeddings[i] = embedding
+            start += len(batch)
+
+        # Retorna los embeddings.
+        return embeddings
\ No newline at end of file
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: cache.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la caché persistente de
+    embeddings de fragmentos. Las claves y los vectores se almacenan juntos en un array
+    mapeado en memoria, con expulsión LRU.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import re
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+# Librerías externas
+import numpy as np
+# Librerías internas
+from model.measure import CacheStatsDTO
+
+
+# ---- FUNCIONES ---- #
+def normalize_text(text:str) -> str:
+    """
+    Normaliza un texto para emplearlo como clave: forma Unicode NFC y espacios
+    colapsados.
+
+    Args:
+        text (str): Texto a normalizar.
+    Returns:
+        str: Texto normalizado.
+    """
+    # Retorna el texto normalizado.
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+
+# ---- CLASES ---- #
+class EmbeddingCache:
+    """
+    Caché persistente de embeddings indexada por (etiqueta del modelo, hash del texto
+    normalizado). Tiene un tamaño máximo de entradas y expulsa las menos usadas recientemente.
+
+    Cada entrada guarda en la misma fila su clave (bytes sin procesar), su reloj LRU, su
+    vector y una suma de comprobación de la clave y el vector. Así la clave se persiste
+    junto al vector, y si el proceso termina con una fila escrita a medias, la entrada se
+    descarta al abrir la caché en lugar de asociar la clave a otro vector.
+    """
+    # -- Atributos -- #
+    __KEY_SIZE:int = 16
+
+    # -- Métodos por defecto -- #
+    def __init__(self, root_path:Path, model_tag:str, embedding_dim:int, max_entries:int):
+        """
+        Inicializa la instancia. Si existe una caché previa con las mismas dimensiones
+        se reutiliza.
+
+        Args:
+            root_path (Path): Directorio raiz de la caché.
+            model_tag (str): Etiqueta del modelo de embeddings.
+            embedding_dim (int): Tamaño de los embeddings.
+            max_entries (int): Número máximo de entradas.
+        """
+        # Inicializa las propiedades.
+        self.__modelTag:str = model_tag
+        self.__dim:int = embedding_dim
+        self.__capacity:int = max_entries
+        self.__path:Path = Path(root_path, model_tag.replace('/', '_'))
+        self.__lock:threading.Lock = threading.Lock()
+        self.__hits:int = 0
+        self.__misses:int = 0
+
+        # Carga o crea el fichero de la caché.
+        self.__entries:np.memmap = self.__open()
+        self.__slots:Dict[bytes, int] = {self.__entries['key'][slot].tobytes():slot
+                                         for slot in np.flatnonzero(self.__entries['tick'] > 0).tolist()}
+        self.__clock:int = int(self.__entries['tick'].max()) if self.__capacity else 0
+
+    # -- Propiedades -- #
+    @property
+    def Stats(self) -> CacheStatsDTO:
+        """
+        Retorna las estadísticas de la caché.
+
+        Returns:
+            CacheStatsDTO: Estadísticas de la caché.
+        """
+        # Retorna las estadísticas.
+        total:int = self.__hits + self.__misses
+        return CacheStatsDTO(hits=self.__hits, misses=self.__misses, size=len(self.__slots), capacity=self.__capacity,
+                             hitRate=(self.__hits / total) if total else 0.0)
+
+    # -- Métodos privados -- #
+    def __checksum(self, keys:np.ndarray, vectors:np.ndarray) -> np.ndarray:
+        """
+        Calcula la suma de comprobación de varias entradas: XOR de las palabras de 32 bits
+        de la clave y del vector. Detecta las filas escritas a medias.
+
+        Args:
+            keys (np.ndarray): Claves (V16).
+            vectors (np.ndarray): Vectores (float32).
+        Returns:
+            np.ndarray: Suma de comprobación de cada entrada (uint32).
+        """
+        # Retorna el XOR de las palabras de la clave y del vector.
+        words:np.ndarray = np.concatenate([np.ascontiguousarray(keys).view(np.uint32).reshape(len(keys), -1),
+                                           np.ascontiguousarray(vectors).view(np.uint32).reshape(len(vectors), -1)], axis=1)
+        return np.bitwise_xor.reduce(words, axis=1)
+
+    def __open(self) -> np.memmap:
+        """
+        Abre (o crea) el fichero de la caché mapeado en memoria. Las entradas cuya suma de
+        comprobación no coincide se descartan.
+
+        Returns:
+            np.memmap: Entradas de la caché (clave, reloj LRU, suma de comprobación y vector).
+        """
+        # Crea el directorio.
+        os.makedirs(self.__path, exist_ok=True)
+        entries_path:Path = Path(self.__path, 'entries.npy')
+        dtype:np.dtype = np.dtype([('key', f'V{self.__KEY_SIZE}'), ('tick', np.int64), ('check', np.uint32),
+                                   ('vector', np.float32, (self.__dim,))])
+
+        # Try-Except para reutilizar la caché existente.
+        try:
+            # Carga el fichero existente.
+            entries = np.lib.format.open_memmap(entries_path, mode='r+')
+
+            # Comprueba que es compatible.
+            if entries.dtype == dtype and entries.shape == (self.__capacity,):
+                # Descarta las entradas escritas a medias.
+                used:np.ndarray = np.flatnonzero(entries['tick'] > 0)
+                if len(used):
+                    torn:np.ndarray = used[self.__checksum(keys=entries['key'][used], vectors=entries['vector'][used]) != entries['check'][used]]
+                    entries['tick'][torn] = 0
+                return entries
+
+        # Si no existe o no se puede leer, se crea de nuevo.
+        except Exception:
+            pass
+
+        # Crea el fichero vacío.
+        return np.lib.format.open_memmap(entries_path, mode='w+', dtype=dtype, shape=(self.__capacity,))
+
+    def __key(self, text:str) -> bytes:
+        """
+        Genera la clave de un texto.
+
+        Args:
+            text (str): Texto.
+        Returns:
+            bytes: Clave del texto para el modelo actual.
+        """
+        # Retorna el hash del modelo y el texto normalizado.
+        return hashlib.blake2b(f"{self.__modelTag}\0{normalize_text(text)}".encode('utf-8'), digest_size=self.__KEY_SIZE).digest()
+
+    def __allocate(self, count:int) -> List[int]:
+        """
+        Obtiene posiciones libres, expulsando las entradas menos usadas si la caché
+        está llena.
+
+        Args:
+            count (int): Número de posiciones.
+        Returns:
+            List[int]: Posiciones asignadas.
+        """
+        # Obtiene las posiciones libres.
+        free:np.ndarray = np.flatnonzero(self.__entries['tick'] == 0)[:count]
+        slots:List[int] = free.tolist()
+
+        # Si faltan posiciones, expulsa las menos usadas.
+        missing:int = count - len(slots)
+        if missing > 0:
+            # Obtiene las posiciones con el reloj más antiguo (excluyendo las libres ya asignadas).
+            ticks:np.ndarray = np.where(self.__entries['tick'] == 0, np.iinfo(np.int64).max, self.__entries['tick'])
+            victims:np.ndarray = np.argpartition(ticks, missing - 1)[:missing]
+            # Elimina las claves expulsadas (solo si aún apuntan a su posición).
+            for slot in victims.tolist():
+                key:bytes = self.__entries['key'][slot].tobytes()
+                if self.__slots.get(key, None) == slot:
+                    del self.__slots[key]
+            slots.extend(victims.tolist())
+
+        # Retorna las posiciones.
+        return slots
+
+    # -- Métodos públicos -- #
+    def get(self, texts:List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Obtiene los embeddings almacenados de los textos.
+
+        Args:
+            texts (List[str]): Textos a buscar.
+        Returns:
+            List[Optional[np.ndarray]]: Embedding de cada texto o None si no está en caché.
+        """
+        # Variable a retornar.
+        results:List[Optional[np.ndarray]] = []
+
+        # Bloquea la caché.
+        with self.__lock:
+            # Para cada texto.
+            for text in texts:
+                # Obtiene la posición.
+                slot:Optional[int] = self.__slots.get(self.__key(text=text), None)
+
+                # Si no está en caché.
+                if slot is None:
+                    self.__misses += 1
+                    results.append(None)
+                    continue
+
+                # Actualiza el reloj LRU y copia el vector.
+                self.__hits += 1
+                self.__clock += 1
+                self.__entries['tick'][slot] = self.__clock
+                results.append(np.array(self.__entries['vector'][slot]))
+
+        # Retorna los resultados.
+        return results
+
+    def put(self, texts:List[str], embeddings:List[List[float]]) -> None:
+        """
+        Almacena los embeddings de los textos.
+
+        Args:
+            texts (List[str]): Textos.
+            embeddings (List[List[float]]): Embeddings de los textos.
+        """
+        # Bloquea la caché.
+        with self.__lock:
+            # Obtiene las claves nuevas (sin duplicados).
+            pending:Dict[bytes, List[float]] = {}
+            for text, embedding in zip(texts, embeddings):
+                key:bytes = self.__key(text=text)
+                if key not in self.__slots:
+                    pending[key] = embedding
+
+            # Si no hay claves nuevas, finaliza.
+            if not pending:
+                return
+
+            # Obtiene las posiciones (como mucho la capacidad de la caché).
+            items = list(pending.items())[-self.__capacity:]
+            slots:List[int] = self.__allocate(count=len(items))
+
+            # Almacena las entradas (clave, vector y suma de comprobación en la misma fila).
+            for slot, (key, embedding) in zip(slots, items):
+                self.__clock += 1
+                vector:np.ndarray = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+                raw:np.ndarray = np.frombuffer(key, dtype=f'V{self.__KEY_SIZE}')
+                self.__entries[slot] = (raw[0], self.__clock, self.__checksum(keys=raw, vectors=vector)[0], vector[0])
+                self.__slots[key] = slot
+
+    def flush(self) -> None:
+        """
+        Almacena la caché en disco.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Bloquea la caché.
+            with self.__lock:
+                # Almacena las entradas.
+                self.__entries.flush()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"EmbeddingCache.flush() -> [{type(e).__name__}] No se pudo almacenar la caché. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: onnx_backend.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene funciones relacionadas con el backend ONNX Runtime de los
+    modelos de embeddings. El modelo se exporta a ONNX una única vez (opcionalmente
+    cuantizado a int8) y se ejecuta en CPU con un número de hilos ajustado.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+from pathlib import Path
+from contextlib import redirect_stdout, redirect_stderr
+# Librerías externas
+from sentence_transformers import SentenceTransformer
+# Librerías internas
+from config.schema.rag import EmbedderConfig
+
+
+# ---- PARÁMETROS ---- #
+__ONNX_FILE:str = 'onnx/model.onnx'
+
+
+# ---- FUNCIONES ---- #
+def get_onnx_path(model_path:Path, embedder_cfg:EmbedderConfig) -> Path:
+    """
+    Retorna el directorio del modelo exportado a ONNX.
+
+    Args:
+        model_path (Path): Directorio del modelo original.
+        embedder_cfg (EmbedderConfig): Configuración del backend.
+    Returns:
+        Path: Directorio del modelo exportado.
+    """
+    # Retorna el directorio dentro de la caché, con el nombre del modelo.
+    return Path(os.path.join('.server', embedder_cfg.onnxDir, Path(model_path).parent.name, Path(model_path).name))
+
+
+def get_onnx_file(embedder_cfg:EmbedderConfig) -> str:
+    """
+    Retorna el fichero ONNX (relativo al directorio exportado) que se ejecuta.
+
+    Args:
+        embedder_cfg (EmbedderConfig): Configuración del backend.
+    Returns:
+        str: Fichero ONNX.
+    """
+    # Si se cuantiza, el fichero lleva el nombre de la configuración de cuantización.
+    if embedder_cfg.quantize:
+        return f"onnx/model_qint8_{embedder_cfg.quantizationConfig}.onnx"
+    # Retorna el fichero sin cuantizar.
+    return __ONNX_FILE
+
+
+def get_variant_tag(model_tag:str, embedder_cfg:EmbedderConfig) -> str:
+    """
+    Retorna la etiqueta que identifica los embeddings del modelo con el backend dado. Los
+    vectores de PyTorch y de cada fichero ONNX (con o sin cuantizar) no son idénticos,
+    por lo que las cachés deben distinguirlos.
+
+    Args:
+        model_tag (str): Etiqueta del modelo de embeddings.
+        embedder_cfg (EmbedderConfig): Configuración del backend.
+    Returns:
+        str: Etiqueta del modelo, con el fichero ONNX si no se emplea PyTorch.
+    """
+    # Con PyTorch, la etiqueta del modelo.
+    if embedder_cfg.backend == 'TORCH':
+        return model_tag
+    # Retorna la etiqueta con el fichero ONNX.
+    return f"{model_tag}@{embedder_cfg.backend.lower()}-{Path(get_onnx_file(embedder_cfg=embedder_cfg)).stem}"
+
+
+def export_model(model_path:Path, embedder_cfg:EmbedderConfig) -> Path:
+    """
+    Exporta el modelo a ONNX (y lo cuantiza si se indica) si no se había exportado antes.
+
+    Args:
+        model_path (Path): Directorio del modelo original.
+        embedder_cfg (EmbedderConfig): Configuración del backend.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        Path: Directorio del modelo exportado.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Obtiene el directorio del modelo exportado.
+        onnx_path:Path = get_onnx_path(model_path=model_path, embedder_cfg=embedder_cfg)
+
+        # Exporta el modelo si no existe.
+        with open(os.devnull, 'w') as devnull:
+            with redirect_stdout(devnull), redirect_stderr(devnull):
+                if not Path(onnx_path, __ONNX_FILE).exists():
+                    SentenceTransformer(str(model_path), backend='onnx', device='cpu').save_pretrained(str(onnx_path))
+
+                # Cuantiza el modelo si no existe.
+                if embedder_cfg.quantize and not Path(onnx_path, get_onnx_file(embedder_cfg=embedder_cfg)).exists():
+                    from sentence_transformers import export_dynamic_quantized_onnx_model
+                    export_dynamic_quantized_onnx_model(
+                        model=SentenceTransformer(str(onnx_path), backend='onnx', device='cpu'),
+                        quantization_config=embedder_cfg.quantizationConfig,
+                        model_name_or_path=str(onnx_path)
+                    )
+
+        # Retorna el directorio.
+        return onnx_path
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"onnx_backend::export_model() -> [{type(e).__name__}] No se pudo exportar el modelo a ONNX. Trace: {e}")
+
+
+def load_model(model_path:Path, embedder_cfg:EmbedderConfig) -> SentenceTransformer:
+    """
+    Carga el modelo con el backend ONNX Runtime, exportándolo antes si es necesario.
+
+    Args:
+        model_path (Path): Directorio del modelo original.
+        embedder_cfg (EmbedderConfig): Configuración del backend.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        SentenceTransformer: Modelo ejecutado con ONNX Runtime.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Importa ONNX Runtime (dependencia opcional).
+        import onnxruntime as ort
+
+        # Exporta el modelo.
+        onnx_path:Path = export_model(model_path=model_path, embedder_cfg=embedder_cfg)
+
+        # Configura los hilos de la sesión (0 emplea el valor por defecto de ONNX Runtime).
+        options:ort.SessionOptions = ort.SessionOptions()
+        options.intra_op_num_threads = embedder_cfg.intraOpThreads
+        options.inter_op_num_threads = embedder_cfg.interOpThreads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        # Retorna el modelo.
+        with open(os.devnull, 'w') as devnull:
+            with redirect_stdout(devnull), redirect_stderr(devnull):
+                return SentenceTransformer(str(onnx_path), backend='onnx', device='cpu', model_kwargs={
+                    'file_name': get_onnx_file(embedder_cfg=embedder_cfg),
+                    'provider': 'CPUExecutionProvider',
+                    'session_options': options
+                })
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"onnx_backend::load_model() -> [{type(e).__name__}] No se pudo cargar el modelo con ONNX Runtime. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: query_cache.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la caché en memoria de
+    embeddings de consultas.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import re
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+# Librerías externas
+
+# Librerías internas
+from model.measure import CacheStatsDTO
+
+
+# ---- FUNCIONES ---- #
+def normalize_query(query:str) -> str:
+    """
+    Normaliza una consulta: minúsculas, sin acentos y con los espacios colapsados. Dos
+    consultas que solo difieren en esto se consideran la misma.
+
+    Args:
+        query (str): Consulta.
+    Returns:
+        str: Consulta normalizada.
+    """
+    # Elimina los acentos (descompone los caracteres y descarta las marcas).
+    text:str = ''.join(c for c in unicodedata.normalize('NFKD', query.casefold()) if not unicodedata.combining(c))
+    # Retorna la consulta con los espacios colapsados.
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+# ---- CLASES ---- #
+class QueryEmbeddingCache:
+    """
+    Caché LRU en memoria de embeddings de consultas, indexada por (etiqueta del modelo,
+    consulta normalizada). Las entradas caducan pasado un tiempo máximo.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, model_tag:str, max_entries:int, ttl:int):
+        """
+        Inicializa la instancia.
+
+        Args:
+            model_tag (str): Etiqueta del modelo de embeddings.
+            max_entries (int): Número máximo de entradas.
+            ttl (int): Tiempo (s) de vida de cada entrada.
+        """
+        # Inicializa las propiedades.
+        self.__modelTag:str = model_tag
+        self.__maxEntries:int = max_entries
+        self.__ttl:int = ttl
+        self.__entries:OrderedDict[Tuple[str, str], Tuple[float, List[float]]] = OrderedDict()
+        self.__lock:threading.Lock = threading.Lock()
+        self.__hits:int = 0
+        self.__misses:int = 0
+
+    # -- Propiedades -- #
+    @property
+    def Stats(self) -> CacheStatsDTO:
+        """
+        Retorna las estadísticas de la caché.
+
+        Returns:
+            CacheStatsDTO: Estadísticas de la caché.
+        """
+        # Retorna las estadísticas.
+        total:int = self.__hits + self.__misses
+        return CacheStatsDTO(hits=self.__hits, misses=self.__misses, size=len(self.__entries), capacity=self.__maxEntries,
+                             hitRate=(self.__hits / total) if total else 0.0)
+
+    # -- Métodos públicos -- #
+    def get(self, query:str) -> Optional[List[float]]:
+        """
+        Obtiene el embedding de una consulta.
+
+        Args:
+            query (str): Consulta.
+        Returns:
+            Optional[List[float]]: Embedding de la consulta o None si no está en caché
+                o ha caducado.
+        """
+        # Obtiene la clave.
+        key:Tuple[str, str] = (self.__modelTag, normalize_query(query=query))
+
+        # Bloquea la caché.
+        with self.__lock:
+            # Obtiene la entrada.
+            entry:Optional[Tuple[float, List[float]]] = self.__entries.get(key, None)
+
+            # Si no existe o ha caducado.
+            if entry is None or time.monotonic() - entry[0] > self.__ttl:
+                self.__entries.pop(key, None)
+                self.__misses += 1
+                return None
+
+            # Marca la entrada como la más reciente.
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            # Retorna el embedding.
+            return entry[1]
+
+    def put(self, query:str, embedding:List[float]) -> None:
+        """
+        Almacena el embedding de una consulta, expulsando la entrada menos usada si la
+        caché está llena.
+
+        Args:
+            query (str): Consulta.
+            embedding (List[float]): Embedding de la consulta.
+        """
+        # Obtiene la clave.
+        key:Tuple[str, str] = (self.__modelTag, normalize_query(query=query))
+
+        # Bloquea la caché.
+        with self.__lock:
+            # Almacena la entrada como la más reciente.
+            self.__entries[key] = (time.monotonic(), embedding)
+            self.__entries.move_to_end(key)
+            # Expulsa las entradas menos usadas.
+            while len(self.__entries) > self.__maxEntries:
+                self.__entries.popitem(last=False)
\ No newline at end of file
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: registry.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene funciones relacionadas con el registro de modelos de embeddings.
+    Cada modelo se carga una única vez por proceso (y backend) y se comparte entre la
+    ingesta y la recuperación.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from contextlib import redirect_stdout, redirect_stderr
+# Librerías externas
+from sentence_transformers import SentenceTransformer
+# Librerías internas
+from core.rag.embedding import onnx_backend
+from config.schema.rag import EmbedderConfig
+
+
+# ---- PARÁMETROS ---- #
+__MODELS:Dict[str, SentenceTransformer] = {}
+__LOCK:threading.Lock = threading.Lock()
+__WARM_UP_TEXT:str = 'Texto de calentamiento del modelo de embeddings.'
+
+
+# ---- FUNCIONES ---- #
+def get_model(model_path:Path, embedder_cfg:Optional[EmbedderConfig]=None) -> SentenceTransformer:
+    """
+    Retorna el modelo de embeddings de la ruta dada. Se carga la primera vez que se
+    solicita y las siguientes se retorna la misma instancia.
+
+    Args:
+        model_path (Path): Directorio del modelo.
+        embedder_cfg (Optional[EmbedderConfig]): Configuración del backend. Si es None,
+            se emplea PyTorch.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        SentenceTransformer: Modelo de embeddings compartido.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Identifica el modelo por su ruta absoluta y su backend.
+        embedder_cfg = embedder_cfg or EmbedderConfig()
+        path:str = str(Path(model_path).resolve())
+        key:str = path if embedder_cfg.backend == 'TORCH' else f"{path} [{onnx_backend.get_onnx_file(embedder_cfg=embedder_cfg)}]"
+
+        # Carga el modelo una única vez.
+        with __LOCK:
+            if key not in __MODELS:
+                # Si es ONNX, lo exporta (una única vez) y lo carga con ONNX Runtime.
+                if embedder_cfg.backend == 'ONNX':
+                    __MODELS[key] = onnx_backend.load_model(model_path=model_path, embedder_cfg=embedder_cfg)
+                # Si es PyTorch.
+                elif embedder_cfg.backend == 'TORCH':
+                    with open(os.devnull, 'w') as devnull:
+                        with redirect_stdout(devnull), redirect_stderr(devnull):
+                            __MODELS[key] = SentenceTransformer(path)
+                # Si es un backend desconocido, lanza una excepción.
+                else:
+                    raise ValueError(f"El backend <{embedder_cfg.backend}> no se reconoce.")
+            # Retorna el modelo.
+            return __MODELS[key]
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"registry::get_model() -> [{type(e).__name__}] No se pudo cargar el modelo de embeddings <{model_path}>. Trace: {e}")
+
+
+def loaded_models() -> List[str]:
+    """
+    Retorna las rutas de los modelos cargados.
+
+    Returns:
+        List[str]: Rutas de los modelos cargados.
+    """
+    # Retorna las rutas.
+    with __LOCK:
+        return list(__MODELS)
+
+
+def warm_up(batch_size:int) -> None:
+    """
+    Precalienta los modelos cargados con un lote de prueba y una consulta, de modo que
+    la primera petición no pague la inicialización de los núcleos de cálculo.
+
+    Args:
+        batch_size (int): Tamaño del lote de prueba.
+    Raises:
+        OSError: En caso de que haya algún error.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Obtiene los modelos cargados.
+        with __LOCK:
+            models:List[SentenceTransformer] = list(__MODELS.values())
+
+        # Para cada modelo.
+        for model in models:
+            # Calcula un lote y una consulta de prueba.
+            model.encode([__WARM_UP_TEXT] * batch_size, batch_size=batch_size, show_progress_bar=False)
+            model.encode(__WARM_UP_TEXT, show_progress_bar=False)
+
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"registry::warm_up() -> [{type(e).__name__}] No se pudo precalentar los modelos de embeddings. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: scheduler.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la planificación de los
+    embeddings de consultas concurrentes. Las consultas que llegan a la vez se agrupan
+    y se embeben en un único lote.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+# Librerías externas
+
+# Librerías internas
+from config.schema.rag import QuerySchedulerConfig
+
+
+# ---- CLASES ---- #
+class QueryBatchScheduler:
+    """
+    Agrupa los embeddings de consultas concurrentes. Cada consulta se encola junto a un
+    futuro; un hilo recoge las consultas pendientes durante como mucho `maxWait` ms o
+    hasta reunir `maxBatch`, las embebe en una única pasada y resuelve el futuro de cada
+    llamante. La espera termina antes si ya se han recogido todas las consultas en curso,
+    por lo que una consulta sin concurrencia no espera. Las consultas repetidas dentro de
+    un lote se embeben una sola vez.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, embed_fn:Callable[[List[str]], List[List[float]]], scheduler_cfg:QuerySchedulerConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            embed_fn (Callable[[List[str]], List[List[float]]]): Función que calcula los
+                embeddings de un lote.
+            scheduler_cfg (QuerySchedulerConfig): Configuración de la planificación.
+        """
+        # Inicializa las propiedades.
+        self.__embedFn:Callable[[List[str]], List[List[float]]] = embed_fn
+        self.__maxBatch:int = scheduler_cfg.maxBatch
+        self.__maxWait:float = scheduler_cfg.maxWait / 1000
+        self.__queue:queue.Queue[Tuple[str, Future]] = queue.Queue()
+        self.__lock:threading.Lock = threading.Lock()
+        self.__worker:Optional[threading.Thread] = None
+        self.__pending:int = 0
+        self.__batches:int = 0
+        self.__queries:int = 0
+
+    # -- Propiedades -- #
+    @property
+    def MeanBatchSize(self) -> float:
+        """
+        Retorna el tamaño medio de los lotes embebidos.
+
+        Returns:
+            float: Tamaño medio de lote.
+        """
+        # Retorna el tamaño medio.
+        return self.__queries / self.__batches if self.__batches else 0.0
+
+    # -- Métodos privados -- #
+    def __collect(self) -> List[Tuple[str, Future]]:
+        """
+        Espera la primera consulta y recoge las que lleguen hasta completar el lote o
+        agotar el tiempo de espera.
+
+        Returns:
+            List[Tuple[str, Future]]: Consultas del lote y sus futuros.
+        """
+        # Espera la primera consulta.
+        batch:List[Tuple[str, Future]] = [self.__queue.get()]
+        deadline:float = time.perf_counter() + self.__maxWait
+
+        # Mientras no se complete el lote ni se hayan recogido todas las consultas en curso.
+        while len(batch) < min(self.__maxBatch, self.__pending):
+            # Si se ha agotado el tiempo, termina.
+            remaining:float = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            # Obtiene la siguiente consulta.
+            try:
+                batch.append(self.__queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Retorna el lote.
+        return batch
+
+    def __run(self) -> None:
+        """
+        Bucle del hilo: recoge lotes de consultas, los embebe y resuelve los futuros.
+        """
+        # Bucle infinito.
+        while True:
+            # Recoge el lote.
+            batch:List[Tuple[str, Future]] = self.__collect()
+
+            # Agrupa las consultas repetidas.
+            positions:Dict[str, int] = {}
+            for query, __ in batch:
+                positions.setdefault(query, len(positions))
+
+            # Try-Except para manejo de errores.
+            try:
+                # Embebe las consultas distintas en una única pasada.
+                embeddings:List[List[float]] = self.__embedFn(list(positions))
+                self.__batches += 1
+                self.__queries += len(batch)
+                # Resuelve el futuro de cada llamante.
+                for query, future in batch:
+                    future.set_result(embeddings[positions[query]])
+
+            # Si ocurre algún error, lo propaga a todos los llamantes del lote.
+            except Exception as e:
+                for __, future in batch:
+                    future.set_exception(e)
+
+    def __start(self) -> None:
+        """
+        Inicia el hilo si no se ha iniciado.
+        """
+        # Inicia el hilo una única vez.
+        with self.__lock:
+            if self.__worker is None:
+                self.__worker = threading.Thread(target=self.__run, name='QueryBatchScheduler', daemon=True)
+                self.__worker.start()
+
+    # -- Métodos públicos -- #
+    def embed(self, query:str) -> List[float]:
+        """
+        Calcula el embedding de una consulta, agrupado con las consultas concurrentes.
+
+        Args:
+            query (str): Consulta.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[float]: Embedding de la consulta.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Registra la consulta en curso.
+            self.__start()
+            with self.__lock:
+                self.__pending += 1
+
+            # Encola la consulta y espera su embedding.
+            try:
+                future:Future = Future()
+                self.__queue.put((query, future))
+                return future.result()
+            # Al terminar, deja de estar en curso.
+            finally:
+                with self.__lock:
+                    self.__pending -= 1
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"QueryBatchScheduler.embed() -> [{type(e).__name__}] No se pudo calcular el embedding de la consulta. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: fusion.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene funciones relacionadas con la fusión de resultados de varios
+    recuperadores.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+from typing import Dict, List, Tuple
+# Librerías externas
+
+# Librerías internas
+from model.context import ContextDTO
+
+
+# ---- FUNCIONES ---- #
+def with_dense_score(context:List[ContextDTO]) -> List[ContextDTO]:
+    """
+    Copia la puntuación de la búsqueda densa (similitud coseno) en `denseScore`, de modo
+    que se conserve tras la fusión o la reordenación.
+
+    Args:
+        context (List[ContextDTO]): Contexto obtenido del almacén vectorial.
+    Returns:
+        List[ContextDTO]: Contexto con la similitud densa.
+    """
+    # Retorna el contexto con la similitud densa.
+    return [c.model_copy(update={'denseScore': c.score}) for c in context]
+
+
+def reciprocal_rank_fusion(rankings:List[List[ContextDTO]], k:int, top_k:int) -> List[ContextDTO]:
+    """
+    Fusiona varias listas ordenadas de contexto mediante Reciprocal Rank Fusion: cada
+    fragmento suma 1 / (k + posición) por cada lista en la que aparece. Los fragmentos se
+    identifican por su fichero y contenido, y la puntuación final es la de la fusión. La
+    similitud densa (`denseScore`) de cada fragmento se conserva.
+
+    Args:
+        rankings (List[List[ContextDTO]]): Listas de contexto, de mayor a menor relevancia.
+        k (int): Constante de suavizado de la fusión.
+        top_k (int): Número de fragmentos a retornar.
+    Returns:
+        List[ContextDTO]: Contexto fusionado, de mayor a menor puntuación.
+    """
+    # Puntuación y primera aparición de cada fragmento.
+    scores:Dict[Tuple[str, str], float] = {}
+    contexts:Dict[Tuple[str, str], ContextDTO] = {}
+
+    # Para cada lista y posición.
+    for ranking in rankings:
+        for rank, context in enumerate(ranking, start=1):
+            # Acumula la puntuación del fragmento.
+            key:Tuple[str, str] = (context.sourceDir, context.content)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            # Conserva la primera aparición, salvo que otra lista aporte la similitud densa.
+            if key not in contexts or (contexts[key].denseScore is None and context.denseScore is not None):
+                contexts[key] = context
+
+    # Ordena los fragmentos por la puntuación fusionada.
+    best:List[Tuple[str, str]] = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    # Retorna el contexto con la puntuación fusionada.
+    return [contexts[key].model_copy(update={'score': scores[key]}) for key in best]
\ No newline at end of file
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: chunk_store.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el almacén de contenido de
+    los fragmentos del índice nativo. El contenido se guarda en un fichero de solo
+    adición y se lee bajo demanda a partir de la posición de cada fragmento.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import json
+from pathlib import Path
+from typing import List, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+from model.chunk import ChunkDTO
+
+
+# ---- CLASES ---- #
+class ChunkStore:
+    """
+    Almacén del contenido y el origen de los fragmentos, indexado por la posición del
+    fragmento en el índice vectorial. Solo se leen los fragmentos devueltos por una
+    búsqueda, por lo que abrir el almacén no requiere cargar el corpus.
+    """
+    # -- Atributos -- #
+    __COMPACT_RATIO:float = 0.5
+
+    # -- Métodos por defecto -- #
+    def __init__(self, root_path:Path):
+        """
+        Inicializa la instancia.
+
+        Args:
+            root_path (Path): Directorio del almacén.
+        """
+        # Inicializa las propiedades.
+        self.__path:Path = Path(root_path)
+        os.makedirs(self.__path, exist_ok=True)
+        self.__dataPath:Path = Path(self.__path, 'chunks.bin')
+        self.__offsetsPath:Path = Path(self.__path, 'offsets.npy')
+
+        # Carga las posiciones (desplazamiento y longitud de cada fragmento).
+        self.__offsets:np.ndarray = self.__load_offsets()
+        self.__file = open(self.__dataPath, 'a+b')
+
+    # -- Métodos privados -- #
+    def __load_offsets(self) -> np.ndarray:
+        """
+        Carga las posiciones de los fragmentos.
+
+        Returns:
+            np.ndarray: Desplazamiento y longitud de cada fragmento.
+        """
+        # Try-Except para reutilizar el almacén existente.
+        try:
+            # Retorna las posiciones almacenadas.
+            return np.load(self.__offsetsPath)
+        # Si no existen, se crea vacío.
+        except Exception:
+            return np.zeros((0, 2), dtype=np.int64)
+
+    def __ensure(self, capacity:int) -> None:
+        """
+        Amplía las posiciones hasta la capacidad dada.
+
+        Args:
+            capacity (int): Capacidad necesaria.
+        """
+        # Amplía las posiciones.
+        if capacity > len(self.__offsets):
+            self.__offsets = np.concatenate([self.__offsets, np.zeros((capacity - len(self.__offsets), 2), dtype=np.int64)])
+
+    def __compact(self) -> None:
+        """
+        Reescribe el fichero de contenido únicamente con los fragmentos vigentes.
+        """
+        # Crea el nuevo fichero.
+        tmp_path:Path = Path(self.__path, 'chunks.tmp.bin')
+        with open(tmp_path, 'wb') as fp:
+            # Para cada fragmento vigente.
+            for slot in np.flatnonzero(self.__offsets[:, 1] > 0).tolist():
+                # Copia el contenido y actualiza su desplazamiento.
+                offset, length = self.__offsets[slot].tolist()
+                data:bytes = os.pread(self.__file.fileno(), length, offset)
+                self.__offsets[slot, 0] = fp.tell()
+                fp.write(data)
+
+        # Reemplaza el fichero.
+        self.__file.close()
+        os.replace(tmp_path, self.__dataPath)
+        self.__file = open(self.__dataPath, 'a+b')
+
+    # -- Métodos públicos -- #
+    def put(self, slots:List[int], chunks:List[ChunkDTO]) -> None:
+        """
+        Almacena el contenido de los fragmentos en sus posiciones.
+
+        Args:
+            slots (List[int]): Posiciones de los fragmentos.
+            chunks (List[ChunkDTO]): Fragmentos.
+        """
+        # Amplía las posiciones si es necesario.
+        self.__ensure(capacity=max(slots) + 1 if slots else 0)
+
+        # Añade el contenido al final del fichero.
+        self.__file.seek(0, os.SEEK_END)
+        for slot, chunk in zip(slots, chunks):
+            data:bytes = json.dumps({'content': chunk.content, 'source': chunk.sourceDir}, ensure_ascii=False).encode('utf-8')
+            self.__offsets[slot] = (self.__file.tell(), len(data))
+            self.__file.write(data)
+        self.__file.flush()
+
+    def remove(self, slots:List[int]) -> None:
+        """
+        Marca las posiciones como libres.
+
+        Args:
+            slots (List[int]): Posiciones de los fragmentos.
+        """
+        # Libera las posiciones.
+        slots = [slot for slot in slots if slot < len(self.__offsets)]
+        self.__offsets[slots] = 0
+
+    def get(self, slot:int) -> Tuple[str, str]:
+        """
+        Lee el contenido de un fragmento.
+
+        Args:
+            slot (int): Posición del fragmento.
+        Returns:
+            Tuple[str, str]: Contenido y ruta del fichero de origen.
+        """
+        # Lee el fragmento.
+        offset, length = self.__offsets[slot].tolist()
+        data:dict = json.loads(os.pread(self.__file.fileno(), length, offset).decode('utf-8'))
+        # Retorna el contenido y el origen.
+        return data['content'], data['source']
+
+    def reset(self) -> None:
+        """
+        Vacía el almacén.
+        """
+        # Vacía el fichero y las posiciones.
+        self.__file.close()
+        self.__file = open(self.__dataPath, 'w+b')
+        self.__offsets = np.zeros((0, 2), dtype=np.int64)
+
+    def save(self) -> None:
+        """
+        Almacena las posiciones en disco, compactando antes el fichero de contenido si la
+        mayoría de su contenido corresponde a fragmentos eliminados.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Compacta el fichero si es necesario.
+            live:int = int(self.__offsets[:, 1].sum())
+            size:int = os.fstat(self.__file.fileno()).st_size
+            if size > 0 and live < size * self.__COMPACT_RATIO:
+                self.__compact()
+
+            # Almacena las posiciones.
+            self.__file.flush()
+            np.save(Path(self.__path, 'offsets.tmp.npy'), self.__offsets)
+            os.replace(Path(self.__path, 'offsets.tmp.npy'), self.__offsetsPath)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"ChunkStore.save() -> [{type(e).__name__}] No se pudo almacenar el contenido. Trace: {e}")
\ No newline at end of file
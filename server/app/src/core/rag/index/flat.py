@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: flat.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el índice vectorial exacto.
+    Los embeddings normalizados se almacenan en una matriz mapeada en memoria y la
+    búsqueda es un producto matricial seguido de `argpartition`.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+from core.rag.index.quantization import QuantizedCodes
+
+
+# ---- FUNCIONES ---- #
+def normalize_rows(vectors:np.ndarray) -> np.ndarray:
+    """
+    Normaliza (L2) las filas de una matriz, de modo que el producto escalar equivale a
+    la similitud coseno.
+
+    Args:
+        vectors (np.ndarray): Matriz de vectores.
+    Returns:
+        np.ndarray: Matriz de vectores normalizados (float32).
+    """
+    # Retorna los vectores normalizados.
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms:np.ndarray = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def select_top(scores:np.ndarray, k:int) -> np.ndarray:
+    """
+    Obtiene los índices de las k puntuaciones más altas sin ordenar todo el vector.
+
+    Args:
+        scores (np.ndarray): Puntuaciones.
+        k (int): Número de índices a obtener.
+    Returns:
+        np.ndarray: Índices de mayor a menor puntuación.
+    """
+    # Si no hay puntuaciones, no hay resultados.
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Obtiene las k mejores y las ordena.
+    best:np.ndarray = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+# ---- CLASES ---- #
+class FlatIndex:
+    """
+    Índice vectorial exacto. Cada fragmento ocupa una posición de la matriz de vectores;
+    las posiciones de los fragmentos eliminados se reutilizan. La matriz se mapea en
+    memoria, por lo que abrir el índice no requiere cargarlo. Si se cuantiza, solo los
+    códigos se recorren en cada búsqueda y los vectores originales se leen del disco
+    únicamente para puntuar los candidatos.
+    """
+    # -- Atributos -- #
+    __ID_SIZE:int = 36
+    __MIN_CAPACITY:int = 1024
+    __QUERY_BLOCK:int = 64
+
+    # -- Métodos por defecto -- #
+    def __init__(self, root_path:Path, embedding_dim:int, quantization:str='NONE', rescore_factor:int=4):
+        """
+        Inicializa la instancia. Si existe un índice previo con las mismas dimensiones
+        se reutiliza.
+
+        Args:
+            root_path (Path): Directorio del índice.
+            embedding_dim (int): Tamaño de los embeddings.
+            quantization (str): Cuantización de los vectores (NONE, INT8 o BINARY).
+            rescore_factor (int): Candidatos por resultado que se puntúan con los vectores
+                originales si se cuantiza.
+        """
+        # Inicializa las propiedades.
+        self.__path:Path = Path(root_path)
+        self.__dim:int = embedding_dim
+        os.makedirs(self.__path, exist_ok=True)
+
+        # Carga o crea el índice.
+        self.__vectors, self.__ids = self.__open()
+        self.__valid:np.ndarray = self.__ids != b''
+        self.__slots:Dict[str, int] = {key.decode('ascii'):slot for slot, key in enumerate(self.__ids.tolist()) if key}
+        self.__free:List[int] = np.flatnonzero(~self.__valid).tolist()[::-1]
+        self.__top:int = int(np.flatnonzero(self.__valid)[-1]) + 1 if self.__slots else 0
+
+        # Carga o calcula los códigos cuantizados.
+        self.__rescoreFactor:int = rescore_factor
+        self.__codes:Optional[QuantizedCodes] = None
+        if quantization != 'NONE':
+            self.__codes = QuantizedCodes(mode=quantization, embedding_dim=embedding_dim, capacity=len(self.__ids))
+            if not self.__codes.load(path=Path(self.__path, 'codes.npz'), capacity=len(self.__ids)):
+                self.__encode_all()
+
+    # -- Propiedades -- #
+    @property
+    def Count(self) -> int:
+        """
+        Retorna el número de vectores del índice.
+
+        Returns:
+            int: Número de vectores.
+        """
+        # Retorna el número de vectores.
+        return len(self.__slots)
+
+    @property
+    def Capacity(self) -> int:
+        """
+        Retorna el número de posiciones de la matriz de vectores.
+
+        Returns:
+            int: Número de posiciones.
+        """
+        # Retorna la capacidad.
+        return len(self.__ids)
+
+    @property
+    def CodeBytes(self) -> int:
+        """
+        Retorna la memoria ocupada por los códigos cuantizados.
+
+        Returns:
+            int: Número de bytes (0 si no se cuantiza).
+        """
+        # Retorna el tamaño de los códigos.
+        return self.__codes.Bytes if self.__codes is not None else 0
+
+    # -- Métodos privados -- #
+    def __open(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Abre (o crea) la matriz de vectores y los identificadores.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Vectores mapeados en memoria e identificadores.
+        """
+        # Try-Except para reutilizar el índice existente.
+        try:
+            # Carga los ficheros existentes.
+            vectors = np.lib.format.open_memmap(Path(self.__path, 'vectors.npy'), mode='r+')
+            ids:np.ndarray = np.load(Path(self.__path, 'ids.npy'))
+
+            # Comprueba que son compatibles.
+            if vectors.shape[1] == self.__dim and vectors.shape[0] == len(ids):
+                return vectors, ids
+
+        # Si no existen o no se pueden leer, se crean de nuevo.
+        except Exception:
+            pass
+
+        # Crea el índice vacío.
+        return self.__allocate(capacity=self.__MIN_CAPACITY)
+
+    def __allocate(self, capacity:int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Crea una matriz de vectores vacía.
+
+        Args:
+            capacity (int): Número de posiciones.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Vectores mapeados en memoria e identificadores.
+        """
+        # Crea los ficheros vacíos.
+        vectors = np.lib.format.open_memmap(Path(self.__path, 'vectors.npy'), mode='w+', dtype=np.float32, shape=(capacity, self.__dim))
+        ids:np.ndarray = np.zeros(capacity, dtype=f'S{self.__ID_SIZE}')
+        # Retorna los ficheros.
+        return vectors, ids
+
+    def __grow(self, needed:int) -> None:
+        """
+        Amplía la matriz de vectores (al menos al doble) para disponer de posiciones libres.
+
+        Args:
+            needed (int): Número de posiciones libres necesarias.
+        """
+        # Obtiene la nueva capacidad.
+        old:int = len(self.__ids)
+        capacity:int = max(old * 2, old + needed)
+
+        # Copia los vectores en una matriz mayor.
+        tmp_path:Path = Path(self.__path, 'vectors.tmp.npy')
+        vectors = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(capacity, self.__dim))
+        vectors[:old] = self.__vectors
+        vectors.flush()
+        del vectors
+        # Reemplaza el fichero y lo vuelve a mapear.
+        del self.__vectors
+        os.replace(tmp_path, Path(self.__path, 'vectors.npy'))
+        self.__vectors = np.lib.format.open_memmap(Path(self.__path, 'vectors.npy'), mode='r+')
+
+        # Amplía los identificadores y las posiciones libres.
+        self.__ids = np.concatenate([self.__ids, np.zeros(capacity - old, dtype=self.__ids.dtype)])
+        self.__valid = np.concatenate([self.__valid, np.zeros(capacity - old, dtype=bool)])
+        self.__free = list(range(capacity - 1, old - 1, -1)) + self.__free
+        if self.__codes is not None:
+            self.__codes.grow(capacity=capacity)
+
+    def __encode_all(self, batch:int=65536) -> None:
+        """
+        Calcula los códigos cuantizados de todas las posiciones ocupadas, por bloques.
+
+        Args:
+            batch (int): Número de vectores por bloque.
+        """
+        # Codifica las posiciones ocupadas por bloques.
+        slots:np.ndarray = np.flatnonzero(self.__valid)
+        for start in range(0, len(slots), batch):
+            block:np.ndarray = slots[start:start + batch]
+            self.__codes.encode(slots=block, vectors=self.__vectors[block])
+
+    def __rescore(self, slots:np.ndarray, query:np.ndarray, top_k:int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Puntúa los candidatos con los vectores originales, leyendo del disco solo sus filas.
+
+        Args:
+            slots (np.ndarray): Posiciones candidatas.
+            query (np.ndarray): Vector normalizado de la consulta.
+            top_k (int): Número de vectores a obtener.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Posiciones y puntuaciones, de mayor a menor.
+        """
+        # Ordena las posiciones para leer el fichero secuencialmente.
+        slots = np.sort(slots)
+        scores:np.ndarray = self.__vectors[slots] @ query
+        # Obtiene las k mejores.
+        best:np.ndarray = select_top(scores=scores, k=top_k)
+        # Retorna las posiciones y puntuaciones.
+        return slots[best], scores[best]
+
+    # -- Métodos públicos -- #
+    def add(self, ids:List[str], vectors:np.ndarray) -> List[int]:
+        """
+        Inserta (o reemplaza) vectores.
+
+        Args:
+            ids (List[str]): Identificadores de los vectores.
+            vectors (np.ndarray): Vectores (se normalizan al insertarlos).
+        Returns:
+            List[int]: Posiciones asignadas a cada vector.
+        """
+        # Normaliza los vectores.
+        vectors = normalize_rows(vectors=vectors)
+        # Amplía la matriz si no hay posiciones suficientes.
+        new:int = sum(1 for key in ids if key not in self.__slots)
+        if new > len(self.__free):
+            self.__grow(needed=new - len(self.__free))
+
+        # Obtiene las posiciones (se reutiliza la posición si el identificador ya existe).
+        slots:List[int] = []
+        for key in ids:
+            slot:int = self.__slots[key] if key in self.__slots else self.__free.pop()
+            self.__slots[key] = slot
+            slots.append(slot)
+
+        # Almacena los vectores y los identificadores.
+        self.__vectors[slots] = vectors
+        if self.__codes is not None:
+            self.__codes.encode(slots=np.asarray(slots, dtype=np.int64), vectors=vectors)
+        self.__ids[slots] = [key.encode('ascii') for key in ids]
+        self.__valid[slots] = True
+        self.__top = max([self.__top] + [slot + 1 for slot in slots])
+        # Retorna las posiciones.
+        return slots
+
+    def remove(self, ids:List[str]) -> List[int]:
+        """
+        Elimina vectores. Las posiciones quedan libres para futuras inserciones.
+
+        Args:
+            ids (List[str]): Identificadores de los vectores.
+        Returns:
+            List[int]: Posiciones liberadas.
+        """
+        # Obtiene las posiciones de los identificadores existentes.
+        slots:List[int] = [self.__slots.pop(key) for key in ids if key in self.__slots]
+
+        # Libera las posiciones.
+        self.__ids[slots] = b''
+        self.__valid[slots] = False
+        self.__free.extend(slots)
+        # Retorna las posiciones liberadas.
+        return slots
+
+    def vector(self, slot:int) -> np.ndarray:
+        """
+        Retorna el vector de una posición.
+
+        Args:
+            slot (int): Posición.
+        Returns:
+            np.ndarray: Vector normalizado.
+        """
+        # Retorna una copia del vector.
+        return np.array(self.__vectors[slot])
+
+    def vectors(self) -> np.ndarray:
+        """
+        Retorna la matriz de vectores mapeada en memoria (incluidas las posiciones libres).
+
+        Returns:
+            np.ndarray: Matriz de vectores.
+        """
+        # Retorna la matriz.
+        return self.__vectors
+
+    def valid(self) -> np.ndarray:
+        """
+        Retorna la máscara de posiciones ocupadas.
+
+        Returns:
+            np.ndarray: Máscara de posiciones ocupadas.
+        """
+        # Retorna la máscara.
+        return self.__valid
+
+    def search(self, query:np.ndarray, top_k:int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene los vectores más similares (coseno) a la consulta.
+
+        Args:
+            query (np.ndarray): Vector de la consulta.
+            top_k (int): Número de vectores a obtener.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Posiciones y puntuaciones, de mayor a menor.
+        """
+        # Si el índice está vacío, no hay resultados.
+        if not self.__slots:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = normalize_rows(vectors=query)
+
+        # Si se cuantiza, preselecciona los candidatos con los códigos y los puntúa.
+        if self.__codes is not None:
+            approx:np.ndarray = self.__codes.scores(query=query, limit=self.__top)
+            approx[~self.__valid[:self.__top]] = -np.inf
+            candidates:np.ndarray = select_top(scores=approx, k=min(top_k * self.__rescoreFactor, len(self.__slots)))
+            return self.__rescore(slots=candidates, query=query, top_k=top_k)
+
+        # Calcula la similitud con todos los vectores hasta la última posición ocupada
+        # (las posiciones libres se descartan).
+        scores:np.ndarray = self.__vectors[:self.__top] @ query
+        scores[~self.__valid[:self.__top]] = -np.inf
+
+        # Obtiene las k mejores posiciones sin ordenar todo el índice.
+        slots:np.ndarray = select_top(scores=scores, k=min(top_k, len(self.__slots)))
+        # Retorna las posiciones y puntuaciones.
+        return slots, scores[slots]
+
+    def search_batch(self, queries:np.ndarray, top_k:int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Obtiene los vectores más similares (coseno) a cada consulta. La búsqueda exacta
+        recorre los vectores una vez por bloque de consultas en lugar de una vez por
+        consulta.
+
+        Args:
+            queries (np.ndarray): Matriz de vectores de las consultas.
+            top_k (int): Número de vectores a obtener por consulta.
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: Posiciones y puntuaciones de cada consulta,
+                de mayor a menor.
+        """
+        # Si el índice está vacío o se cuantiza, busca cada consulta por separado.
+        if not self.__slots or self.__codes is not None:
+            return [self.search(query=query, top_k=top_k) for query in queries]
+        queries = normalize_rows(vectors=queries)
+
+        # Variable a retornar.
+        results:List[Tuple[np.ndarray, np.ndarray]] = []
+        k:int = min(top_k, len(self.__slots))
+
+        # Para cada bloque de consultas (limita la memoria de la matriz de puntuaciones).
+        for start in range(0, len(queries), self.__QUERY_BLOCK):
+            # Calcula la similitud del bloque con todos los vectores.
+            scores:np.ndarray = queries[start:start + self.__QUERY_BLOCK] @ self.__vectors[:self.__top].T
+            scores[:, ~self.__valid[:self.__top]] = -np.inf
+            # Obtiene las k mejores posiciones de cada consulta.
+            for row in scores:
+                slots:np.ndarray = select_top(scores=row, k=k)
+                results.append((slots, row[slots]))
+
+        # Retorna los resultados.
+        return results
+
+    def rank(self, slots:np.ndarray, query:np.ndarray, top_k:int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene los vectores más similares a la consulta entre las posiciones dadas (que
+        deben estar ocupadas).
+
+        Args:
+            slots (np.ndarray): Posiciones candidatas.
+            query (np.ndarray): Vector normalizado de la consulta.
+            top_k (int): Número de vectores a obtener.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Posiciones y puntuaciones, de mayor a menor.
+        """
+        # Si se cuantiza, reduce los candidatos con los códigos.
+        if self.__codes is not None and len(slots) > top_k * self.__rescoreFactor:
+            approx:np.ndarray = self.__codes.scores(query=query, slots=slots)
+            slots = slots[select_top(scores=approx, k=top_k * self.__rescoreFactor)]
+
+        # Puntúa los candidatos con los vectores originales.
+        return self.__rescore(slots=slots, query=query, top_k=top_k)
+
+    def reset(self) -> None:
+        """
+        Vacía el índice.
+        """
+        # Crea el índice vacío.
+        del self.__vectors
+        self.__vectors, self.__ids = self.__allocate(capacity=self.__MIN_CAPACITY)
+        self.__valid = np.zeros(len(self.__ids), dtype=bool)
+        self.__slots = {}
+        self.__top = 0
+        self.__free = list(range(len(self.__ids) - 1, -1, -1))
+        if self.__codes is not None:
+            self.__codes.reset(capacity=len(self.__ids))
+
+    def save(self) -> None:
+        """
+        Almacena el índice en disco.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Almacena los vectores y los identificadores.
+            self.__vectors.flush()
+            np.save(Path(self.__path, 'ids.tmp.npy'), self.__ids)
+            os.replace(Path(self.__path, 'ids.tmp.npy'), Path(self.__path, 'ids.npy'))
+            # Almacena los códigos cuantizados.
+            if self.__codes is not None:
+                self.__codes.save(path=Path(self.__path, 'codes.npz'))
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"FlatIndex.save() -> [{type(e).__name__}] No se pudo almacenar el índice. Trace: {e}")
\ No newline at end of file
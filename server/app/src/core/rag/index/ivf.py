@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: ivf.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el índice vectorial
+    aproximado (IVF). Los vectores se agrupan en listas por su centroide más cercano y
+    la búsqueda solo recorre las listas de los centroides más próximos a la consulta.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import math
+from pathlib import Path
+from typing import List, Optional, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+from core.rag.index.flat import FlatIndex, normalize_rows
+
+
+# ---- FUNCIONES ---- #
+def train_centroids(vectors:np.ndarray, nlist:int, iterations:int=10, seed:int=0) -> np.ndarray:
+    """
+    Entrena los centroides mediante k-means esférico (similitud coseno).
+
+    Args:
+        vectors (np.ndarray): Vectores normalizados de entrenamiento.
+        nlist (int): Número de centroides.
+        iterations (int): Número de iteraciones.
+        seed (int): Semilla del generador aleatorio.
+    Returns:
+        np.ndarray: Centroides normalizados.
+    """
+    # Inicializa los centroides con vectores aleatorios.
+    rng:np.random.Generator = np.random.default_rng(seed)
+    centroids:np.ndarray = vectors[rng.choice(len(vectors), size=nlist, replace=False)].copy()
+
+    # Para cada iteración.
+    for __ in range(iterations):
+        # Asigna cada vector a su centroide más cercano.
+        assign:np.ndarray = np.argmax(vectors @ centroids.T, axis=1)
+        # Recalcula los centroides como la media (normalizada) de sus vectores.
+        sums:np.ndarray = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        counts:np.ndarray = np.bincount(assign, minlength=nlist)
+        # Los centroides vacíos se reinician con un vector aleatorio.
+        empty:np.ndarray = np.flatnonzero(counts == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), size=len(empty), replace=False)]
+        centroids = normalize_rows(vectors=sums)
+
+    # Retorna los centroides.
+    return centroids
+
+
+# ---- CLASES ---- #
+class IVFIndex:
+    """
+    Índice vectorial aproximado (IVF) construido sobre un índice exacto, que almacena los
+    vectores. Cada posición se asigna a la lista de su centroide más cercano; las
+    inserciones y eliminaciones son incrementales y los centroides se reentrenan cuando
+    el número de vectores cambia más de lo permitido desde el último entrenamiento.
+    Mientras el índice no está entrenado, la búsqueda es exacta.
+    """
+    # -- Atributos -- #
+    __TRAIN_POINTS_PER_LIST:int = 64
+    __ASSIGN_BATCH:int = 65536
+
+    # -- Métodos por defecto -- #
+    def __init__(self, root_path:Path, embedding_dim:int, nlist:int, nprobe:int, rebuild_ratio:float, min_train_size:int,
+                 quantization:str='NONE', rescore_factor:int=4):
+        """
+        Inicializa la instancia. Si existe un índice previo compatible se reutiliza.
+
+        Args:
+            root_path (Path): Directorio del índice.
+            embedding_dim (int): Tamaño de los embeddings.
+            nlist (int): Número de listas (0 para calcularlo según el número de vectores).
+            nprobe (int): Número de listas recorridas en cada búsqueda.
+            rebuild_ratio (float): Variación relativa del número de vectores que provoca
+                el reentrenamiento.
+            min_train_size (int): Número mínimo de vectores para entrenar el índice.
+            quantization (str): Cuantización de los vectores (NONE, INT8 o BINARY).
+            rescore_factor (int): Candidatos por resultado que se puntúan con los vectores
+                originales si se cuantiza.
+        """
+        # Inicializa las propiedades.
+        self.__path:Path = Path(root_path)
+        self.__flat:FlatIndex = FlatIndex(root_path=root_path, embedding_dim=embedding_dim, quantization=quantization,
+                                          rescore_factor=rescore_factor)
+        self.__nlist:int = nlist
+        self.__nprobe:int = nprobe
+        self.__rebuildRatio:float = rebuild_ratio
+        self.__minTrainSize:int = min_train_size
+
+        # Carga los centroides y las asignaciones.
+        self.__centroids:Optional[np.ndarray] = None
+        self.__assign:np.ndarray = np.full(self.__flat.Capacity, -1, dtype=np.int32)
+        self.__trainedCount:int = 0
+        self.__lists:List[np.ndarray] = []
+        self.__pending:List[List[int]] = []
+        self.__load()
+
+    # -- Propiedades -- #
+    @property
+    def Count(self) -> int:
+        """
+        Retorna el número de vectores del índice.
+
+        Returns:
+            int: Número de vectores.
+        """
+        # Retorna el número de vectores.
+        return self.__flat.Count
+
+    @property
+    def IsTrained(self) -> bool:
+        """
+        Indica si el índice está entrenado (búsqueda aproximada).
+
+        Returns:
+            bool: True si está entrenado.
+        """
+        # Retorna si hay centroides.
+        return self.__centroids is not None
+
+    # -- Métodos privados -- #
+    def __load(self) -> None:
+        """
+        Carga los centroides y las asignaciones almacenados, si son compatibles con el
+        índice exacto.
+        """
+        # Try-Except para reutilizar el índice existente.
+        try:
+            # Carga los ficheros.
+            with np.load(Path(self.__path, 'ivf.npz')) as data:
+                centroids:np.ndarray = data['centroids']
+                assign:np.ndarray = data['assign']
+                trained_count:int = int(data['trainedCount'])
+
+            # Comprueba que son compatibles.
+            if len(assign) == self.__flat.Capacity and np.array_equal(assign >= 0, self.__flat.valid()):
+                self.__centroids, self.__assign, self.__trainedCount = centroids, assign, trained_count
+                self.__build_lists()
+
+        # Si no existen o no son compatibles, el índice queda sin entrenar.
+        except Exception:
+            pass
+
+    def __build_lists(self) -> None:
+        """
+        Construye las listas de posiciones de cada centroide a partir de las asignaciones.
+        """
+        # Ordena las posiciones asignadas por centroide.
+        slots:np.ndarray = np.flatnonzero(self.__assign >= 0)
+        slots = slots[np.argsort(self.__assign[slots], kind='stable')]
+        bounds:np.ndarray = np.searchsorted(self.__assign[slots], np.arange(len(self.__centroids) + 1))
+
+        # Separa las posiciones en listas.
+        self.__lists = [slots[bounds[i]:bounds[i + 1]] for i in range(len(self.__centroids))]
+        self.__pending = [[] for __ in range(len(self.__centroids))]
+
+    def __assign_slots(self, slots:List[int]) -> None:
+        """
+        Asigna las posiciones a la lista de su centroide más cercano.
+
+        Args:
+            slots (List[int]): Posiciones a asignar.
+        """
+        # Amplía las asignaciones si el índice exacto ha crecido.
+        if len(self.__assign) < self.__flat.Capacity:
+            self.__assign = np.concatenate([self.__assign, np.full(self.__flat.Capacity - len(self.__assign), -1, dtype=np.int32)])
+
+        # Si el índice no está entrenado, solo marca las posiciones como ocupadas.
+        if self.__centroids is None:
+            self.__assign[slots] = 0
+            return
+
+        # Asigna cada posición a su centroide más cercano.
+        lists:np.ndarray = np.argmax(self.__flat.vectors()[slots] @ self.__centroids.T, axis=1)
+        self.__assign[slots] = lists
+        # Añade las posiciones a las listas pendientes de consolidar.
+        for slot, index in zip(slots, lists.tolist()):
+            self.__pending[index].append(slot)
+
+    def __candidates(self, probes:np.ndarray) -> np.ndarray:
+        """
+        Obtiene las posiciones de las listas recorridas.
+
+        Args:
+            probes (np.ndarray): Listas a recorrer.
+        Returns:
+            np.ndarray: Posiciones candidatas.
+        """
+        # Une las listas consolidadas y las pendientes.
+        parts:List[np.ndarray] = []
+        for index in probes.tolist():
+            parts.append(self.__lists[index])
+            if self.__pending[index]:
+                parts.append(np.asarray(self.__pending[index], dtype=np.int64))
+        slots:np.ndarray = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+        # Descarta las posiciones eliminadas o reasignadas a otra lista.
+        return slots[np.isin(self.__assign[slots], probes)]
+
+    # -- Métodos públicos -- #
+    def add(self, ids:List[str], vectors:np.ndarray) -> List[int]:
+        """
+        Inserta (o reemplaza) vectores.
+
+        Args:
+            ids (List[str]): Identificadores de los vectores.
+            vectors (np.ndarray): Vectores.
+        Returns:
+            List[int]: Posiciones asignadas a cada vector.
+        """
+        # Inserta los vectores en el índice exacto y los asigna a sus listas.
+        slots:List[int] = self.__flat.add(ids=ids, vectors=vectors)
+        self.__assign_slots(slots=slots)
+        # Retorna las posiciones.
+        return slots
+
+    def remove(self, ids:List[str]) -> List[int]:
+        """
+        Elimina vectores. Las listas se depuran al buscar y al reentrenar.
+
+        Args:
+            ids (List[str]): Identificadores de los vectores.
+        Returns:
+            List[int]: Posiciones liberadas.
+        """
+        # Elimina los vectores y sus asignaciones.
+        slots:List[int] = self.__flat.remove(ids=ids)
+        self.__assign[slots] = -1
+        # Retorna las posiciones liberadas.
+        return slots
+
+    def search(self, query:np.ndarray, top_k:int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene los vectores más similares (coseno) a la consulta, recorriendo solo las
+        listas de los centroides más cercanos.
+
+        Args:
+            query (np.ndarray): Vector de la consulta.
+            top_k (int): Número de vectores a obtener.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Posiciones y puntuaciones, de mayor a menor.
+        """
+        # Si no está entrenado, la búsqueda es exacta.
+        if self.__centroids is None:
+            return self.__flat.search(query=query, top_k=top_k)
+
+        # Obtiene las listas más cercanas a la consulta.
+        query = normalize_rows(vectors=query)
+        nprobe:int = min(self.__nprobe, len(self.__centroids))
+        probes:np.ndarray = np.argpartition(-(self.__centroids @ query), nprobe - 1)[:nprobe]
+
+        # Retorna las mejores posiciones candidatas.
+        return self.__flat.rank(slots=self.__candidates(probes=probes), query=query, top_k=top_k)
+
+    def search_batch(self, queries:np.ndarray, top_k:int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Obtiene los vectores más similares (coseno) a cada consulta. Los centroides se
+        puntúan para todas las consultas a la vez.
+
+        Args:
+            queries (np.ndarray): Matriz de vectores de las consultas.
+            top_k (int): Número de vectores a obtener por consulta.
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: Posiciones y puntuaciones de cada consulta,
+                de mayor a menor.
+        """
+        # Si no está entrenado, la búsqueda es exacta.
+        if self.__centroids is None:
+            return self.__flat.search_batch(queries=queries, top_k=top_k)
+
+        # Obtiene las listas más cercanas a cada consulta.
+        queries = normalize_rows(vectors=queries)
+        nprobe:int = min(self.__nprobe, len(self.__centroids))
+        probes:np.ndarray = np.argpartition(-(queries @ self.__centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+
+        # Retorna las mejores posiciones candidatas de cada consulta.
+        return [self.__flat.rank(slots=self.__candidates(probes=row), query=query, top_k=top_k) for query, row in zip(queries, probes)]
+
+    def needs_rebuild(self) -> bool:
+        """
+        Indica si se deben reentrenar los centroides.
+
+        Returns:
+            bool: True si el índice alcanza el tamaño mínimo y no está entrenado, o si el
+                número de vectores ha variado más de lo permitido.
+        """
+        # Comprueba el tamaño mínimo.
+        if self.Count < self.__minTrainSize:
+            return self.__centroids is not None
+        # Comprueba si está entrenado y la variación desde el último entrenamiento.
+        return self.__centroids is None or abs(self.Count - self.__trainedCount) > self.__rebuildRatio * self.__trainedCount
+
+    def rebuild(self) -> None:
+        """
+        Reentrena los centroides con una muestra de los vectores y reasigna todas las
+        posiciones. Por debajo del tamaño mínimo, el índice pasa a búsqueda exacta.
+        """
+        # Obtiene las posiciones ocupadas.
+        slots:np.ndarray = np.flatnonzero(self.__flat.valid())
+
+        # Si no se alcanza el tamaño mínimo, descarta los centroides.
+        if len(slots) < self.__minTrainSize:
+            self.__centroids = None
+            self.__trainedCount = 0
+            self.__assign[:] = -1
+            self.__assign[slots] = 0
+            return
+
+        # Obtiene el número de listas y una muestra de entrenamiento.
+        nlist:int = self.__nlist or max(1, int(4 * math.sqrt(len(slots))))
+        nlist = min(nlist, len(slots))
+        rng:np.random.Generator = np.random.default_rng(0)
+        sample:np.ndarray = rng.choice(slots, size=min(len(slots), nlist * self.__TRAIN_POINTS_PER_LIST), replace=False)
+        centroids:np.ndarray = train_centroids(vectors=np.asarray(self.__flat.vectors()[np.sort(sample)]), nlist=nlist)
+
+        # Reasigna todas las posiciones por bloques.
+        assign:np.ndarray = np.full(self.__flat.Capacity, -1, dtype=np.int32)
+        for start in range(0, len(slots), self.__ASSIGN_BATCH):
+            block:np.ndarray = slots[start:start + self.__ASSIGN_BATCH]
+            assign[block] = np.argmax(self.__flat.vectors()[block] @ centroids.T, axis=1)
+
+        # Reemplaza el estado del índice.
+        self.__centroids, self.__assign, self.__trainedCount = centroids, assign, len(slots)
+        self.__build_lists()
+
+    def reset(self) -> None:
+        """
+        Vacía el índice.
+        """
+        # Vacía el índice exacto y descarta los centroides.
+        self.__flat.reset()
+        self.__centroids = None
+        self.__assign = np.full(self.__flat.Capacity, -1, dtype=np.int32)
+        self.__trainedCount = 0
+        self.__lists, self.__pending = [], []
+
+    def save(self) -> None:
+        """
+        Almacena el índice en disco.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Almacena el índice exacto.
+            self.__flat.save()
+
+            # Almacena los centroides y las asignaciones (o los elimina si no está entrenado).
+            path:Path = Path(self.__path, 'ivf.npz')
+            if self.__centroids is None:
+                if path.exists():
+                    os.remove(path)
+                return
+            # Consolida las listas pendientes antes de almacenar.
+            self.__build_lists()
+            np.savez(Path(self.__path, 'ivf.tmp.npz'), centroids=self.__centroids, assign=self.__assign,
+                     trainedCount=np.int64(self.__trainedCount))
+            os.replace(Path(self.__path, 'ivf.tmp.npz'), path)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"IVFIndex.save() -> [{type(e).__name__}] No se pudo almacenar el índice. Trace: {e}")
\ No newline at end of file
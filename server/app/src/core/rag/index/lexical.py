@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: lexical.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el índice léxico (BM25).
+    Los fragmentos se tokenizan para español y se almacenan en un índice invertido con
+    las listas de apariciones en arrays compactos.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import re
+import math
+import unicodedata
+from array import array
+from pathlib import Path
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+from core.rag.index.flat import select_top
+from core.rag.index.chunk_store import ChunkStore
+from model.chunk import ChunkDTO
+
+
+# ---- PARÁMETROS ---- #
+__TOKEN_PATTERN:re.Pattern = re.compile(r'[a-z0-9]+')
+__JOIN_PATTERN:re.Pattern = re.compile(r'(?<=[a-z])[-_.](?=\d)|(?<=\d)[-_.](?=[a-z])')
+__STOPWORDS:Set[str] = {
+    'a', 'al', 'algo', 'como', 'con', 'cual', 'cuales', 'cuando', 'de', 'del', 'donde', 'e', 'el', 'ella', 'ellas', 'ellos',
+    'en', 'entre', 'era', 'es', 'esa', 'esas', 'ese', 'eso', 'esos', 'esta', 'estas', 'este', 'esto', 'estos', 'fue', 'ha',
+    'hay', 'la', 'las', 'le', 'les', 'lo', 'los', 'mas', 'me', 'mi', 'muy', 'no', 'nos', 'o', 'para', 'pero', 'por', 'que',
+    'quien', 'se', 'segun', 'ser', 'si', 'sin', 'sobre', 'son', 'su', 'sus', 'tambien', 'te', 'tiene', 'u', 'un', 'una',
+    'unas', 'uno', 'unos', 'y', 'ya', 'yo'
+}
+
+
+# ---- FUNCIONES ---- #
+def is_identifier(token:str) -> bool:
+    """
+    Indica si un token es un identificador (código de equipo, norma, referencia...), es
+    decir, si contiene algún dígito.
+
+    Args:
+        token (str): Token.
+    Returns:
+        bool: True si es un identificador.
+    """
+    # Retorna si contiene dígitos.
+    return any(char.isdigit() for char in token)
+
+
+def stem(token:str) -> str:
+    """
+    Reduce un token a una forma común eliminando el plural en español. Los
+    identificadores no se modifican.
+
+    Args:
+        token (str): Token normalizado.
+    Returns:
+        str: Token reducido.
+    """
+    # Los identificadores se mantienen exactos.
+    if is_identifier(token=token):
+        return token
+    # Plurales en -es tras consonante (motores, presiones).
+    if len(token) > 5 and token.endswith('es') and token[-3] not in 'aeiou':
+        return token[:-2]
+    # Plurales en -s (válvulas, sensores ya tratados).
+    if len(token) > 4 and token.endswith('s'):
+        return token[:-1]
+    # Retorna el token.
+    return token
+
+
+def tokenize(text:str) -> List[str]:
+    """
+    Tokeniza un texto: pasa a minúsculas, elimina acentos, une los identificadores con
+    guiones ("CE-300" y "CE300" producen el mismo token), descarta las palabras vacías
+    y elimina los plurales.
+
+    Args:
+        text (str): Texto a tokenizar.
+    Returns:
+        List[str]: Tokens del texto.
+    """
+    # Normaliza el texto.
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = __JOIN_PATTERN.sub('', text)
+    # Retorna los tokens.
+    return [stem(token=token) for token in __TOKEN_PATTERN.findall(text) if token not in __STOPWORDS]
+
+
+def is_identifier_query(tokens:List[str]) -> bool:
+    """
+    Indica si una consulta es una búsqueda de identificadores: contiene algún
+    identificador y como mucho una palabra más ("IF750", "manual IF750").
+
+    Args:
+        tokens (List[str]): Tokens de la consulta.
+    Returns:
+        bool: True si es una búsqueda de identificadores.
+    """
+    # Obtiene los identificadores.
+    identifiers:int = sum(1 for token in tokens if is_identifier(token=token))
+    # Retorna si predominan los identificadores.
+    return identifiers > 0 and len(tokens) - identifiers <= 1
+
+
+# ---- CLASES ---- #
+class LexicalIndex:
+    """
+    Índice invertido con puntuación BM25. Las listas de apariciones consolidadas se
+    guardan en arrays compactos (CSR); los fragmentos insertados después se acumulan en
+    listas pendientes y los eliminados se descartan al buscar, hasta que el índice se
+    consolida al almacenarlo. El contenido se guarda en un almacén de fragmentos para
+    poder responder sin consultar el almacén vectorial.
+    """
+    # -- Atributos -- #
+    __ID_SIZE:int = 36
+
+    # -- Métodos por defecto -- #
+    def __init__(self, root_path:Path, k1:float, b:float):
+        """
+        Inicializa la instancia. Si existe un índice previo se reutiliza.
+
+        Args:
+            root_path (Path): Directorio del índice.
+            k1 (float): Parámetro de saturación de la frecuencia de BM25.
+            b (float): Parámetro de normalización por longitud de BM25.
+        """
+        # Inicializa las propiedades.
+        self.__path:Path = Path(root_path)
+        self.__k1:float = k1
+        self.__b:float = b
+        self.__chunks:ChunkStore = ChunkStore(root_path=self.__path)
+
+        # Carga el índice.
+        self.__clear()
+        self.__load()
+
+    # -- Propiedades -- #
+    @property
+    def Count(self) -> int:
+        """
+        Retorna el número de fragmentos del índice.
+
+        Returns:
+            int: Número de fragmentos.
+        """
+        # Retorna el número de fragmentos.
+        return len(self.__docs)
+
+    # -- Métodos privados -- #
+    def __clear(self) -> None:
+        """
+        Inicializa un índice vacío.
+        """
+        # Fragmentos: identificador, longitud y si sigue vigente, por número.
+        self.__ids:np.ndarray = np.zeros(0, dtype=f'S{self.__ID_SIZE}')
+        self.__lengths:np.ndarray = np.zeros(0, dtype=np.int32)
+        self.__live:np.ndarray = np.zeros(0, dtype=bool)
+        self.__docs:Dict[str, int] = {}
+        self.__size:int = 0
+        self.__free:List[int] = []
+        self.__dead:List[int] = []
+        self.__totalLength:int = 0
+
+        # Listas de apariciones consolidadas y pendientes.
+        self.__terms:Dict[str, int] = {}
+        self.__offsets:np.ndarray = np.zeros(1, dtype=np.int64)
+        self.__postDocs:np.ndarray = np.zeros(0, dtype=np.int32)
+        self.__postTfs:np.ndarray = np.zeros(0, dtype=np.uint16)
+        self.__pending:Dict[str, Tuple[array, array]] = {}
+
+    def __load(self) -> None:
+        """
+        Carga el índice almacenado, si existe y coincide con el almacén de fragmentos.
+        """
+        # Try-Except para reutilizar el índice existente.
+        try:
+            # Carga el fichero.
+            with np.load(Path(self.__path, 'lexical.npz')) as data:
+                self.__terms = {term:row for row, term in enumerate(data['terms'].tolist())}
+                self.__offsets = data['offsets']
+                self.__postDocs = data['docs']
+                self.__postTfs = data['tfs']
+                self.__ids = data['ids']
+                self.__lengths = data['lengths']
+                self.__free = data['free'].tolist()
+
+            # Reconstruye los fragmentos vigentes.
+            self.__size = len(self.__ids)
+            self.__live = self.__ids != b''
+            self.__docs = {key.decode('ascii'):number for number, key in enumerate(self.__ids.tolist()) if key}
+            self.__totalLength = int(self.__lengths[self.__live].sum())
+
+        # Si no existe o no se puede leer, el índice queda vacío.
+        except Exception:
+            self.__clear()
+
+    def __ensure(self, capacity:int) -> None:
+        """
+        Amplía (al menos al doble) los arrays de fragmentos.
+
+        Args:
+            capacity (int): Capacidad necesaria.
+        """
+        # Si ya hay capacidad, no hace nada.
+        if capacity <= len(self.__ids):
+            return
+
+        # Amplía los arrays.
+        extra:int = max(capacity, 2 * len(self.__ids), 1024) - len(self.__ids)
+        self.__ids = np.concatenate([self.__ids, np.zeros(extra, dtype=self.__ids.dtype)])
+        self.__lengths = np.concatenate([self.__lengths, np.zeros(extra, dtype=np.int32)])
+        self.__live = np.concatenate([self.__live, np.zeros(extra, dtype=bool)])
+
+    def __postings(self, term:str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene la lista de apariciones vigentes de un término.
+
+        Args:
+            term (str): Término.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Fragmentos y frecuencias del término.
+        """
+        # Obtiene las apariciones consolidadas y pendientes.
+        docs:List[np.ndarray] = []
+        tfs:List[np.ndarray] = []
+        if term in self.__terms:
+            row:int = self.__terms[term]
+            docs.append(self.__postDocs[self.__offsets[row]:self.__offsets[row + 1]])
+            tfs.append(self.__postTfs[self.__offsets[row]:self.__offsets[row + 1]])
+        if term in self.__pending:
+            docs.append(np.frombuffer(self.__pending[term][0], dtype=np.int32))
+            tfs.append(np.frombuffer(self.__pending[term][1], dtype=np.uint16))
+        if not docs:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.uint16)
+
+        # Descarta los fragmentos eliminados.
+        all_docs:np.ndarray = np.concatenate(docs)
+        all_tfs:np.ndarray = np.concatenate(tfs)
+        live:np.ndarray = self.__live[all_docs]
+        # Retorna las apariciones vigentes.
+        return all_docs[live], all_tfs[live]
+
+    def __consolidate(self) -> None:
+        """
+        Une las listas pendientes a las consolidadas y elimina las apariciones de los
+        fragmentos borrados, cuyos números pasan a poder reutilizarse.
+        """
+        # Si no hay cambios, no hace nada.
+        if not self.__pending and not self.__dead:
+            return
+
+        # Obtiene las apariciones consolidadas (término, fragmento, frecuencia).
+        terms:List[str] = list(self.__terms)
+        rows:List[np.ndarray] = [np.repeat(np.arange(len(terms), dtype=np.int64), np.diff(self.__offsets))]
+        docs:List[np.ndarray] = [self.__postDocs]
+        tfs:List[np.ndarray] = [self.__postTfs]
+        # Añade las apariciones pendientes.
+        index:Dict[str, int] = dict(self.__terms)
+        for term, (term_docs, term_tfs) in self.__pending.items():
+            if term not in index:
+                index[term] = len(terms)
+                terms.append(term)
+            rows.append(np.full(len(term_docs), index[term], dtype=np.int64))
+            docs.append(np.frombuffer(term_docs, dtype=np.int32))
+            tfs.append(np.frombuffer(term_tfs, dtype=np.uint16))
+
+        # Descarta los fragmentos eliminados y agrupa por término.
+        all_rows:np.ndarray = np.concatenate(rows)
+        all_docs:np.ndarray = np.concatenate(docs)
+        all_tfs:np.ndarray = np.concatenate(tfs)
+        live:np.ndarray = self.__live[all_docs]
+        all_rows, all_docs, all_tfs = all_rows[live], all_docs[live], all_tfs[live]
+        order:np.ndarray = np.argsort(all_rows, kind='stable')
+        counts:np.ndarray = np.bincount(all_rows, minlength=len(terms))
+
+        # Reconstruye el vocabulario sin los términos sin apariciones.
+        used:np.ndarray = np.flatnonzero(counts)
+        self.__terms = {terms[row]:new for new, row in enumerate(used.tolist())}
+        self.__offsets = np.concatenate([[0], np.cumsum(counts[used])]).astype(np.int64)
+        self.__postDocs = np.ascontiguousarray(all_docs[order], dtype=np.int32)
+        self.__postTfs = np.ascontiguousarray(all_tfs[order], dtype=np.uint16)
+        self.__pending = {}
+
+        # Los números de los fragmentos eliminados pueden reutilizarse.
+        self.__free.extend(self.__dead)
+        self.__dead = []
+
+    # -- Métodos públicos -- #
+    def add(self, chunks:List[ChunkDTO]) -> None:
+        """
+        Inserta (o reemplaza) fragmentos.
+
+        Args:
+            chunks (List[ChunkDTO]): Fragmentos a insertar.
+        """
+        # Reemplaza los fragmentos existentes.
+        self.remove(ids=[chunk.id for chunk in chunks if chunk.id in self.__docs])
+
+        # Para cada fragmento.
+        numbers:List[int] = []
+        for chunk in chunks:
+            # Obtiene el número del fragmento.
+            number:int = self.__free.pop() if self.__free else self.__size
+            self.__size = max(self.__size, number + 1)
+            self.__ensure(capacity=self.__size)
+
+            # Añade las apariciones de sus términos.
+            tokens:List[str] = tokenize(text=chunk.content)
+            for term, tf in Counter(tokens).items():
+                term_docs, term_tfs = self.__pending.setdefault(term, (array('i'), array('H')))
+                term_docs.append(number)
+                term_tfs.append(min(tf, 65535))
+
+            # Registra el fragmento.
+            self.__ids[number] = chunk.id.encode('ascii')
+            self.__lengths[number] = len(tokens)
+            self.__live[number] = True
+            self.__docs[chunk.id] = number
+            self.__totalLength += len(tokens)
+            numbers.append(number)
+
+        # Almacena el contenido.
+        self.__chunks.put(slots=numbers, chunks=chunks)
+
+    def remove(self, ids:List[str]) -> None:
+        """
+        Elimina fragmentos. Sus apariciones se descartan al consolidar.
+
+        Args:
+            ids (List[str]): Identificadores de los fragmentos.
+        """
+        # Obtiene los números de los fragmentos existentes.
+        numbers:List[int] = [self.__docs.pop(key) for key in ids if key in self.__docs]
+
+        # Marca los fragmentos como eliminados.
+        self.__live[numbers] = False
+        self.__ids[numbers] = b''
+        self.__totalLength -= int(self.__lengths[numbers].sum())
+        self.__dead.extend(numbers)
+        self.__chunks.remove(slots=numbers)
+
+    def search(self, tokens:List[str], top_k:int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene los fragmentos con mayor puntuación BM25 para los tokens de la consulta.
+
+        Args:
+            tokens (List[str]): Tokens de la consulta.
+            top_k (int): Número de fragmentos a obtener.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Números de los fragmentos y puntuaciones, de
+                mayor a menor.
+        """
+        # Si el índice o la consulta están vacíos, no hay resultados.
+        if not self.__docs or not tokens:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Parámetros de la colección.
+        n:int = len(self.__docs)
+        avgdl:float = max(self.__totalLength / n, 1.0)
+        docs:List[np.ndarray] = []
+        weights:List[np.ndarray] = []
+
+        # Para cada término de la consulta.
+        for term in set(tokens):
+            # Obtiene sus apariciones.
+            term_docs, term_tfs = self.__postings(term=term)
+            if len(term_docs) == 0:
+                continue
+
+            # Calcula la contribución BM25 de cada aparición.
+            idf:float = math.log(1 + (n - len(term_docs) + 0.5) / (len(term_docs) + 0.5))
+            tf:np.ndarray = term_tfs.astype(np.float32)
+            norm:np.ndarray = self.__k1 * (1 - self.__b + self.__b * self.__lengths[term_docs] / avgdl)
+            docs.append(term_docs)
+            weights.append(idf * tf * (self.__k1 + 1) / (tf + norm))
+
+        # Si ningún término aparece, no hay resultados.
+        if not docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Suma las contribuciones por fragmento.
+        unique, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+        scores:np.ndarray = np.bincount(inverse, weights=np.concatenate(weights)).astype(np.float32)
+        best:np.ndarray = select_top(scores=scores, k=top_k)
+        # Retorna los fragmentos y puntuaciones.
+        return unique[best].astype(np.int64), scores[best]
+
+    def get(self, number:int) -> Tuple[str, str]:
+        """
+        Lee el contenido de un fragmento.
+
+        Args:
+            number (int): Número del fragmento.
+        Returns:
+            Tuple[str, str]: Contenido y ruta del fichero de origen.
+        """
+        # Retorna el contenido y el origen.
+        return self.__chunks.get(slot=number)
+
+    def reset(self) -> None:
+        """
+        Vacía el índice.
+        """
+        # Vacía el índice y el contenido.
+        self.__clear()
+        self.__chunks.reset()
+
+    def save(self) -> None:
+        """
+        Consolida el índice y lo almacena en disco.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Consolida las listas de apariciones.
+            self.__consolidate()
+
+            # Almacena el índice de forma atómica.
+            np.savez(Path(self.__path, 'lexical.tmp.npz'), terms=np.array(list(self.__terms), dtype=str),
+                     offsets=self.__offsets, docs=self.__postDocs, tfs=self.__postTfs, ids=self.__ids[:self.__size],
+                     lengths=self.__lengths[:self.__size], free=np.array(self.__free, dtype=np.int64))
+            os.replace(Path(self.__path, 'lexical.tmp.npz'), Path(self.__path, 'lexical.npz'))
+            # Almacena el contenido.
+            self.__chunks.save()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"LexicalIndex.save() -> [{type(e).__name__}] No se pudo almacenar el índice léxico. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: quantization.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la cuantización de los
+    embeddings del índice nativo. Los códigos cuantizados se mantienen en memoria para
+    preseleccionar candidatos, que después se puntúan con los vectores originales.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+
+
+# ---- FUNCIONES ---- #
+def quantize_int8(vectors:np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cuantiza los vectores a int8 con una escala por vector.
+
+    Args:
+        vectors (np.ndarray): Vectores (N, D).
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Códigos int8 (N, D) y escalas float32 (N,).
+    """
+    # Obtiene la escala de cada vector.
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales:np.ndarray = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127
+    # Retorna los códigos y las escalas.
+    codes:np.ndarray = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_binary(vectors:np.ndarray) -> np.ndarray:
+    """
+    Cuantiza los vectores a un bit por dimensión (signo), empaquetados en palabras de
+    64 bits.
+
+    Args:
+        vectors (np.ndarray): Vectores (N, D).
+    Returns:
+        np.ndarray: Códigos uint64 (N, ceil(D / 64)).
+    """
+    # Empaqueta los signos y completa hasta un múltiplo de 64 bits.
+    bits:np.ndarray = np.packbits(np.asarray(vectors) > 0, axis=1)
+    pad:int = (-bits.shape[1]) % 8
+    if pad:
+        bits = np.pad(bits, ((0, 0), (0, pad)))
+    # Retorna los códigos.
+    return np.ascontiguousarray(bits).view(np.uint64)
+
+
+# ---- CLASES ---- #
+class QuantizedCodes:
+    """
+    Códigos cuantizados de los vectores de un índice, indexados por posición. Con INT8
+    ocupan 4 veces menos que los vectores float32; con BINARY, 32 veces menos y la
+    preselección se hace por distancia de Hamming.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, mode:str, embedding_dim:int, capacity:int):
+        """
+        Inicializa la instancia.
+
+        Args:
+            mode (str): Tipo de cuantización (INT8 o BINARY).
+            embedding_dim (int): Tamaño de los embeddings.
+            capacity (int): Número de posiciones.
+        Raises:
+            ValueError: Si el tipo de cuantización no se reconoce.
+        """
+        # Comprueba el tipo de cuantización.
+        if mode not in ('INT8', 'BINARY'):
+            raise ValueError(f"La cuantización <{mode}> no se reconoce.")
+
+        # Inicializa las propiedades.
+        self.__mode:str = mode
+        self.__dim:int = embedding_dim
+        self.__codes, self.__scales = self.__empty(capacity=capacity)
+
+    # -- Propiedades -- #
+    @property
+    def Capacity(self) -> int:
+        """
+        Retorna el número de posiciones.
+
+        Returns:
+            int: Número de posiciones.
+        """
+        # Retorna la capacidad.
+        return len(self.__codes)
+
+    @property
+    def Bytes(self) -> int:
+        """
+        Retorna la memoria ocupada por los códigos.
+
+        Returns:
+            int: Número de bytes.
+        """
+        # Retorna el tamaño de los códigos y las escalas.
+        return self.__codes.nbytes + (self.__scales.nbytes if self.__scales is not None else 0)
+
+    # -- Métodos privados -- #
+    def __empty(self, capacity:int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Crea códigos vacíos.
+
+        Args:
+            capacity (int): Número de posiciones.
+        Returns:
+            Tuple[np.ndarray, Optional[np.ndarray]]: Códigos y escalas (solo INT8).
+        """
+        # Si es INT8.
+        if self.__mode == 'INT8':
+            return np.zeros((capacity, self.__dim), dtype=np.int8), np.zeros(capacity, dtype=np.float32)
+        # Si es BINARY.
+        return np.zeros((capacity, (self.__dim + 63) // 64), dtype=np.uint64), None
+
+    # -- Métodos públicos -- #
+    def encode(self, slots:np.ndarray, vectors:np.ndarray) -> None:
+        """
+        Cuantiza y almacena los vectores en sus posiciones.
+
+        Args:
+            slots (np.ndarray): Posiciones.
+            vectors (np.ndarray): Vectores normalizados.
+        """
+        # Si es INT8.
+        if self.__mode == 'INT8':
+            self.__codes[slots], self.__scales[slots] = quantize_int8(vectors=vectors)
+        # Si es BINARY.
+        else:
+            self.__codes[slots] = quantize_binary(vectors=vectors)
+
+    def grow(self, capacity:int) -> None:
+        """
+        Amplía los códigos hasta la capacidad dada.
+
+        Args:
+            capacity (int): Nueva capacidad.
+        """
+        # Añade posiciones vacías.
+        codes, scales = self.__empty(capacity=capacity - self.Capacity)
+        self.__codes = np.concatenate([self.__codes, codes])
+        if self.__scales is not None:
+            self.__scales = np.concatenate([self.__scales, scales])
+
+    def scores(self, query:np.ndarray, slots:Optional[np.ndarray]=None, limit:Optional[int]=None) -> np.ndarray:
+        """
+        Calcula la similitud aproximada de la consulta con los códigos (mayor es más
+        similar).
+
+        Args:
+            query (np.ndarray): Vector normalizado de la consulta.
+            slots (Optional[np.ndarray]): Posiciones a puntuar (None para las primeras
+                `limit` posiciones).
+            limit (Optional[int]): Número de posiciones a puntuar si no se indican.
+        Returns:
+            np.ndarray: Similitud aproximada de cada posición.
+        """
+        # Obtiene los códigos a puntuar.
+        codes:np.ndarray = self.__codes[slots] if slots is not None else self.__codes[:limit]
+
+        # Si es INT8, producto escalar entero reescalado.
+        if self.__mode == 'INT8':
+            query_codes, query_scale = quantize_int8(vectors=query[None, :])
+            scales:np.ndarray = self.__scales[slots] if slots is not None else self.__scales[:limit]
+            dots:np.ndarray = np.einsum('ij,j->i', codes, query_codes[0].astype(np.int16), dtype=np.int32)
+            return dots.astype(np.float32) * scales * query_scale[0]
+
+        # Si es BINARY, distancia de Hamming (negada).
+        distance:np.ndarray = np.bitwise_count(codes ^ quantize_binary(vectors=query[None, :])[0]).sum(axis=1, dtype=np.int32)
+        return -distance.astype(np.float32)
+
+    def reset(self, capacity:int) -> None:
+        """
+        Vacía los códigos.
+
+        Args:
+            capacity (int): Número de posiciones.
+        """
+        # Crea los códigos vacíos.
+        self.__codes, self.__scales = self.__empty(capacity=capacity)
+
+    def load(self, path:Path, capacity:int) -> bool:
+        """
+        Carga los códigos almacenados si son compatibles.
+
+        Args:
+            path (Path): Fichero de los códigos.
+            capacity (int): Número de posiciones esperado.
+        Returns:
+            bool: True si se han cargado.
+        """
+        # Try-Except para reutilizar los códigos existentes.
+        try:
+            # Carga el fichero.
+            with np.load(path) as data:
+                if str(data['mode']) != self.__mode or len(data['codes']) != capacity:
+                    return False
+                self.__codes = data['codes']
+                self.__scales = data['scales'] if self.__mode == 'INT8' else None
+            # Retorna que se han cargado.
+            return True
+
+        # Si no existen o no se pueden leer.
+        except Exception:
+            return False
+
+    def save(self, path:Path) -> None:
+        """
+        Almacena los códigos en disco.
+
+        Args:
+            path (Path): Fichero de los códigos.
+        """
+        # Almacena los códigos de forma atómica.
+        tmp_path:Path = Path(path.parent, f"{path.stem}.tmp.npz")
+        np.savez(tmp_path, mode=np.str_(self.__mode), codes=self.__codes,
+                 scales=self.__scales if self.__scales is not None else np.zeros(0, dtype=np.float32))
+        os.replace(tmp_path, path)
\ No newline at end of file
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: reranker.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la reordenación del contexto
+    recuperado mediante un cross-encoder.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import time
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, List
+from contextlib import redirect_stdout, redirect_stderr
+# Librerías externas
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+# Librerías internas
+from model.context import ContextDTO
+from utils.file.common import hash_text
+from config.schema.rag import RerankerConfig
+
+
+# ---- CLASES ---- #
+class CrossEncoderReranker:
+    """
+    Reordena el contexto recuperado con un cross-encoder y conserva los N mejores
+    fragmentos. Los fragmentos se puntúan por lotes en el orden de la recuperación, de
+    modo que la reordenación se detiene al agotar el tiempo por consulta (tras puntuar al
+    menos N fragmentos y un lote más) o cuando el último lote queda claramente por debajo
+    del fragmento N. Solo se retornan fragmentos puntuados. Los fragmentos tokenizados
+    se almacenan en caché, por lo que solo la consulta se tokeniza en cada petición.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, model_path:Path, reranker_cfg:RerankerConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            model_path (Path): Directorio del modelo.
+            reranker_cfg (RerankerConfig): Configuración de la reordenación.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Carga el tokenizador y el modelo.
+            with open(os.devnull, 'w') as devnull:
+                with redirect_stdout(devnull), redirect_stderr(devnull):
+                    self.__tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+                    self.__model = AutoModelForSequenceClassification.from_pretrained(str(model_path)).eval()
+
+            # Inicializa las propiedades.
+            self.__cfg:RerankerConfig = reranker_cfg
+            self.__cache:OrderedDict[str, List[int]] = OrderedDict()
+            self.__lock:threading.Lock = threading.Lock()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"CrossEncoderReranker.__init__() -> [{type(e).__name__}] No se pudo cargar el modelo <{model_path}>. Trace: {e}")
+
+    # -- Métodos privados -- #
+    def __chunk_ids(self, content:str) -> List[int]:
+        """
+        Retorna los tokens de un fragmento, de la caché si ya se había tokenizado.
+
+        Args:
+            content (str): Contenido del fragmento.
+        Returns:
+            List[int]: Tokens del fragmento (sin tokens especiales).
+        """
+        # Obtiene los tokens de la caché.
+        key:str = hash_text(text=content)
+        with self.__lock:
+            if key in self.__cache:
+                self.__cache.move_to_end(key)
+                return self.__cache[key]
+
+        # Tokeniza el fragmento (no puede superar la longitud máxima del par).
+        ids:List[int] = self.__tokenizer(content, add_special_tokens=False, truncation=True,
+                                         max_length=self.__cfg.maxLength)['input_ids']
+
+        # Almacena los tokens y descarta los menos usados.
+        with self.__lock:
+            self.__cache[key] = ids
+            while len(self.__cache) > self.__cfg.cacheEntries:
+                self.__cache.popitem(last=False)
+        # Retorna los tokens.
+        return ids
+
+    def __score(self, query_ids:List[int], contents:List[str]) -> List[float]:
+        """
+        Puntúa un lote de fragmentos frente a la consulta.
+
+        Args:
+            query_ids (List[int]): Tokens de la consulta.
+            contents (List[str]): Contenido de los fragmentos.
+        Returns:
+            List[float]: Puntuación de cada fragmento.
+        """
+        # Construye los pares consulta-fragmento a partir de los tokens.
+        features:List[Dict] = [self.__tokenizer.prepare_for_model(query_ids, self.__chunk_ids(content=content),
+                                                                  truncation='only_second', max_length=self.__cfg.maxLength)
+                               for content in contents]
+        batch = self.__tokenizer.pad(features, return_tensors='pt')
+
+        # Calcula las puntuaciones.
+        with torch.inference_mode():
+            logits:torch.Tensor = self.__model(**batch).logits
+        # Con una salida es la puntuación; con dos, la probabilidad (logarítmica) de relevancia.
+        scores:torch.Tensor = logits[:, 0] if logits.shape[1] == 1 else logits.log_softmax(dim=1)[:, -1]
+        # Retorna las puntuaciones.
+        return scores.float().tolist()
+
+    # -- Métodos públicos -- #
+    def rerank(self, query:str, context:List[ContextDTO]) -> List[ContextDTO]:
+        """
+        Reordena el contexto y conserva los N mejores fragmentos.
+
+        Args:
+            query (str): Consulta del usuario.
+            context (List[ContextDTO]): Contexto recuperado, de mayor a menor relevancia.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[ContextDTO]: Los N fragmentos más relevantes, con la puntuación del
+                cross-encoder.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Si no hay más fragmentos que los que se conservan, no se reordena.
+            if len(context) <= self.__cfg.topN:
+                return context
+
+            # Tokeniza la consulta (como mucho la mitad del par).
+            start:float = time.perf_counter()
+            query_ids:List[int] = self.__tokenizer(query, add_special_tokens=False, truncation=True,
+                                                   max_length=self.__cfg.maxLength // 2)['input_ids']
+
+            # Puntúa los fragmentos por lotes, en el orden de la recuperación.
+            scores:List[float] = []
+            for begin in range(0, len(context), self.__cfg.batchSize):
+                batch:List[float] = self.__score(query_ids=query_ids,
+                                                 contents=[c.content for c in context[begin:begin + self.__cfg.batchSize]])
+                scores.extend(batch)
+
+                # Si se ha agotado el tiempo, termina (una vez puntuados N fragmentos y un lote más).
+                if len(scores) >= self.__cfg.topN + self.__cfg.batchSize and (time.perf_counter() - start) * 1000 >= self.__cfg.budget:
+                    break
+                # Si el último lote queda claramente por debajo del fragmento N, termina.
+                if len(scores) >= self.__cfg.topN and sorted(scores, reverse=True)[self.__cfg.topN - 1] - max(batch) >= self.__cfg.margin:
+                    break
+
+            # Ordena los fragmentos puntuados (los no puntuados se descartan).
+            order:List[int] = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+            # Retorna los N mejores fragmentos.
+            return [context[i].model_copy(update={'score': scores[i]}) for i in order[:self.__cfg.topN]]
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"CrossEncoderReranker.rerank() -> [{type(e).__name__}] No se pudo reordenar el contexto. Trace: {e}")
\ No newline at end of file
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: retrieval_cache.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la caché de resultados de
+    recuperación.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+# Librerías externas
+
+# Librerías internas
+from core.rag.embedding.query_cache import normalize_query
+from model.context import ContextDTO
+from model.measure import CacheStatsDTO
+
+
+# ---- CLASES ---- #
+class RetrievalCache:
+    """
+    Caché LRU de resultados de recuperación indexada por (consulta normalizada, topK,
+    generación del índice). Al cambiar la generación (el almacén se ha modificado) se
+    descartan todas las entradas, por lo que nunca se devuelven fragmentos obsoletos.
+    La memoria se limita por número de entradas y por bytes de contenido.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, max_entries:int, max_bytes:int):
+        """
+        Inicializa la instancia.
+
+        Args:
+            max_entries (int): Número máximo de entradas.
+            max_bytes (int): Número máximo de bytes de contenido almacenados.
+        """
+        # Inicializa las propiedades.
+        self.__maxEntries:int = max_entries
+        self.__maxBytes:int = max_bytes
+        self.__entries:OrderedDict[Tuple[str, int], Tuple[int, List[ContextDTO]]] = OrderedDict()
+        self.__bytes:int = 0
+        self.__generation:int = 0
+        self.__lock:threading.Lock = threading.Lock()
+        self.__hits:int = 0
+        self.__misses:int = 0
+
+    # -- Propiedades -- #
+    @property
+    def Stats(self) -> CacheStatsDTO:
+        """
+        Retorna las estadísticas de la caché.
+
+        Returns:
+            CacheStatsDTO: Estadísticas de la caché.
+        """
+        # Retorna las estadísticas.
+        total:int = self.__hits + self.__misses
+        return CacheStatsDTO(hits=self.__hits, misses=self.__misses, size=len(self.__entries), capacity=self.__maxEntries,
+                             hitRate=(self.__hits / total) if total else 0.0)
+
+    # -- Métodos privados -- #
+    def __check_generation(self, generation:int) -> None:
+        """
+        Descarta todas las entradas si la generación del índice ha avanzado. Debe
+        invocarse con el cerrojo.
+
+        Args:
+            generation (int): Generación actual del índice.
+        """
+        # Si ha avanzado la generación, vacía la caché.
+        if generation > self.__generation:
+            self.__entries.clear()
+            self.__bytes = 0
+            self.__generation = generation
+
+    # -- Métodos públicos -- #
+    def get(self, query:str, top_k:int, generation:int) -> Optional[List[ContextDTO]]:
+        """
+        Obtiene el resultado de una consulta.
+
+        Args:
+            query (str): Consulta.
+            top_k (int): Número de fragmentos solicitados.
+            generation (int): Generación actual del índice.
+        Returns:
+            Optional[List[ContextDTO]]: Contexto almacenado o None si no está en caché.
+        """
+        # Bloquea la caché.
+        with self.__lock:
+            # Descarta las entradas obsoletas.
+            self.__check_generation(generation=generation)
+            # Obtiene la entrada.
+            key:Tuple[str, int] = (normalize_query(query=query), top_k)
+            entry:Optional[Tuple[int, List[ContextDTO]]] = self.__entries.get(key, None)
+
+            # Si no existe.
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            # Marca la entrada como la más reciente.
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            # Retorna una copia del contexto.
+            return [context.model_copy() for context in entry[1]]
+
+    def put(self, query:str, top_k:int, generation:int, context:List[ContextDTO]) -> None:
+        """
+        Almacena el resultado de una consulta. Si la generación es anterior a la actual
+        (el almacén se modificó durante la búsqueda), no se almacena.
+
+        Args:
+            query (str): Consulta.
+            top_k (int): Número de fragmentos solicitados.
+            generation (int): Generación del índice leída antes de la búsqueda.
+            context (List[ContextDTO]): Contexto obtenido.
+        """
+        # Obtiene el tamaño de la entrada.
+        size:int = sum(len(item.content.encode('utf-8')) + len(item.sourceDir.encode('utf-8')) for item in context)
+
+        # Bloquea la caché.
+        with self.__lock:
+            # Descarta las entradas obsoletas.
+            self.__check_generation(generation=generation)
+            # Comprueba si el resultado es obsoleto o no cabe en la caché.
+            if generation < self.__generation or size > self.__maxBytes:
+                return
+
+            # Reemplaza la entrada si ya existía.
+            key:Tuple[str, int] = (normalize_query(query=query), top_k)
+            previous:Optional[Tuple[int, List[ContextDTO]]] = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__bytes -= previous[0]
+
+            # Almacena la entrada como la más reciente.
+            self.__entries[key] = (size, [item.model_copy() for item in context])
+            self.__bytes += size
+
+            # Expulsa las entradas menos usadas hasta respetar los límites.
+            while len(self.__entries) > self.__maxEntries or self.__bytes > self.__maxBytes:
+                __, (evicted, __) = self.__entries.popitem(last=False)
+                self.__bytes -= evicted
\ No newline at end of file
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: selection.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con la selección del contexto
+    que se añade al prompt.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+from typing import List, Tuple
+# Librerías externas
+
+# Librerías internas
+from core.rag.embedding.batcher import estimate_tokens
+from model.context import ContextDTO
+from model.measure import SelectionDataDTO
+from config.schema.rag import SelectionConfig
+
+
+# ---- FUNCIONES ---- #
+def find_gap(scores:List[float], ratio:float) -> int:
+    """
+    Obtiene la posición del mayor salto entre puntuaciones consecutivas si ocupa al menos
+    la fracción dada del rango de puntuaciones. Al ser relativo al rango, no depende de la
+    escala de puntuación.
+
+    Args:
+        scores (List[float]): Puntuaciones, de mayor a menor.
+        ratio (float): Fracción mínima del rango que debe ocupar el salto.
+    Returns:
+        int: Número de fragmentos anteriores al salto, o el total si no hay salto.
+    """
+    # Con menos de tres puntuaciones (o todas iguales) no hay salto significativo.
+    spread:float = scores[0] - scores[-1] if scores else 0.0
+    if len(scores) < 3 or spread <= 0:
+        return len(scores)
+
+    # Obtiene el mayor salto.
+    gaps:List[float] = [scores[i] - scores[i + 1] for i in range(len(scores) - 1)]
+    best:int = max(range(len(gaps)), key=gaps.__getitem__)
+    # Retorna la posición del corte si el salto es suficiente.
+    return best + 1 if gaps[best] >= ratio * spread else len(scores)
+
+
+# ---- CLASES ---- #
+class ContextSelector:
+    """
+    Selecciona el contexto que se añade al prompt: descarta los fragmentos por debajo de
+    la similitud densa mínima, corta en el mayor salto de puntuación y limita el número
+    de tokens. Siempre se conserva el mínimo de fragmentos indicado (si se han recuperado).
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, selection_cfg:SelectionConfig):
+        """
+        Inicializa la instancia.
+
+        Args:
+            selection_cfg (SelectionConfig): Configuración de la selección.
+        """
+        # Inicializa las propiedades.
+        self.__cfg:SelectionConfig = selection_cfg
+
+    # -- Métodos públicos -- #
+    def select(self, context:List[ContextDTO]) -> Tuple[List[ContextDTO], SelectionDataDTO]:
+        """
+        Selecciona el contexto.
+
+        Args:
+            context (List[ContextDTO]): Contexto recuperado, de mayor a menor relevancia.
+        Returns:
+            Tuple[List[ContextDTO], SelectionDataDTO]: Contexto seleccionado y medidas de
+                la selección.
+        """
+        # Número mínimo de fragmentos que se conservan.
+        minimum:int = min(self.__cfg.minChunks, len(context))
+
+        # Descarta los fragmentos cuya similitud densa no alcanza el mínimo. La similitud
+        # no depende de la fusión ni de la reordenación; los fragmentos sin ella (solo
+        # léxicos) no se descartan. Si quedan menos del mínimo, se conservan los primeros.
+        kept:List[ContextDTO] = context
+        if self.__cfg.minScore is not None:
+            kept = [c for c in context if c.denseScore is None or c.denseScore >= self.__cfg.minScore]
+            if len(kept) < minimum:
+                kept = context[:minimum]
+        byScore:int = len(context) - len(kept)
+
+        # Corta en el mayor salto de puntuación.
+        cut:int = max(minimum, find_gap(scores=[c.score for c in kept], ratio=self.__cfg.gapRatio))
+        byGap:int = len(kept) - cut
+        kept = kept[:cut]
+
+        # Conserva los fragmentos mientras no se supere el máximo de tokens.
+        tokens:int = 0
+        count:int = 0
+        for c in kept:
+            size:int = estimate_tokens(text=c.content)
+            if count >= minimum and tokens + size > self.__cfg.maxTokens:
+                break
+            tokens += size
+            count += 1
+        byBudget:int = len(kept) - count
+        kept = kept[:count]
+
+        # Retorna el contexto y las medidas.
+        return kept, SelectionDataDTO(
+            candidates=len(context),
+            kept=len(kept),
+            droppedByScore=byScore,
+            droppedByGap=byGap,
+            droppedByBudget=byBudget,
+            tokens=tokens
+        )
\ No newline at end of file
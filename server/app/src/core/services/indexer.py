@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: indexer.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el indexador de documentos
+    en segundo plano. Vigila el directorio de documentos y actualiza los embeddings de
+    los ficheros modificados fuera del flujo de las peticiones.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import threading
+from pathlib import Path
+from typing import List, Optional
+# Librerías externas
+
+# Librerías internas
+from core.services.rag import RagService
+from config.schema.rag import IndexerConfig
+from utils import console
+
+
+# ---- CLASES ---- #
+class IndexerService:
+    """
+    Proporciona un indexador en segundo plano. Emplea inotify (mediante `watchfiles`) y,
+    si no está disponible, sondea periódicamente el directorio.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, indexer_cfg:IndexerConfig, rag_service:RagService):
+        """
+        Inicializa la instancia.
+
+        Args:
+            indexer_cfg (IndexerConfig): Configuración del indexador.
+            rag_service (RagService): Servicio de RAG al que se envían los cambios.
+        """
+        # Inicializa las propiedades.
+        self.__cfg:IndexerConfig = indexer_cfg
+        self.__ragService:RagService = rag_service
+        self.__docPath:Path = rag_service.DocPath.resolve()
+        self.__stopEvent:threading.Event = threading.Event()
+        self.__thread:Optional[threading.Thread] = None
+
+    # -- Propiedades -- #
+    @property
+    def IsRunning(self) -> bool:
+        """
+        Retorna si el indexador está en ejecución.
+
+        Returns:
+            bool: True si está en ejecución y False en otro caso.
+        """
+        # Retorna si el hilo está vivo.
+        return self.__thread is not None and self.__thread.is_alive()
+
+    # -- Métodos privados -- #
+    def __update(self, paths:List[str]) -> None:
+        """
+        Envía las rutas modificadas al servicio de RAG. Los errores no detienen el indexador.
+
+        Args:
+            paths (List[str]): Rutas modificadas.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Actualiza los embeddings.
+            self.__ragService.update_files(paths=paths)
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Imprime el aviso.
+            console.print_message(message=f"IndexerService.__update() -> {e}", type=console.MessageType.WARNING)
+
+    def __watch(self) -> None:
+        """
+        Vigila el directorio con inotify. Los cambios se agrupan hasta que pasan `debounce`
+        ms sin cambios o `batchWindow` ms desde el primero.
+
+        Raises:
+            ImportError: Si `watchfiles` no está disponible.
+            OSError: Si no se puede vigilar el directorio.
+        """
+        # Importa watchfiles (dependencia opcional).
+        from watchfiles import watch
+
+        # Para cada grupo de cambios.
+        for changes in watch(self.__docPath, debounce=self.__cfg.batchWindow, step=self.__cfg.debounce,
+                             stop_event=self.__stopEvent, raise_interrupt=False):
+            # Actualiza las rutas modificadas.
+            self.__update(paths=sorted({path for __, path in changes}))
+
+    def __poll(self) -> None:
+        """
+        Sondea periódicamente el directorio. Cada sondeo se reduce a un `stat()` por
+        fichero gracias al manifiesto de ingesta.
+        """
+        # Mientras no se detenga el indexador.
+        while not self.__stopEvent.wait(timeout=self.__cfg.pollInterval / 1000):
+            # Actualiza el directorio completo.
+            self.__update(paths=[str(self.__docPath)])
+
+    def __run(self) -> None:
+        """
+        Bucle principal del indexador.
+        """
+        # Try-Except para usar el sondeo si inotify no está disponible.
+        try:
+            # Vigila el directorio.
+            self.__watch()
+
+        # Si no se puede vigilar el directorio.
+        except Exception as e:
+            # Comprueba si se ha detenido.
+            if self.__stopEvent.is_set():
+                return
+            # Imprime el aviso.
+            console.print_message(message=f"IndexerService.__run() -> [{type(e).__name__}] inotify no disponible, se sondeará el directorio. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+            # Sondea el directorio.
+            self.__poll()
+
+    # -- Métodos públicos -- #
+    def start(self) -> None:
+        """
+        Inicia el indexador en un hilo en segundo plano.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Comprueba si está deshabilitado o ya en ejecución.
+            if not self.__cfg.enabled or self.IsRunning:
+                return
+
+            # Crea e inicia el hilo.
+            self.__stopEvent.clear()
+            self.__thread = threading.Thread(target=self.__run, name='indexer', daemon=True)
+            self.__thread.start()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"IndexerService.start() -> [{type(e).__name__}] No se pudo iniciar el indexador. Trace: {e}")
+
+    def stop(self, timeout:float=5.0) -> None:
+        """
+        Detiene el indexador.
+
+        Args:
+            timeout (float): Tiempo máximo (s) de espera a que finalice el hilo.
+        """
+        # Señala la parada.
+        self.__stopEvent.set()
+
+        # Espera a que finalice el hilo.
+        if self.__thread is not None:
+            self.__thread.join(timeout=timeout)
+            self.__thread = None
\ No newline at end of file
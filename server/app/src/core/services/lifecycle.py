@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: lifecycle.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene clases y funciones relacionadas con el ciclo de vida del modelo
+    en Ollama: carga, renovación del keep_alive, vigilancia de su residencia y descarga.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import re
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+# Librerías externas
+import requests
+# Librerías internas
+from core.services.ollama import OllamaService
+from model.measure import LoadEventDTO, ModelResidencyDTO
+from config.schema.ollama import LifecycleConfig
+from utils.file.csv import save_in_csv
+from utils import console
+
+
+# ---- FUNCIONES ---- #
+def parse_expiry(expires_at:str) -> float:
+    """
+    Retorna el tiempo que falta hasta la expiración indicada por Ollama. Ollama envía
+    hasta nueve decimales en los segundos, que se recortan a microsegundos.
+
+    Args:
+        expires_at (str): Fecha de expiración (ISO 8601).
+    Returns:
+        float: Tiempo (s) hasta la expiración, o 0 si no se puede interpretar.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Recorta los decimales y obtiene la fecha.
+        expiry:datetime = datetime.fromisoformat(re.sub(r'(\.\d{6})\d+', r'\1', expires_at))
+        # Retorna el tiempo restante.
+        return expiry.timestamp() - time.time()
+
+    # Si no se puede interpretar.
+    except Exception:
+        return 0.0
+
+
+def seconds_until(hour:str, now:datetime) -> float:
+    """
+    Retorna el tiempo que falta hasta la próxima vez que el reloj marque la hora dada.
+
+    Args:
+        hour (str): Hora ('HH:MM').
+        now (datetime): Fecha y hora actual.
+    Returns:
+        float: Tiempo (s) hasta la hora, entre 0 y un día.
+    """
+    # Obtiene la hora de hoy.
+    hours, minutes = (int(part) for part in hour.split(':'))
+    target:datetime = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    # Retorna el tiempo restante (si ya ha pasado, hasta la de mañana).
+    return (target - now).total_seconds() % 86400
+
+
+def is_timeout(error:BaseException) -> bool:
+    """
+    Comprueba si el error procede de un tiempo máximo agotado en una petición. Los
+    servicios envuelven los errores en un OSError, por lo que se recorre la cadena de
+    excepciones.
+
+    Args:
+        error (BaseException): Error a comprobar.
+    Returns:
+        bool: True si alguna excepción de la cadena es `requests.Timeout`.
+    """
+    # Recorre la cadena de excepciones.
+    while error is not None:
+        if isinstance(error, requests.Timeout):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+# ---- CLASES ---- #
+class ModelLifecycleService:
+    """
+    Gestiona el ciclo de vida del modelo de Ollama. Carga el modelo al iniciar y, en
+    segundo plano, consulta periódicamente su residencia (/api/ps): lo vuelve a cargar
+    si Ollama lo ha descargado, renueva su keep_alive antes de que expire, lo carga antes
+    de las horas con tráfico previsto y lo descarga tras un tiempo sin peticiones. Así
+    las peticiones no pagan la carga del modelo. Cada carga, renovación o descarga se
+    almacena como evento con su duración.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, lifecycle_cfg:LifecycleConfig, ollama_service:OllamaService):
+        """
+        Inicializa la instancia.
+
+        Args:
+            lifecycle_cfg (LifecycleConfig): Configuración del ciclo de vida.
+            ollama_service (OllamaService): Servicio de Ollama que ejecuta el modelo.
+        """
+        # Inicializa las propiedades.
+        self.__cfg:LifecycleConfig = lifecycle_cfg
+        self.__ollama:OllamaService = ollama_service
+        self.__tag:str = ollama_service.Model.tag
+        self.__measureFilePath:Path = Path(os.path.join('.server', 'etc', 'measure', f"{self.__tag}_lifecycle.csv"))
+        self.__residency:ModelResidencyDTO = ModelResidencyDTO(tag=self.__tag)
+        self.__lastRequest:float = time.time()
+        self.__lock:threading.Lock = threading.Lock()
+        self.__stopEvent:threading.Event = threading.Event()
+        self.__thread:Optional[threading.Thread] = None
+
+    # -- Propiedades -- #
+    @property
+    def IsRunning(self) -> bool:
+        """
+        Retorna si la vigilancia está en ejecución.
+
+        Returns:
+            bool: True si está en ejecución y False en otro caso.
+        """
+        # Retorna si el hilo está vivo.
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def Residency(self) -> ModelResidencyDTO:
+        """
+        Retorna el último estado de residencia del modelo.
+
+        Returns:
+            ModelResidencyDTO: Estado de residencia.
+        """
+        # Retorna una copia del estado.
+        with self.__lock:
+            return self.__residency.model_copy()
+
+    # -- Métodos privados -- #
+    def __poll(self) -> Optional[Dict[str,any]]:
+        """
+        Consulta los modelos cargados y actualiza el estado de residencia.
+
+        Returns:
+            Optional[Dict[str,any]]: Datos del modelo si está cargado, o None.
+        """
+        # Busca el modelo entre los cargados.
+        running:List[Dict[str,any]] = self.__ollama.list_running_models()
+        state:Optional[Dict[str,any]] = next((m for m in running if self.__tag in (m.get('name'), m.get('model'))), None)
+
+        # Actualiza el estado de residencia.
+        with self.__lock:
+            self.__residency.resident = state is not None
+            self.__residency.size = state.get('size', 0) if state else 0
+            self.__residency.sizeVram = state.get('size_vram', 0) if state else 0
+            self.__residency.expiresIn = parse_expiry(expires_at=state.get('expires_at', '')) if state else 0.0
+        # Retorna los datos del modelo.
+        return state
+
+    def __record(self, event:str, reason:str, duration:float) -> None:
+        """
+        Almacena un evento del ciclo de vida con el estado del modelo tras él.
+
+        Args:
+            event (str): Evento (LOAD, REFRESH o UNLOAD).
+            reason (str): Motivo del evento.
+            duration (float): Tiempo (s) empleado en la petición.
+        """
+        # Obtiene el estado del modelo.
+        self.__poll()
+        residency:ModelResidencyDTO = self.Residency
+
+        # Almacena el evento.
+        save_in_csv(file_path=self.__measureFilePath, data=LoadEventDTO(
+            timestamp=datetime.now().isoformat(timespec='seconds'),
+            event=event,
+            reason=reason,
+            loadDuration=duration,
+            size=residency.size,
+            sizeVram=residency.sizeVram
+        ))
+
+    def __load(self, event:str, reason:str) -> None:
+        """
+        Carga el modelo (o renueva su keep_alive si ya está cargado).
+
+        Args:
+            event (str): Evento (LOAD o REFRESH).
+            reason (str): Motivo del evento.
+        """
+        # Carga el modelo y mide el tiempo empleado.
+        start:float = time.perf_counter()
+        self.__ollama.load_model(model_tag=self.__tag)
+        duration:float = time.perf_counter() - start
+
+        # Actualiza las medidas de carga.
+        if event == 'LOAD':
+            with self.__lock:
+                self.__residency.loads += 1
+                self.__residency.lastLoadDuration = duration
+        # Almacena el evento.
+        self.__record(event=event, reason=reason, duration=duration)
+
+    def __expects_traffic(self) -> bool:
+        """
+        Comprueba si se prevé tráfico dentro del tiempo de antelación.
+
+        Returns:
+            bool: True si alguna hora prevista está dentro de la antelación.
+        """
+        # Comprueba cada hora prevista.
+        now:datetime = datetime.now()
+        return any(seconds_until(hour=hour, now=now) <= self.__cfg.prewarmLead for hour in self.__cfg.prewarm)
+
+    def __step(self) -> None:
+        """
+        Consulta la residencia del modelo y decide si cargarlo, renovarlo o descargarlo.
+        Si Ollama no responde a tiempo, se omite la comprobación hasta la siguiente.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene el estado del modelo y de las peticiones.
+            state:Optional[Dict[str,any]] = self.__poll()
+            prewarm:bool = self.__expects_traffic()
+            idle:bool = self.__cfg.idleTimeout > 0 and time.time() - self.__lastRequest >= self.__cfg.idleTimeout
+
+            # Si no está cargado, lo carga si hay (o se prevé) tráfico.
+            if state is None:
+                if prewarm:
+                    self.__load(event='LOAD', reason='PREWARM')
+                elif not idle:
+                    self.__load(event='LOAD', reason='EVICTED')
+            # Si está inactivo y no se prevé tráfico, lo descarga.
+            elif idle and not prewarm:
+                start:float = time.perf_counter()
+                self.__ollama.unload_model(model_tag=self.__tag)
+                self.__record(event='UNLOAD', reason='IDLE', duration=time.perf_counter() - start)
+            # Si va a expirar, renueva su keep_alive.
+            elif self.Residency.expiresIn < self.__cfg.refreshMargin:
+                self.__load(event='REFRESH', reason='KEEPALIVE')
+
+        # Si se ha agotado el tiempo de alguna petición.
+        except OSError as e:
+            # Si es otro error, lo propaga.
+            if not is_timeout(error=e):
+                raise
+            # Imprime el aviso.
+            console.print_message(message=f"ModelLifecycleService.__step() -> Ollama no ha respondido a tiempo, se reintentará. Trace: {e}",
+                                  type=console.MessageType.WARNING)
+
+    def __run(self) -> None:
+        """
+        Bucle de vigilancia. Los errores no detienen la vigilancia.
+        """
+        # Mientras no se detenga la vigilancia.
+        while not self.__stopEvent.wait(timeout=self.__cfg.pollInterval):
+            # Try-Except para manejo de errores.
+            try:
+                # Comprueba el modelo.
+                self.__step()
+
+            # Si ocurre algún error.
+            except Exception as e:
+                # Imprime el aviso.
+                console.print_message(message=f"ModelLifecycleService.__run() -> [{type(e).__name__}] No se pudo comprobar el modelo. Trace: {e}",
+                                      type=console.MessageType.WARNING)
+
+    # -- Métodos públicos -- #
+    def preload(self) -> None:
+        """
+        Carga el modelo al iniciar el servidor.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Carga el modelo.
+            self.__load(event='LOAD', reason='STARTUP')
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"ModelLifecycleService.preload() -> [{type(e).__name__}] No se pudo cargar el modelo. Trace: {e}")
+
+    def notify_request(self) -> None:
+        """
+        Registra una petición al modelo, lo que lo mantiene activo.
+        """
+        # Actualiza la última petición.
+        self.__lastRequest = time.time()
+
+    def start(self) -> None:
+        """
+        Inicia la vigilancia del modelo en un hilo en segundo plano.
+
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Comprueba si está deshabilitada o ya en ejecución.
+            if not self.__cfg.enabled or self.IsRunning:
+                return
+
+            # Crea e inicia el hilo.
+            self.__stopEvent.clear()
+            self.__thread = threading.Thread(target=self.__run, name='lifecycle', daemon=True)
+            self.__thread.start()
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"ModelLifecycleService.start() -> [{type(e).__name__}] No se pudo iniciar la vigilancia del modelo. Trace: {e}")
+
+    def stop(self, timeout:float=5.0) -> None:
+        """
+        Detiene la vigilancia del modelo.
+
+        Args:
+            timeout (float): Tiempo máximo (s) de espera a que finalice el hilo.
+        """
+        # Señala la parada.
+        self.__stopEvent.set()
+
+        # Espera a que finalice el hilo.
+        if self.__thread is not None:
+            self.__thread.join(timeout=timeout)
+            self.__thread = None
\ No newline at end of file
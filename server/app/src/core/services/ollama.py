@@ -18,15 +18,16 @@
 # Librerías estándar
 import os
 import json
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from pathlib import Path
 # Librerías externas
+import httpx
 import requests
 from requests import Response
 # Librerías internas
 from model.measure import OllamaModelDataDTO
 from utils.file.csv import save_in_csv
-from config.schema.ollama import ServiceConfig
+from config.schema.ollama import ServiceConfig, ClientConfig
 from config.schema.common import BaseModelConfig
 
 
@@ -47,6 +48,9 @@ class OllamaService:
         self.__name:str = service_cfg.name
         self.__baseUrl:str = f"http://{service_cfg.host.ip}:{service_cfg.host.port}"
         self.__model:BaseModelConfig = service_cfg.model
+        self.__keepAlive:str = service_cfg.keepAlive
+        # Tiempos máximos (s) de conexión y lectura de las peticiones de carga y estado.
+        self.__timeout:Tuple[float, float] = (service_cfg.client.connectTimeout, service_cfg.client.readTimeout)
         self.__measureFilePath:Path = Path(os.path.join('.server', 'etc', 'measure', f"{self.__model.tag}.csv"))
     
     # -- Propiedades -- #
@@ -187,37 +191,93 @@ class OllamaService:
             # Lanza una excepción.
             raise OSError(f"OllamaService.install_model() -> [{type(e).__name__}] No se ha podido instalar el modelo. Trace: {e}")
     
-    def load_model(self, model_tag:str) -> None:
+    def load_model(self, model_tag:str, keep_alive:Optional[str]=None) -> Dict[str,any]:
         """
-        Carga el modelo en en GPU.
+        Carga el modelo en GPU. Una petición a /api/generate sin prompt solo carga el
+        modelo, y `keep_alive` indica cuánto tiempo permanece cargado. Si ya estaba
+        cargado, solo se renueva su expiración.
         
         Args:
             model_tag (str): Etiqueta del modelo.
+            keep_alive (Optional[str]): Tiempo que el modelo permanece cargado. Si no se
+                indica, el del servicio.
         Raises:
             OSError: En caso de que ocurra algún error.
+        Returns:
+            Dict[str,any]: Respuesta de la API de Ollama.
         """
         # Try-Except para manejo de errores.
         try:
             # Genera la URL para la petición.
-            url:str = f"{self.__baseUrl}/api/chat"
+            url:str = f"{self.__baseUrl}/api/generate"
             
             # Genera las cabeceras y los datos.
             headers:Dict = {'Content-Type':'application/json'}      # Cabeceras de la consulta.
             data:Dict = {
-                'prompt': '',
                 'model':model_tag,
+                'keep_alive': keep_alive if keep_alive is not None else self.__keepAlive,
                 'stream': False
             }
             
             # Obtiene la respuesta de la API de Ollama.
-            response:Response = requests.post(url=url, headers=headers, data=json.dumps(data))
+            response:Response = requests.post(url=url, headers=headers, data=json.dumps(data), timeout=self.__timeout)
             # Lanza una excepción en caso de que no haya sido correcta.
             response.raise_for_status()
+            
+            # Retorna la respuesta.
+            return json.loads(response.text)
 
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"OllamaService.start_model() -> [{type(e).__name__}] No se ha podido cargar el modelo. Trace: {e}")
+            raise OSError(f"OllamaService.load_model() -> [{type(e).__name__}] No se ha podido cargar el modelo. Trace: {e}")
+    
+    def unload_model(self, model_tag:str) -> None:
+        """
+        Descarga el modelo de la GPU.
+        
+        Args:
+            model_tag (str): Etiqueta del modelo.
+        Raises:
+            OSError: En caso de que ocurra algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Carga el modelo con un keep_alive nulo, lo que lo descarga.
+            self.load_model(model_tag=model_tag, keep_alive='0')
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"OllamaService.unload_model() -> [{type(e).__name__}] No se ha podido descargar el modelo. Trace: {e}")
+    
+    def list_running_models(self) -> List[Dict[str,any]]:
+        """
+        Lista los modelos cargados en memoria (/api/ps), con su tamaño, la parte en GPU
+        (`size_vram`) y su expiración (`expires_at`).
+        
+        Raises:
+            OSError: En caso de que haya alguna excepción.
+        Returns:
+            List[Dict[str,any]]: Listado con los modelos cargados.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera la URL para la petición.
+            url:str = f"{self.__baseUrl}/api/ps"
+
+            # Obtiene la respuesta de la API de Ollama.
+            response:Response = requests.get(url=url, timeout=self.__timeout)
+            # Lanza una excepción en caso de que no haya sido correcta.
+            response.raise_for_status()
+            
+            # Retorna los modelos cargados.
+            return response.json().get("models", [])
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"OllamaService.list_running_models() -> [{type(e).__name__}] No se han podido obtener los modelos cargados. Trace: {e}")
         
     def get_response(self, prompt:str) -> str:
         """
@@ -270,4 +330,331 @@ class OllamaService:
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"OllamaService.get_response() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
\ No newline at end of file
+            raise OSError(f"OllamaService.get_response() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
+    
+    def chat(self, messages:List[Dict[str,str]]) -> str:
+        """
+        Envía los mensajes de la conversación al modelo (/api/chat) y genera la respuesta.
+        
+        Args:
+            messages (List[Dict[str,str]]): Mensajes de la conversación (rol y contenido).
+        Raises:
+            OSError: En caso de que ocurra algún error.
+        Returns:
+            str: Respuesta generada por el modelo.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera la URL para la petición.
+            url:str = f"{self.__baseUrl}/api/chat"
+            
+            # Genera las cabeceras y los datos.
+            headers:Dict = {'Content-Type':'application/json'}      # Cabeceras de la consulta.
+            data:Dict = {
+                'messages': messages,
+                'model':self.__model.tag,
+                'stream': False,
+                'keep_alive': self.__keepAlive
+            }
+            
+            # Obtiene la respuesta de la API de Ollama.
+            response:Response = requests.post(url=url, headers=headers, data=json.dumps(data))
+            # Lanza una excepción en caso de que no haya sido correcta.
+            response.raise_for_status()
+            
+            # Retorna la respuesta generada.
+            return json.loads(response.text)['message']['content']
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"OllamaService.chat() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
+
+
+class AsyncOllamaService:
+    """
+    Proporciona los métodos asíncronos de interacción con la API de Ollama. Emplea un
+    único cliente HTTP/1.1 con un conjunto de conexiones persistentes (keep-alive) y
+    tiempos máximos configurables, de modo que las generaciones no bloquean el bucle de
+    eventos del servidor ni abren una conexión por petición.
+    """
+    # -- Métodos por defecto -- #
+    def __init__(self, service_cfg:ServiceConfig):
+        """
+        Inicializa la instancia.
+        
+        Args:
+            service_cfg (ServiceConfig): Configuración del servicio.
+        """
+        # Inicializa las propiedades.
+        client_cfg:ClientConfig = service_cfg.client
+        self.__name:str = service_cfg.name
+        self.__model:BaseModelConfig = service_cfg.model
+        self.__client:httpx.AsyncClient = httpx.AsyncClient(
+            base_url=f"http://{service_cfg.host.ip}:{service_cfg.host.port}",
+            headers={'Content-Type':'application/json'},
+            limits=httpx.Limits(max_connections=client_cfg.maxConnections,
+                                max_keepalive_connections=client_cfg.maxKeepalive,
+                                keepalive_expiry=client_cfg.keepaliveExpiry),
+            timeout=httpx.Timeout(connect=client_cfg.connectTimeout, read=client_cfg.readTimeout,
+                                  write=client_cfg.connectTimeout, pool=client_cfg.poolTimeout)
+        )
+        self.__keepAlive:str = service_cfg.keepAlive
+        self.__measureFilePath:Path = Path(os.path.join('.server', 'etc', 'measure', f"{self.__model.tag}.csv"))
+    
+    # -- Propiedades -- #
+    @property
+    def Name(self) -> str:
+        """
+        Retorna el nombre del servicio.
+        
+        Returns:
+            str: Nombre del servicio.
+        """
+        return self.__name
+    
+    @property
+    def Model(self) -> BaseModelConfig:
+        """
+        Retorna el modelo del servicio de Ollama.
+        
+        Returns:
+            BaseModelConfig: Etiqueta del modelo de Ollama.
+        """
+        # Retorna el modelo.
+        return self.__model
+
+    # -- Métodos privados -- #
+    def __save_measure(self, json_data:Dict[str,any]) -> None:
+        """
+        Almacena las medidas de una generación. Si Ollama reutiliza el prefijo del prompt
+        de su caché, solo cuenta (y evalúa) los tokens nuevos.
+        
+        Args:
+            json_data (Dict[str,any]): Respuesta (o último objeto) de la API de Ollama.
+        """
+        # Almacena los parámetros obtenidos.
+        evalDuration:int = json_data.get('eval_duration', 0)
+        ollamaModelData:OllamaModelDataDTO = OllamaModelDataDTO(
+            totalDuration=(json_data.get('total_duration', 0) / 1_000_000_000),
+            loadDuration=(json_data.get('load_duration', 0) / 1_000_000_000),
+            promptEvalCount=json_data.get('prompt_eval_count', 0),
+            promptEvalDuration=(json_data.get('prompt_eval_duration', 0) / 1_000_000_000),
+            evalCount=json_data.get('eval_count', 0),
+            evalDuration=(evalDuration / 1_000_000_000),
+            speed=((json_data.get('eval_count', 0) * 1_000_000_000) / evalDuration) if evalDuration else 0.0
+        )
+        # Almacena el dato en un csv.
+        save_in_csv(file_path=self.__measureFilePath, data=ollamaModelData)
+
+    # -- Métodos públicos -- #
+    async def check_running(self) -> bool:
+        """
+        Comprueba si el servicio de Ollama está en ejecución.
+        
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            bool: True si esta en ejecución y false en otro caso.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene la respuesta de la API de Ollama.
+            response:httpx.Response = await self.__client.get(url='/api/tags')
+            # Lanza una excepción en caso de que no haya sido correcta.
+            response.raise_for_status()
+            
+            # Retorna si ha salido todo bien.
+            return True
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"AsyncOllamaService.check_running() -> [{type(e).__name__}] No se ha podido comprobar si el servicio de Ollama está en ejecución. Trace: {e}")
+    
+    async def list_installed_models(self) -> List[str]:
+        """
+        Lista los modelos instalados.
+        
+        Raises:
+            OSError: En caso de que haya alguna excepción.
+        Returns:
+            List[str]: Listado con los modelos instalados.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Obtiene la respuesta de la API de Ollama.
+            response:httpx.Response = await self.__client.get(url='/api/tags')
+            # Lanza una excepción en caso de que no haya sido correcta.
+            response.raise_for_status()
+            
+            # Retorna los modelos instalados.
+            return response.json().get("models", [])
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"AsyncOllamaService.list_installed_models() -> [{type(e).__name__}] No se han podido obtener los modelos instalados. Trace: {e}")
+    
+    async def get_response(self, prompt:str) -> str:
+        """
+        Envía el prompt al modelo y genera la respuesta sin bloquear el bucle de eventos.
+        
+        Args:
+            prompt (str): Prompt a enviar al modelo.
+        Raises:
+            OSError: En caso de que ocurra algún error.
+        Returns:
+            str: Respuesta generada por el modelo.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera los datos.
+            data:Dict = {
+                'prompt': prompt,
+                'model':self.__model.tag,
+                'stream': False,
+                'keep_alive': self.__keepAlive
+            }
+            
+            # Obtiene la respuesta de la API de Ollama.
+            response:httpx.Response = await self.__client.post(url='/api/generate', json=data)
+            # Lanza una excepción en caso de que no haya sido correcta.
+            response.raise_for_status()
+            
+            # Almacena las medidas y retorna la respuesta generada.
+            jsonData:Dict[str,any] = response.json()
+            self.__save_measure(json_data=jsonData)
+            return jsonData['response']
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"AsyncOllamaService.get_response() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
+    
+    async def stream_response(self, prompt:str) -> AsyncIterator[Dict[str,any]]:
+        """
+        Envía el prompt al modelo y retorna la respuesta a medida que se genera. Ollama
+        envía un objeto JSON por línea: los intermedios contienen un fragmento de la
+        respuesta y el último (`done`) las medidas de la generación.
+        
+        Args:
+            prompt (str): Prompt a enviar al modelo.
+        Raises:
+            OSError: En caso de que ocurra algún error.
+        Returns:
+            AsyncIterator[Dict[str,any]]: Objetos JSON enviados por Ollama.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera los datos.
+            data:Dict = {
+                'prompt': prompt,
+                'model':self.__model.tag,
+                'stream': True,
+                'keep_alive': self.__keepAlive
+            }
+            
+            # Abre la respuesta de la API de Ollama.
+            async with self.__client.stream(method='POST', url='/api/generate', json=data) as response:
+                # Lanza una excepción en caso de que no haya sido correcta.
+                response.raise_for_status()
+                
+                # Retorna cada línea no vacía.
+                async for line in response.aiter_lines():
+                    if line:
+                        chunk:Dict[str,any] = json.loads(line)
+                        # Ollama puede notificar un error dentro de la respuesta (con estado 200).
+                        if 'error' in chunk:
+                            raise OSError(f"Ollama ha notificado un error: {chunk['error']}")
+                        yield chunk
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"AsyncOllamaService.stream_response() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
+    
+    async def chat(self, messages:List[Dict[str,str]]) -> str:
+        """
+        Envía los mensajes de la conversación al modelo (/api/chat) y genera la respuesta.
+        
+        Args:
+            messages (List[Dict[str,str]]): Mensajes de la conversación (rol y contenido).
+        Raises:
+            OSError: En caso de que ocurra algún error.
+        Returns:
+            str: Respuesta generada por el modelo.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera los datos.
+            data:Dict = {
+                'messages': messages,
+                'model':self.__model.tag,
+                'stream': False,
+                'keep_alive': self.__keepAlive
+            }
+            
+            # Obtiene la respuesta de la API de Ollama.
+            response:httpx.Response = await self.__client.post(url='/api/chat', json=data)
+            # Lanza una excepción en caso de que no haya sido correcta.
+            response.raise_for_status()
+            
+            # Almacena las medidas y retorna la respuesta generada.
+            jsonData:Dict[str,any] = response.json()
+            self.__save_measure(json_data=jsonData)
+            return jsonData['message']['content']
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"AsyncOllamaService.chat() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
+    
+    async def stream_chat(self, messages:List[Dict[str,str]]) -> AsyncIterator[Dict[str,any]]:
+        """
+        Envía los mensajes de la conversación al modelo (/api/chat) y retorna la respuesta
+        a medida que se genera. Los objetos intermedios contienen un fragmento en
+        `message.content` y el último (`done`) las medidas de la generación.
+        
+        Args:
+            messages (List[Dict[str,str]]): Mensajes de la conversación (rol y contenido).
+        Raises:
+            OSError: En caso de que ocurra algún error.
+        Returns:
+            AsyncIterator[Dict[str,any]]: Objetos JSON enviados por Ollama.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Genera los datos.
+            data:Dict = {
+                'messages': messages,
+                'model':self.__model.tag,
+                'stream': True,
+                'keep_alive': self.__keepAlive
+            }
+            
+            # Abre la respuesta de la API de Ollama.
+            async with self.__client.stream(method='POST', url='/api/chat', json=data) as response:
+                # Lanza una excepción en caso de que no haya sido correcta.
+                response.raise_for_status()
+                
+                # Retorna cada línea no vacía.
+                async for line in response.aiter_lines():
+                    if line:
+                        chunk:Dict[str,any] = json.loads(line)
+                        # Ollama puede notificar un error dentro de la respuesta (con estado 200).
+                        if 'error' in chunk:
+                            raise OSError(f"Ollama ha notificado un error: {chunk['error']}")
+                        yield chunk
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"AsyncOllamaService.stream_chat() -> [{type(e).__name__}] No se ha podido obtener respuesta del modelo. Trace: {e}")
+    
+    async def close(self) -> None:
+        """
+        Cierra las conexiones del cliente.
+        """
+        # Cierra el cliente.
+        await self.__client.aclose()
\ No newline at end of file
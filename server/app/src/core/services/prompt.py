@@ -38,7 +38,31 @@ class PromptService:
             prompt_cfg (PromptConfig): Configuración del prompt.
         """
         # Inicializa los parámetros.
-        self.__template:Template = Environment(loader=FileSystemLoader(prompt_cfg.root)).get_template(prompt_cfg.chatPrompt)
+        env:Environment = Environment(loader=FileSystemLoader(prompt_cfg.root))
+        self.__mode:str = prompt_cfg.mode
+        # En la disposición PREFIX, el texto fijo se genera una única vez y la plantilla
+        # solo contiene las secciones variables.
+        if prompt_cfg.layout == 'PREFIX':
+            self.__prefix:str = env.get_template(prompt_cfg.chatPrefix).render()
+            self.__template:Template = env.get_template(prompt_cfg.chatSuffix)
+        else:
+            self.__prefix:str = ''
+            self.__template:Template = env.get_template(prompt_cfg.chatPrompt)
+        self.__contextTemplate:Template = env.get_template(prompt_cfg.chatContext)
+        # El mensaje de sistema no depende de la petición, se genera una única vez.
+        self.__system:str = env.get_template(prompt_cfg.chatSystem).render()
+    
+    # -- Propiedades -- #
+    @property
+    def Mode(self) -> str:
+        """
+        Retorna el modo de conversación con el modelo.
+        
+        Returns:
+            str: Modo de conversación (GENERATE o CHAT).
+        """
+        # Retorna el modo.
+        return self.__mode
     
     # -- Métodos públicos -- #
     def build_prompt(self, query:str, context:List[ContextDTO], history:List[Dict[str,str]]) -> str:
@@ -56,8 +80,8 @@ class PromptService:
         """
         # Try-Except para manejo de errores.
         try:
-            # Retorna el prompt.
-            return self.__template.render(
+            # Retorna el prompt (el prefijo fijo, si lo hay, seguido de la plantilla).
+            return self.__prefix + self.__template.render(
                 context=context,
                 history=history,
                 query=query
@@ -66,4 +90,35 @@ class PromptService:
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"PromptService.build_prompt() -> [{type(e).__name__}] No se ha podido construir el prompt. Trace: {e}")
\ No newline at end of file
+            raise OSError(f"PromptService.build_prompt() -> [{type(e).__name__}] No se ha podido construir el prompt. Trace: {e}")
+    
+    def build_messages(self, query:str, context:List[ContextDTO], history:List[Dict[str,str]]) -> List[Dict[str,str]]:
+        """
+        Construye los mensajes del modo CHAT. El orden es: sistema, historial y, por
+        último, el contexto junto a la consulta. El historial solo contiene las preguntas y
+        respuestas (no el contexto de turnos anteriores), por lo que los mensajes de una
+        petición empiezan por los de la anterior y Ollama reutiliza su caché del prompt:
+        solo se evalúan el último turno y el contexto nuevo.
+        
+        Args:
+            context (List[ContextDTO]): Listado con el contexto.
+            history (List[Dict[str,str]]): Historial del chat.
+            query (str): Consulta del usuario.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[Dict[str,str]]: Mensajes construidos.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Retorna los mensajes.
+            return [
+                {'role': 'system', 'content': self.__system},
+                *history,
+                {'role': 'user', 'content': self.__contextTemplate.render(context=context, query=query)}
+            ]
+            
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"PromptService.build_messages() -> [{type(e).__name__}] No se han podido construir los mensajes. Trace: {e}")
\ No newline at end of file
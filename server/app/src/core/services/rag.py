@@ -19,7 +19,7 @@
 import os
 import time
 from contextlib import redirect_stdout, redirect_stderr
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 # Librerías externas
 
@@ -27,10 +27,16 @@ from pathlib import Path
 import context.singleton as CtxSingleton
 from context.context_manager import ContextManager
 from model.context import ContextDTO
-from model.measure import RagModelDataDTO
+from model.response import RagStatsResponseDTO
+from model.measure import RagModelDataDTO, IngestionDataDTO, SelectionDataDTO
 from core.rag.document.base import BaseDocumentModule
+from core.rag.retrieval_cache import RetrievalCache
+from core.rag.reranker import CrossEncoderReranker
+from core.rag.selection import ContextSelector
+from core.rag.embedding import registry
 from core.rag.document.haystack_module import HaystackDocumentModule
 from core.rag.document.langchain_module import LangChainDocumentModule
+from core.rag.document.native_module import NativeDocumentModule
 from utils import hugging_face
 from utils import console
 from utils.file.csv import save_in_csv
@@ -66,6 +72,11 @@ def create_document_module(ctx:ContextManager) -> BaseDocumentModule:
             case 'LANGCHAIN':
                 # Retorna el módulo implementado con LangChain.
                 return LangChainDocumentModule(rag_cfg=cfg)
+            
+            # Si es el índice nativo.
+            case 'NATIVE':
+                # Retorna el módulo implementado con NumPy.
+                return NativeDocumentModule(rag_cfg=cfg)
 
         # Si es un framework desconocido, lanza un aexcepción.
         raise ValueError(f"El framework <{cfg.document.framework}> no se reconoce.")
@@ -105,6 +116,22 @@ class RagService:
         
         self.__documentRagModule:BaseDocumentModule = create_document_module(ctx=CtxSingleton.get_ctx())
         self.__measureFilePath:Path = Path(os.path.join('.server', 'etc', 'measure', f"{self.__model.tag.replace('/', '_')}.csv"))
+        self.__topK:int = rag_cfg.document.topK
+        self.__retrievalCache:Optional[RetrievalCache] = None
+        # Crea la caché de resultados si está habilitada.
+        if rag_cfg.retrievalCache.enabled:
+            self.__retrievalCache = RetrievalCache(max_entries=rag_cfg.retrievalCache.maxEntries, max_bytes=rag_cfg.retrievalCache.maxBytes)
+        self.__ingestionFilePath:Path = Path(os.path.join('.server', 'etc', 'measure', f"{self.__model.tag.replace('/', '_')}_ingestion.csv"))
+        self.__warmUpBatchSize:int = rag_cfg.batching.minBatchSize
+        self.__selectionFilePath:Path = Path(os.path.join('.server', 'etc', 'measure', f"{self.__model.tag.replace('/', '_')}_selection.csv"))
+        self.__selector:Optional[ContextSelector] = ContextSelector(selection_cfg=rag_cfg.selection) if rag_cfg.selection.enabled else None
+        self.__reranker:Optional[CrossEncoderReranker] = None
+        # Crea el reordenador si está habilitado, instalando antes el modelo.
+        if rag_cfg.reranker.enabled:
+            if not self.is_model_installed(model_tag=rag_cfg.reranker.tag):
+                console.print_message(f"Modelo {rag_cfg.reranker.tag} no instalado. Instalando ...", type=console.MessageType.WARNING)
+                self.install_model(model_tag=rag_cfg.reranker.tag)
+            self.__reranker = CrossEncoderReranker(model_path=Path(self.__installModelDir, rag_cfg.reranker.tag), reranker_cfg=rag_cfg.reranker)
     
     # -- Propiedades -- #
     @property
@@ -117,6 +144,76 @@ class RagService:
         """
         # Retorna la configuración del modelo.
         return self.__model
+    
+    @property
+    def DocPath(self) -> Path:
+        """
+        Retorna el directorio raiz con los documentos.
+        
+        Returns:
+            Path: Directorio raiz con los documentos.
+        """
+        # Retorna el directorio.
+        return self.__documentRagModule.DocPath
+    
+    @property
+    def Stats(self) -> RagStatsResponseDTO:
+        """
+        Retorna las estadísticas de las cachés del RAG.
+        
+        Returns:
+            RagStatsResponseDTO: Estadísticas de las cachés.
+        """
+        # Retorna las estadísticas.
+        return RagStatsResponseDTO(embeddingCache=self.__documentRagModule.EmbeddingCacheStats,
+                                   queryCache=self.__documentRagModule.QueryCacheStats,
+                                   retrievalCache=self.__retrievalCache.Stats if self.__retrievalCache else None,
+                                   generation=self.__documentRagModule.Generation)
+
+    # -- Métodos privados -- #
+    def __rerank(self, query:str, context:List[ContextDTO]) -> List[ContextDTO]:
+        """
+        Reordena el contexto con el cross-encoder (si está habilitado) y conserva los
+        mejores fragmentos.
+        
+        Args:
+            query (str): Consulta del usuario.
+            context (List[ContextDTO]): Contexto recuperado.
+        Returns:
+            List[ContextDTO]: Contexto reordenado.
+        """
+        # Si no hay reordenador, retorna el contexto.
+        if self.__reranker is None:
+            return context
+        
+        # Reordena el contexto y almacena la duración.
+        start:float = time.perf_counter()
+        context = self.__reranker.rerank(query=query, context=context)
+        save_in_csv(file_path=self.__measureFilePath, data=RagModelDataDTO(action='RERANK', duration=time.perf_counter() - start))
+        # Retorna el contexto.
+        return context
+
+    def __select(self, context:List[ContextDTO]) -> List[ContextDTO]:
+        """
+        Selecciona el contexto que se añade al prompt (si está habilitado) y almacena
+        cuántos fragmentos se han descartado.
+        
+        Args:
+            context (List[ContextDTO]): Contexto recuperado.
+        Returns:
+            List[ContextDTO]: Contexto seleccionado.
+        """
+        # Si no hay selector, retorna el contexto.
+        if self.__selector is None:
+            return context
+        
+        # Selecciona el contexto y almacena las medidas.
+        selected:List[ContextDTO]
+        data:SelectionDataDTO
+        selected, data = self.__selector.select(context=context)
+        save_in_csv(file_path=self.__selectionFilePath, data=data)
+        # Retorna el contexto.
+        return selected
 
     # -- Métodos públicos -- #
     def is_model_installed(self, model_tag:str) -> bool:
@@ -164,6 +261,24 @@ class RagService:
                 #Lanza una excepción.
                 raise OSError(f"RagService.install_model() -> [{type(e).__name__}] No se pudo instalar el modelo. Trace: {e}")
             
+    def warm_up(self) -> None:
+        """
+        Precalienta los modelos de embeddings (compartidos por la ingesta y la
+        recuperación) para que la primera consulta no pague su inicialización.
+        
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:
+            # Precalienta los modelos cargados.
+            registry.warm_up(batch_size=self.__warmUpBatchSize)
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"RagService.warm_up() -> [{type(e).__name__}] No se pudieron precalentar los modelos de embeddings. Trace: {e}")
+    
     def make_embeddings(self) -> None:
         """
         Calcula los embeddings.
@@ -176,7 +291,7 @@ class RagService:
             # Obtiene el tiempo inicial.
             start:float = time.perf_counter()
             # Calcula los embeddings.
-            self.__documentRagModule.make_embeddings()
+            ingestionData:Optional[IngestionDataDTO] = self.__documentRagModule.make_embeddings()
             # Obtiene la duración.
             duration:float = time.perf_counter() - start
             
@@ -187,15 +302,54 @@ class RagService:
             )
             # Almacena el dato en un csv.
             save_in_csv(file_path=self.__measureFilePath, data=ragModelData)
+            # Almacena el rendimiento de la ingesta si ha habido cambios.
+            if ingestionData is not None:
+                save_in_csv(file_path=self.__ingestionFilePath, data=ingestionData)
         
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
             raise OSError(f"RagService.make_embeddings() -> [{(type(e).__name__)}] No se pudieron calcular los embeddings. Trace: {e}")
     
+    def update_files(self, paths:List[str]) -> None:
+        """
+        Actualiza los embeddings de las rutas dadas (ficheros o directorios nuevos,
+        modificados o eliminados).
+        
+        Args:
+            paths (List[str]): Rutas modificadas.
+        Raises:
+            OSError: En caso de que haya algún error.
+        """
+        # Try-Except para manejo de errores.
+        try:  
+            # Obtiene el tiempo inicial.
+            start:float = time.perf_counter()
+            # Actualiza los embeddings.
+            ingestionData:Optional[IngestionDataDTO] = self.__documentRagModule.update_files(paths=paths)
+            # Obtiene la duración.
+            duration:float = time.perf_counter() - start
+            
+            # Almacena los parámetros obtenidos.
+            ragModelData:RagModelDataDTO = RagModelDataDTO(
+                action='EMBEDDING',
+                duration=duration
+            )
+            # Almacena el dato en un csv.
+            save_in_csv(file_path=self.__measureFilePath, data=ragModelData)
+            # Almacena el rendimiento de la ingesta si ha habido cambios.
+            if ingestionData is not None:
+                save_in_csv(file_path=self.__ingestionFilePath, data=ingestionData)
+        
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"RagService.update_files() -> [{(type(e).__name__)}] No se pudieron actualizar los embeddings. Trace: {e}")
+    
     def get_relevant_context(self, query:str) -> List[ContextDTO]:
         """
-        Obtiene el contexto relevante de los datos locales.
+        Obtiene el contexto relevante de los datos locales. Los resultados se almacenan
+        en caché hasta que la ingesta modifica el almacén.
         
         Args:
             query (str): Consulta del usuario. Empleada para obtener el contexto.
@@ -211,8 +365,21 @@ class RagService:
             
             # Obtiene el tiempo inicial.
             start:float = time.perf_counter()
-            # Obtiene el contexto relevante de documentos.
-            context.extend(self.__documentRagModule.get_context(query=query))
+            # Obtiene la generación del índice antes de buscar.
+            generation:int = self.__documentRagModule.Generation
+            # Obtiene el contexto de la caché.
+            cached:Optional[List[ContextDTO]] = self.__retrievalCache.get(query=query, top_k=self.__topK, generation=generation) if self.__retrievalCache else None
+            
+            # Si está en caché, lo emplea.
+            if cached is not None:
+                context.extend(cached)
+            # Si no, obtiene el contexto relevante de documentos y lo almacena.
+            else:
+                context.extend(self.__rerank(query=query, context=self.__documentRagModule.get_context(query=query)))
+                if self.__retrievalCache is not None:
+                    self.__retrievalCache.put(query=query, top_k=self.__topK, generation=generation, context=context)
+            # Selecciona el contexto que se añade al prompt.
+            context = self.__select(context=context)
             # Obtiene la duración.
             duration:float = time.perf_counter() - start
             
@@ -230,4 +397,55 @@ class RagService:
         # Si ocurre algún error.
         except Exception as e:
             # Lanza una excepción.
-            raise OSError(f"RagService.get_relevant_context() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
\ No newline at end of file
+            raise OSError(f"RagService.get_relevant_context() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
+    
+    def get_relevant_context_batch(self, queries:List[str]) -> List[List[ContextDTO]]:
+        """
+        Obtiene el contexto relevante de los datos locales para varias consultas a la vez.
+        Las consultas que no están en caché se resuelven con una única llamada por lotes
+        al módulo de documentos.
+        
+        Args:
+            queries (List[str]): Consultas del usuario.
+        Raises:
+            OSError: En caso de que haya algún error.
+        Returns:
+            List[List[ContextDTO]]: Listado con el contexto de cada consulta, en el mismo orden.
+        """
+        # Try-Except para el manejo de excepciones.
+        try:
+            # Obtiene el tiempo inicial.
+            start:float = time.perf_counter()
+            # Obtiene la generación del índice antes de buscar.
+            generation:int = self.__documentRagModule.Generation
+            # Obtiene el contexto de la caché.
+            contexts:List[Optional[List[ContextDTO]]] = [self.__retrievalCache.get(query=query, top_k=self.__topK, generation=generation)
+                                                         if self.__retrievalCache else None for query in queries]
+            
+            # Obtiene el contexto de las consultas que no están en caché y lo almacena.
+            pending:List[int] = [i for i, context in enumerate(contexts) if context is None]
+            if pending:
+                for i, context in zip(pending, self.__documentRagModule.get_context_batch(queries=[queries[i] for i in pending])):
+                    contexts[i] = self.__rerank(query=queries[i], context=context)
+                    if self.__retrievalCache is not None:
+                        self.__retrievalCache.put(query=queries[i], top_k=self.__topK, generation=generation, context=contexts[i])
+            # Selecciona el contexto de cada consulta.
+            contexts = [self.__select(context=context) for context in contexts]
+            # Obtiene la duración.
+            duration:float = time.perf_counter() - start
+            
+            # Almacena los parámetros obtenidos.
+            ragModelData:RagModelDataDTO = RagModelDataDTO(
+                action='RETRIEVE_BATCH',
+                duration=duration
+            )
+            # Almacena el dato en un csv.
+            save_in_csv(file_path=self.__measureFilePath, data=ragModelData)
+            
+            # Retorna el contexto.
+            return contexts
+
+        # Si ocurre algún error.
+        except Exception as e:
+            # Lanza una excepción.
+            raise OSError(f"RagService.get_relevant_context_batch() -> [{type(e).__name__}] No se pudo obtener el contexto. Trace: {e}")
\ No newline at end of file
@@ -27,9 +27,13 @@ import core.factory.ollama as OllamaFactory
 import core.factory.uvicorn as UvicornFactory
 import core.factory.rag as RagFactory
 import core.factory.prompt as PromptFactory
+import core.factory.indexer as IndexerFactory
+import core.factory.lifecycle as LifecycleFactory
 from core.services.ollama import OllamaService
 from core.services.uvicorn import UvicornService
 from core.services.rag import RagService
+from core.services.indexer import IndexerService
+from core.services.lifecycle import ModelLifecycleService
 from utils import console
 
 
@@ -50,15 +54,20 @@ def start() -> None:
                 
         # Inicializa y registra los servicios.
         CtxSingleton.get_ctx().add_service(key='ollama', service=OllamaFactory.create_ollama_service(ctx=CtxSingleton.get_ctx()))
+        CtxSingleton.get_ctx().add_service(key='ollama_async', service=OllamaFactory.create_async_ollama_service(ctx=CtxSingleton.get_ctx()))
+        CtxSingleton.get_ctx().add_service(key='lifecycle', service=LifecycleFactory.create_lifecycle_service(ctx=CtxSingleton.get_ctx()))
         CtxSingleton.get_ctx().add_service(key='uvicorn', service=UvicornFactory.create_uvicorn_service(ctx=CtxSingleton.get_ctx()))
         CtxSingleton.get_ctx().add_service(key='rag', service=RagFactory.create_rag_service(ctx=CtxSingleton.get_ctx()))
         CtxSingleton.get_ctx().add_service(key='prompt', service=PromptFactory.create_prompt_service(ctx=CtxSingleton.get_ctx()))
+        CtxSingleton.get_ctx().add_service(key='indexer', service=IndexerFactory.create_indexer_service(ctx=CtxSingleton.get_ctx()))
         # Imprime la información.
         console.print_message(message='Servicios registrados.', type=console.MessageType.INFO)
         
         # Obtiene los servicios necesarios para facilitar el acceso.
         ollama_service:OllamaService = CtxSingleton.get_ctx().get_service(key='ollama', t=OllamaService)
+        lifecycle_service:ModelLifecycleService = CtxSingleton.get_ctx().get_service(key='lifecycle', t=ModelLifecycleService)
         rag_service:RagService = CtxSingleton.get_ctx().get_service(key='rag', t=RagService)
+        indexer_service:IndexerService = CtxSingleton.get_ctx().get_service(key='indexer', t=IndexerService)
         
         # Comprueba si el servicio de Ollama está en ejecución.
         ollama_service.check_running()
@@ -72,11 +81,17 @@ def start() -> None:
         # Imprime la información.
         console.print_message(message='Modelo de Ollama instalado.', type=console.MessageType.INFO)
         
-        # Carga el modelo.
-        ollama_service.load_model(model_tag=ollama_service.Model.tag)
+        # Carga el modelo y vigila su residencia en segundo plano.
+        lifecycle_service.preload()
+        lifecycle_service.start()
         # Imprime la información.
         console.print_message(message='Modelo cargado.', type=console.MessageType.INFO)
 
+        # Precalienta los modelos de embeddings.
+        rag_service.warm_up()
+        # Imprime la información.
+        console.print_message(message='Modelos de embeddings precalentados.', type=console.MessageType.INFO)
+
         # Imprime la información.
         console.print_message(message='Calculando embeddings.', type=console.MessageType.INFO)
         # Calcula los embeddings.
@@ -84,6 +99,10 @@ def start() -> None:
         # Imprime la información.
         console.print_message(message='Embeddings calculados.', type=console.MessageType.INFO)
         
+        # Inicia el indexador en segundo plano.
+        indexer_service.start()
+        # Imprime la información.
+        console.print_message(message='Indexador iniciado.', type=console.MessageType.INFO)
 
     # Si ocurre algún error.
     except Exception as e:
@@ -112,6 +131,10 @@ if __name__ == '__main__':
         # Inicia Uvicorn.
         uvicorn_service.run()
         
+        # Detiene el indexador y la vigilancia del modelo.
+        CtxSingleton.get_ctx().get_service(key='indexer', t=IndexerService).stop()
+        CtxSingleton.get_ctx().get_service(key='lifecycle', t=ModelLifecycleService).stop()
+        
     # Si ocurre algún error.
     except Exception as e:
         # Imprime el error.
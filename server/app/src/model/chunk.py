@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: chunk.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene las clases con la información de los fragmentos (chunks) de
+    los documentos.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+from typing import List, Optional
+# Librerías externas
+from pydantic import BaseModel
+from pydantic import Field
+# Librerías internas
+from model.manifest import FileEntryDTO
+
+
+# ---- CLASES ---- #
+class ChunkDTO(BaseModel):
+    """
+    Almacena los datos de un fragmento de un documento.
+
+    Attributes:
+        id (str): Identificador del fragmento. Es determinista a partir del fichero
+            y del contenido.
+        sourceDir (str): Ruta del fichero del que se obtuvo.
+        hash (str): Hash del contenido del fragmento.
+        content (str): Contenido del fragmento.
+    """
+    # -- Atributos -- #
+    id:str
+    sourceDir:str
+    hash:str
+    content:str
+
+
+class SplitResultDTO(BaseModel):
+    """
+    Almacena el resultado de convertir y separar un fichero.
+
+    Attributes:
+        path (str): Ruta del fichero.
+        contents (List[str]): Contenido de los fragmentos.
+        error (Optional[str]): Error producido al separar el fichero o None si se ha
+            separado correctamente.
+    """
+    # -- Atributos -- #
+    path:str
+    contents:List[str] = Field(default_factory=list)
+    error:Optional[str] = Field(default=None)
+
+
+class IngestionItemDTO(BaseModel):
+    """
+    Almacena un fichero a lo largo del flujo de ingesta.
+
+    Attributes:
+        entry (FileEntryDTO): Entrada del fichero en el manifiesto.
+        chunks (List[ChunkDTO]): Fragmentos actuales del fichero.
+        pending (List[ChunkDTO]): Fragmentos que no estaban indexados.
+        embeddings (List[List[float]]): Embeddings de los fragmentos pendientes.
+        stale (List[str]): Identificadores de los fragmentos que ya no existen.
+    """
+    # -- Atributos -- #
+    entry:FileEntryDTO
+    chunks:List[ChunkDTO] = Field(default_factory=list)
+    pending:List[ChunkDTO] = Field(default_factory=list)
+    embeddings:List[List[float]] = Field(default_factory=list)
+    stale:List[str] = Field(default_factory=list)
\ No newline at end of file
@@ -16,9 +16,10 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-
+from typing import Optional
 # Librerías externas
 from pydantic import BaseModel
+from pydantic import Field
 # Librerías internas
 
 
@@ -32,9 +33,13 @@ class ContextDTO(BaseModel):
         sourceType (str): Tipo de objeto de donde se obtuvo (DOCUMENT/SQL)
         surceDir (str): Ruta del fichero.
         content (str): Contenido del contexto. 
+        denseScore (Optional[float]): Similitud coseno con la consulta en el almacén
+            vectorial. Se conserva tras la fusión y la reordenación, que cambian la escala
+            de `score`; None si el fragmento no procede de la búsqueda densa.
     """
     # -- Atributos -- #
     score:float
     sourceType:str
     sourceDir:str
-    content:str
\ No newline at end of file
+    content:str
+    denseScore:Optional[float] = Field(default=None)
\ No newline at end of file
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: manifest.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Contiene las clases con la información del manifiesto de ingesta de
+    documentos.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+from typing import Dict, List, Optional
+# Librerías externas
+from pydantic import BaseModel
+from pydantic import Field
+# Librerías internas
+
+
+# ---- CLASES ---- #
+class ChunkEntryDTO(BaseModel):
+    """
+    Almacena la información de un fragmento indexado.
+
+    Attributes:
+        id (str): Identificador del fragmento en el almacén.
+        hash (str): Hash del contenido del fragmento.
+    """
+    # -- Atributos -- #
+    id:str
+    hash:str
+
+
+class FileEntryDTO(BaseModel):
+    """
+    Almacena la información de un fichero indexado.
+
+    Attributes:
+        path (str): Ruta del fichero.
+        size (int): Tamaño del fichero en bytes.
+        mtime (int): Fecha de modificación del fichero en nanosegundos.
+        hash (str): Hash del contenido del fichero.
+        chunks (List[ChunkEntryDTO]): Fragmentos indexados del fichero.
+    """
+    # -- Atributos -- #
+    path:str
+    size:int
+    mtime:int
+    hash:str
+    chunks:List[ChunkEntryDTO] = Field(default_factory=list)
+
+
+class IndexInfoDTO(BaseModel):
+    """
+    Almacena los parámetros con los que se construyó el índice. Si alguno cambia, los
+    vectores almacenados dejan de ser válidos.
+
+    Attributes:
+        framework (str): Framework empleado.
+        modelTag (str): Etiqueta del modelo de embeddings.
+        embeddingDim (int): Tamaño de los embeddings.
+        splitLength (int): Tamaño del chunk.
+        splitOverlap (int): Overlap entre chunks.
+        backend (str): Backend de los embeddings (TORCH u ONNX).
+        onnxFile (Optional[str]): Fichero ONNX ejecutado, o None con PyTorch.
+    """
+    # -- Atributos -- #
+    framework:str
+    modelTag:str
+    embeddingDim:int
+    splitLength:int
+    splitOverlap:int
+    backend:str = Field(default='TORCH')
+    onnxFile:Optional[str] = Field(default=None)
+
+
+class ManifestDTO(BaseModel):
+    """
+    Almacena el manifiesto de ingesta.
+
+    Attributes:
+        index (Optional[IndexInfoDTO]): Parámetros con los que se construyó el índice.
+        fingerprint (str): Huella del corpus (rutas, tamaños y fechas de modificación)
+            en la última sincronización completa.
+        files (Dict[str, FileEntryDTO]): Ficheros indexados, indexados por su ruta.
+    """
+    # -- Atributos -- #
+    index:Optional[IndexInfoDTO] = Field(default=None)
+    fingerprint:str = Field(default='')
+    files:Dict[str, FileEntryDTO] = Field(default_factory=dict)
+
+
+class ManifestDiffDTO(BaseModel):
+    """
+    Almacena las diferencias entre el manifiesto y los ficheros del directorio.
+
+    Attributes:
+        added (List[FileEntryDTO]): Ficheros nuevos.
+        changed (List[FileEntryDTO]): Ficheros cuyo contenido ha cambiado.
+        removed (List[str]): Rutas de los ficheros eliminados.
+        fingerprint (str): Huella de los ficheros comparados.
+    """
+    # -- Atributos -- #
+    added:List[FileEntryDTO] = Field(default_factory=list)
+    changed:List[FileEntryDTO] = Field(default_factory=list)
+    removed:List[str] = Field(default_factory=list)
+    fingerprint:str = Field(default='')
\ No newline at end of file
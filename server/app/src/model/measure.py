@@ -57,8 +57,146 @@ class RagModelDataDTO(BaseModel):
         action (str): Acción que ha realizado.
             - EMBEDDING.
             - RETRIEVE.
+            - RETRIEVE_BATCH.
+            - RERANK.
         duration (float): Duración en realizar la acción.
     """
     # -- Atributos -- #
-    action:str = Field(pattern='EMBEDDING|RETRIEVE')
-    duration:float
\ No newline at end of file
+    action:str = Field(pattern='EMBEDDING|RETRIEVE|RETRIEVE_BATCH|RERANK')
+    duration:float
+
+
+class CacheStatsDTO(BaseModel):
+    """
+    Almacena las estadísticas de una caché.
+    
+    Attributes:
+        hits (int): Número de aciertos.
+        misses (int): Número de fallos.
+        size (int): Número de entradas almacenadas.
+        capacity (int): Número máximo de entradas.
+        hitRate (float): Proporción de aciertos frente al total de consultas.
+    """
+    # -- Atributos -- #
+    hits:int
+    misses:int
+    size:int
+    capacity:int
+    hitRate:float
+
+
+class IngestionDataDTO(BaseModel):
+    """
+    Almacena las medidas de una ingesta de documentos.
+    
+    Attributes:
+        files (int): Número de ficheros escritos.
+        points (int): Número de puntos (fragmentos) insertados.
+        duration (float): Duración total de la ingesta.
+        writeDuration (float): Tiempo empleado en escribir en el almacén.
+        pointsPerSecond (float): Puntos insertados por segundo de ingesta.
+    """
+    # -- Atributos -- #
+    files:int
+    points:int
+    duration:float
+    writeDuration:float
+    pointsPerSecond:float
+
+
+class SelectionDataDTO(BaseModel):
+    """
+    Almacena las medidas de una selección de contexto.
+    
+    Attributes:
+        candidates (int): Número de fragmentos recuperados.
+        kept (int): Número de fragmentos conservados.
+        droppedByScore (int): Fragmentos descartados por la puntuación mínima.
+        droppedByGap (int): Fragmentos descartados por el salto de puntuación.
+        droppedByBudget (int): Fragmentos descartados por el máximo de tokens.
+        tokens (int): Número de tokens (estimados) del contexto conservado.
+    """
+    # -- Atributos -- #
+    candidates:int
+    kept:int
+    droppedByScore:int
+    droppedByGap:int
+    droppedByBudget:int
+    tokens:int
+
+
+class StreamDataDTO(BaseModel):
+    """
+    Almacena las medidas de una respuesta enviada por streaming.
+    
+    Attributes:
+        ttft (float): Tiempo (s) hasta el primer token, desde la recepción de la consulta.
+            Es la latencia que percibe el usuario.
+        retrieveDuration (float): Tiempo (s) empleado en obtener el contexto.
+        duration (float): Tiempo (s) total hasta el último token.
+        promptEvalCount (int): Número de tokens en el prompt.
+        promptEvalDuration (float): Tiempo (s) empleado en evaluar el prompt.
+        evalCount (int): Número de tokens en la respuesta generada.
+        loadDuration (float): Tiempo (s) empleado en cargar el modelo. Es nulo si el
+            modelo ya estaba cargado.
+    """
+    # -- Atributos -- #
+    ttft:float
+    retrieveDuration:float
+    duration:float
+    promptEvalCount:int
+    promptEvalDuration:float
+    evalCount:int
+    loadDuration:float
+
+
+class LoadEventDTO(BaseModel):
+    """
+    Almacena un evento del ciclo de vida del modelo de Ollama.
+    
+    Attributes:
+        timestamp (str): Fecha y hora (ISO 8601) del evento.
+        event (str): Evento:
+            - LOAD: Carga del modelo.
+            - REFRESH: Renovación del keep_alive de un modelo cargado.
+            - UNLOAD: Descarga del modelo.
+        reason (str): Motivo del evento:
+            - STARTUP: Inicio del servidor.
+            - EVICTED: El modelo no estaba cargado y hay peticiones recientes.
+            - PREWARM: Tráfico previsto.
+            - KEEPALIVE: El modelo iba a expirar.
+            - IDLE: Sin peticiones durante el tiempo máximo de inactividad.
+        loadDuration (float): Tiempo (s) empleado en la petición.
+        size (int): Memoria (bytes) que ocupa el modelo tras el evento.
+        sizeVram (int): Memoria de GPU (bytes) que ocupa el modelo tras el evento.
+    """
+    # -- Atributos -- #
+    timestamp:str
+    event:str
+    reason:str
+    loadDuration:float
+    size:int
+    sizeVram:int
+
+
+class ModelResidencyDTO(BaseModel):
+    """
+    Almacena el estado de residencia del modelo de Ollama.
+    
+    Attributes:
+        tag (str): Etiqueta del modelo.
+        resident (bool): Si el modelo está cargado en memoria.
+        size (int): Memoria (bytes) que ocupa el modelo.
+        sizeVram (int): Memoria de GPU (bytes) que ocupa el modelo.
+        expiresIn (float): Tiempo (s) hasta que Ollama descarga el modelo.
+        loads (int): Número de cargas realizadas por el gestor.
+        lastLoadDuration (float): Tiempo (s) empleado en la última carga.
+    """
+    # -- Atributos -- #
+    tag:str
+    resident:bool = Field(default=False)
+    size:int = Field(default=0)
+    sizeVram:int = Field(default=0)
+    expiresIn:float = Field(default=0.0)
+    loads:int = Field(default=0)
+    lastLoadDuration:float = Field(default=0.0)
\ No newline at end of file
@@ -16,9 +16,10 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-
+from typing import List
 # Librerías externas
 from pydantic import BaseModel
+from pydantic import Field
 # Librerías internas
 
 
@@ -31,4 +32,15 @@ class BaseQueryDTO(BaseModel):
         content (str): Contenido de la pregunta del cliente.
     """
     # -- Atributos -- #
-    content:str
\ No newline at end of file
+    content:str
+
+
+class BatchQueryDTO(BaseModel):
+    """
+    Almacena los datos de una petición con varias consultas.
+    
+    Attributes:
+        queries (List[str]): Consultas del cliente.
+    """
+    # -- Atributos -- #
+    queries:List[str] = Field(min_length=1)
\ No newline at end of file
@@ -16,10 +16,13 @@
 
 # ---- MÓDULOS ---- #
 # Librerías estándar
-
+from typing import List, Optional
 # Librerías externas
 from pydantic import BaseModel
+from pydantic import Field
 # Librerías internas
+from model.context import ContextDTO
+from model.measure import CacheStatsDTO
 
 
 # ---- CLASES ---- #
@@ -31,4 +34,32 @@ class BaseResponseDTO(BaseModel):
         content (str): Contenido de la respuesta del modelo.
     """
     # -- Atributos -- #
-    content:str
\ No newline at end of file
+    content:str
+
+
+class RagStatsResponseDTO(BaseModel):
+    """
+    Almacena las estadísticas de las cachés del RAG.
+    
+    Attributes:
+        embeddingCache (Optional[CacheStatsDTO]): Caché de embeddings de fragmentos.
+        queryCache (Optional[CacheStatsDTO]): Caché de embeddings de consultas.
+        retrievalCache (Optional[CacheStatsDTO]): Caché de resultados de recuperación.
+        generation (int): Generación actual del índice.
+    """
+    # -- Atributos -- #
+    embeddingCache:Optional[CacheStatsDTO] = Field(default=None)
+    queryCache:Optional[CacheStatsDTO] = Field(default=None)
+    retrievalCache:Optional[CacheStatsDTO] = Field(default=None)
+    generation:int = Field(default=0)
+
+
+class ContextBatchResponseDTO(BaseModel):
+    """
+    Almacena el contexto obtenido para varias consultas.
+    
+    Attributes:
+        contexts (List[List[ContextDTO]]): Contexto de cada consulta, en el mismo orden.
+    """
+    # -- Atributos -- #
+    contexts:List[List[ContextDTO]]
\ No newline at end of file
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: ann_benchmark.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Compara el índice aproximado (IVF) con la búsqueda exacta sobre vectores
+        sintéticos agrupados: recall@k y latencia por consulta para varios tamaños de
+        corpus. Se ejecuta desde el directorio 'src'.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import sys
+import time
+import uuid
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.rag.index.flat import FlatIndex
+from core.rag.index.ivf import IVFIndex
+
+
+# ---- PARÁMETROS ---- #
+__SIZES:List[int] = [20000, 100000, 200000]
+__DIM:int = 256
+__CLUSTERS:int = 500
+__QUERIES:int = 200
+__TOP_K:int = 10
+__NPROBES:List[int] = [4, 16, 64]
+
+
+# ---- FUNCIONES ---- #
+def make_vectors(n:int, rng:np.random.Generator, centers:np.ndarray) -> np.ndarray:
+    """
+    Genera vectores agrupados alrededor de los centros, similar a embeddings de texto.
+
+    Args:
+        n (int): Número de vectores.
+        rng (np.random.Generator): Generador aleatorio.
+        centers (np.ndarray): Centros de los grupos.
+    Returns:
+        np.ndarray: Vectores generados.
+    """
+    # Retorna los centros con ruido.
+    return (centers[rng.integers(len(centers), size=n)] + 0.6 * rng.standard_normal((n, centers.shape[1]))).astype(np.float32)
+
+
+def measure(index, queries:np.ndarray) -> Tuple[List[np.ndarray], float]:
+    """
+    Ejecuta las consultas y mide la latencia media.
+
+    Args:
+        index (FlatIndex | IVFIndex): Índice a medir.
+        queries (np.ndarray): Vectores de consulta.
+    Returns:
+        Tuple[List[np.ndarray], float]: Posiciones obtenidas y latencia media (ms).
+    """
+    # Ejecuta las consultas.
+    results:List[np.ndarray] = []
+    start:float = time.perf_counter()
+    for query in queries:
+        results.append(index.search(query=query, top_k=__TOP_K)[0])
+    # Retorna los resultados y la latencia media.
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    # Genera los centros y las consultas.
+    rng:np.random.Generator = np.random.default_rng(0)
+    centers:np.ndarray = rng.standard_normal((__CLUSTERS, __DIM)).astype(np.float32)
+    queries:np.ndarray = make_vectors(n=__QUERIES, rng=rng, centers=centers)
+
+    print(f"{'N':>8} {'índice':>10} {'recall@k':>9} {'ms/consulta':>12}")
+    # Para cada tamaño de corpus.
+    for size in __SIZES:
+        # Genera el corpus.
+        vectors:np.ndarray = make_vectors(n=size, rng=rng, centers=centers)
+        ids:List[str] = [str(uuid.uuid4()) for __ in range(size)]
+
+        # Crea el índice exacto como referencia.
+        with tempfile.TemporaryDirectory() as tmp:
+            flat:FlatIndex = FlatIndex(root_path=Path(tmp), embedding_dim=__DIM)
+            flat.add(ids=ids, vectors=vectors)
+            exact, latency = measure(index=flat, queries=queries)
+            print(f"{size:>8} {'FLAT':>10} {1.0:>9.3f} {latency:>12.3f}")
+            del flat
+
+        # Para cada número de listas recorridas.
+        for nprobe in __NPROBES:
+            with tempfile.TemporaryDirectory() as tmp:
+                # Crea y entrena el índice aproximado.
+                ivf:IVFIndex = IVFIndex(root_path=Path(tmp), embedding_dim=__DIM, nlist=0, nprobe=nprobe, rebuild_ratio=0.5, min_train_size=1)
+                ivf.add(ids=ids, vectors=vectors)
+                ivf.rebuild()
+                approx, latency = measure(index=ivf, queries=queries)
+
+                # Calcula el recall@k frente a la búsqueda exacta.
+                recall:float = float(np.mean([len(np.intersect1d(a, e)) / len(e) for a, e in zip(approx, exact)]))
+                print(f"{size:>8} {f'IVF/{nprobe}':>10} {recall:>9.3f} {latency:>12.3f}")
+                del ivf
\ No newline at end of file
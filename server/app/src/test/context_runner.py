@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: context_runner.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Solicita al servidor el contexto de un fichero de preguntas (una por
+        línea) mediante el endpoint de recuperación por lotes y almacena el resultado
+        en JSON. Empleado en la evaluación de la recuperación.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import sys
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+# Librerías externas
+import requests
+# Librerías internas
+
+
+# ---- PARÁMETROS ---- #
+__URL:str = 'http://localhost:49153/rag/context/batch'
+__BATCH_SIZE:int = 256
+
+
+# ---- FUNCIONES ---- #
+def read_queries(file_path:Path) -> List[str]:
+    """
+    Lee las preguntas del fichero, una por línea.
+
+    Args:
+        file_path (Path): Fichero de preguntas.
+    Returns:
+        List[str]: Preguntas no vacías.
+    """
+    # Retorna las líneas no vacías.
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def get_contexts(queries:List[str]) -> List[List[Dict]]:
+    """
+    Solicita el contexto de las preguntas en lotes.
+
+    Args:
+        queries (List[str]): Preguntas.
+    Returns:
+        List[List[Dict]]: Contexto de cada pregunta, en el mismo orden.
+    """
+    # Variable a retornar.
+    contexts:List[List[Dict]] = []
+
+    # Para cada lote de preguntas.
+    for start in range(0, len(queries), __BATCH_SIZE):
+        response:requests.Response = requests.post(url=__URL, json={'queries': queries[start:start + __BATCH_SIZE]})
+        response.raise_for_status()
+        contexts.extend(response.json()['contexts'])
+
+    # Retorna el contexto.
+    return contexts
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    # Comprueba los argumentos.
+    if len(sys.argv) != 3:
+        print(f"Uso: {sys.argv[0]} <fichero de preguntas> <fichero de salida>")
+        sys.exit(1)
+
+    # Obtiene el contexto de las preguntas.
+    queries:List[str] = read_queries(file_path=Path(sys.argv[1]))
+    start:float = time.perf_counter()
+    contexts:List[List[Dict]] = get_contexts(queries=queries)
+    duration:float = time.perf_counter() - start
+
+    # Almacena el resultado.
+    with open(sys.argv[2], 'w', encoding='utf-8') as file:
+        json.dump([{'query': query, 'context': context} for query, context in zip(queries, contexts)], file, ensure_ascii=False, indent=2)
+    print(f"{len(queries)} preguntas en {duration:.2f} s ({len(queries) / duration:.1f} preguntas/s).")
\ No newline at end of file
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: embedding_cache_check.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Comprueba la caché persistente de embeddings (EmbeddingCache): la
+        expulsión de una entrada cuya clave termina en '\x00', la recarga desde disco y
+        el descarte de una fila escrita a medias. Termina con código 1 si alguna
+        comprobación falla. Se ejecuta desde el directorio 'src'.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import sys
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+# Librerías externas
+import numpy as np
+# Librerías internas
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.rag.embedding.cache import EmbeddingCache, normalize_text
+
+
+# ---- PARÁMETROS ---- #
+__MODEL_TAG:str = 'test/model'
+__DIM:int = 8
+
+
+# ---- FUNCIONES ---- #
+def find_text(suffix:bytes) -> str:
+    """
+    Busca un texto cuya clave en la caché termine en los bytes dados.
+
+    Args:
+        suffix (bytes): Bytes finales de la clave.
+    Returns:
+        str: Texto encontrado.
+    """
+    # Prueba textos hasta encontrar uno.
+    i:int = 0
+    while True:
+        text:str = f"texto {i}"
+        key:bytes = hashlib.blake2b(f"{__MODEL_TAG}\0{normalize_text(text)}".encode('utf-8'), digest_size=16).digest()
+        if key.endswith(suffix):
+            return text
+        i += 1
+
+
+def vector(value:float) -> List[float]:
+    """
+    Retorna un embedding constante.
+
+    Args:
+        value (float): Valor del embedding.
+    Returns:
+        List[float]: Embedding.
+    """
+    # Retorna el embedding.
+    return [value] * __DIM
+
+
+def check(name:str, result:Optional[np.ndarray], expected:Optional[float]) -> bool:
+    """
+    Comprueba el resultado de la caché e imprime el resultado.
+
+    Args:
+        name (str): Nombre de la comprobación.
+        result (Optional[np.ndarray]): Embedding obtenido.
+        expected (Optional[float]): Valor esperado del embedding, o None si no debe estar.
+    Returns:
+        bool: True si es correcto.
+    """
+    # Compara el resultado.
+    ok:bool = result is None if expected is None else (result is not None and np.allclose(result, expected))
+    print(f"{'OK' if ok else 'FALLO':>5}  {name}")
+    return ok
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    # Textos: el primero con una clave terminada en '\x00'.
+    a:str = find_text(suffix=b'\x00')
+    b:str = 'texto b'
+    c:str = 'texto c'
+    results:List[bool] = []
+
+    with tempfile.TemporaryDirectory() as root:
+        # Llena la caché (dos entradas) y expulsa la primera.
+        cache:EmbeddingCache = EmbeddingCache(root_path=Path(root), model_tag=__MODEL_TAG, embedding_dim=__DIM, max_entries=2)
+        cache.put(texts=[a], embeddings=[vector(1.0)])
+        cache.put(texts=[b], embeddings=[vector(2.0)])
+        cache.put(texts=[c], embeddings=[vector(3.0)])
+        results.append(check(name="expulsión de clave terminada en '\\x00'", result=cache.get(texts=[a])[0], expected=None))
+        results.append(check(name='entrada que ocupa la posición expulsada', result=cache.get(texts=[c])[0], expected=3.0))
+        cache.flush()
+
+        # Recarga la caché desde disco.
+        cache = EmbeddingCache(root_path=Path(root), model_tag=__MODEL_TAG, embedding_dim=__DIM, max_entries=2)
+        results.append(check(name='recarga (b)', result=cache.get(texts=[b])[0], expected=2.0))
+        results.append(check(name='recarga (c)', result=cache.get(texts=[c])[0], expected=3.0))
+
+        # Clave terminada en '\x00' tras la recarga.
+        cache.put(texts=[a], embeddings=[vector(1.0)])
+        cache.flush()
+        cache = EmbeddingCache(root_path=Path(root), model_tag=__MODEL_TAG, embedding_dim=__DIM, max_entries=2)
+        results.append(check(name="recarga de clave terminada en '\\x00'", result=cache.get(texts=[a])[0], expected=1.0))
+        del cache
+
+        # Simula una fila escrita a medias: el vector cambia y la clave no.
+        entries = np.lib.format.open_memmap(Path(root, __MODEL_TAG.replace('/', '_'), 'entries.npy'), mode='r+')
+        entries['vector'][:, 0] += 1.0
+        entries.flush()
+        del entries
+        cache = EmbeddingCache(root_path=Path(root), model_tag=__MODEL_TAG, embedding_dim=__DIM, max_entries=2)
+        results.append(check(name='descarte de fila escrita a medias', result=cache.get(texts=[a])[0], expected=None))
+
+    # Termina con error si alguna comprobación ha fallado.
+    sys.exit(0 if all(results) else 1)
\ No newline at end of file
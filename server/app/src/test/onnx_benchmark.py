@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: onnx_benchmark.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Compara los backends de embeddings (PyTorch, ONNX fp32 y ONNX int8) de
+        los modelos empleados: similitud coseno frente a PyTorch y textos por segundo.
+        Retorna un código distinto de cero si algún backend no alcanza la tolerancia.
+        Se ejecuta desde el directorio 'server'.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+# Librerías externas
+import numpy as np
+from sentence_transformers import SentenceTransformer
+# Librerías internas
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from config.loader import load_config
+from config.schema.rag import RagConfig, EmbedderConfig
+from core.rag.embedding import registry
+
+
+# ---- PARÁMETROS ---- #
+__MODELS_FILE:Path = Path(__file__).resolve().parents[4] / 'docs' / 'models.txt'
+__CONFIG_FILE:Path = Path('.server/etc/configs/rag.yaml')
+__REPEATS:int = 8
+__BATCH_SIZE:int = 32
+__TOLERANCE:float = 0.98
+__TEXTS:List[str] = [
+    '¿Cuál es la tensión de alimentación del variador IF750?',
+    'El módulo CE300 admite comunicaciones Modbus RTU y TCP.',
+    'Para restablecer el equipo, mantenga pulsado el botón de reset durante diez segundos.',
+    'La temperatura de funcionamiento está comprendida entre -10 y 50 grados.',
+    'El manual describe el procedimiento de instalación paso a paso.',
+    'Los fragmentos recuperados se añaden al contexto del modelo de lenguaje.',
+    'La garantía no cubre los daños causados por un uso indebido del producto.',
+    '¿Qué significa el código de error E04 en la pantalla?'
+]
+__BACKENDS:List[Tuple[str, EmbedderConfig]] = [
+    ('TORCH', EmbedderConfig(backend='TORCH')),
+    ('ONNX fp32', EmbedderConfig(backend='ONNX', quantize=False)),
+    ('ONNX int8', EmbedderConfig(backend='ONNX', quantize=True))
+]
+
+
+# ---- FUNCIONES ---- #
+def read_models(file_path:Path) -> List[str]:
+    """
+    Obtiene los modelos de embeddings del fichero de modelos.
+
+    Args:
+        file_path (Path): Fichero de modelos.
+    Returns:
+        List[str]: Etiquetas de los modelos de embeddings.
+    """
+    # Retorna las etiquetas de las líneas de modelos de embeddings.
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [line.split()[1] for line in file if line.strip().startswith('- sentence-transformers/')]
+
+
+def measure(model:SentenceTransformer, texts:List[str]) -> Tuple[np.ndarray, float]:
+    """
+    Calcula los embeddings de los textos y mide el rendimiento.
+
+    Args:
+        model (SentenceTransformer): Modelo de embeddings.
+        texts (List[str]): Textos a codificar.
+    Returns:
+        Tuple[np.ndarray, float]: Embeddings normalizados y textos por segundo.
+    """
+    # Precalienta el modelo.
+    embeddings:np.ndarray = model.encode(texts, batch_size=__BATCH_SIZE, normalize_embeddings=True, show_progress_bar=False)
+    # Mide el rendimiento.
+    start:float = time.perf_counter()
+    for __ in range(__REPEATS):
+        model.encode(texts, batch_size=__BATCH_SIZE, normalize_embeddings=True, show_progress_bar=False)
+    # Retorna los embeddings y los textos por segundo.
+    return embeddings, __REPEATS * len(texts) / (time.perf_counter() - start)
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    # Carga la configuración.
+    rag_cfg:RagConfig = load_config(file_path=__CONFIG_FILE, t=RagConfig)
+    texts:List[str] = __TEXTS * 4
+    failed:bool = False
+
+    # Para cada modelo de embeddings.
+    for tag in read_models(file_path=__MODELS_FILE):
+        # Comprueba que el modelo esté instalado.
+        model_path:Path = Path(os.path.join('.server', rag_cfg.installModelDir, tag))
+        if not model_path.exists():
+            print(f"{tag}: no instalado en <{model_path}>, se omite.")
+            continue
+
+        print(f"\n{tag}")
+        print(f"{'backend':>10} {'cos mín':>8} {'cos medio':>10} {'textos/s':>9} {'aceleración':>12}")
+        reference:np.ndarray = None
+        baseline:float = 0.0
+
+        # Para cada backend.
+        for name, embedder_cfg in __BACKENDS:
+            model:SentenceTransformer = registry.get_model(model_path=model_path, embedder_cfg=embedder_cfg)
+            embeddings, throughput = measure(model=model, texts=texts)
+
+            # El primer backend (PyTorch) es la referencia.
+            if reference is None:
+                reference, baseline = embeddings, throughput
+            # Calcula la similitud coseno frente a la referencia.
+            cosine:np.ndarray = np.sum(embeddings * reference, axis=1)
+            failed |= bool(cosine.min() < __TOLERANCE)
+            print(f"{name:>10} {cosine.min():>8.4f} {cosine.mean():>10.4f} {throughput:>9.1f} {throughput / baseline:>11.2f}x")
+
+    # Retorna un error si algún backend no alcanza la tolerancia.
+    if failed:
+        print(f"\nAlgún backend no alcanza la similitud mínima de {__TOLERANCE}.")
+    sys.exit(1 if failed else 0)
\ No newline at end of file
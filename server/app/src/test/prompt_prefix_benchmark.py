@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: prompt_prefix_benchmark.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Compara la disposición del prompt DEFAULT con la disposición PREFIX
+        (texto fijo al inicio). Construye los prompts de las preguntas y el contexto
+        obtenidos por 'context_runner.py', los envía a Ollama generando un único token
+        y mide los tokens evaluados y el tiempo de evaluación del prompt. Se ejecuta
+        desde el directorio 'server'.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import os
+import sys
+import json
+from pathlib import Path
+from statistics import mean
+from typing import Dict, List
+# Librerías externas
+import requests
+# Librerías internas
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from model.context import ContextDTO
+from core.services.prompt import PromptService
+from config.schema.prompt import PromptConfig
+
+
+# ---- PARÁMETROS ---- #
+__URL:str = 'http://localhost:49152/api/generate'
+__MODEL:str = 'qwen3:8b'
+__LAYOUTS:List[str] = ['DEFAULT', 'PREFIX']
+
+
+# ---- FUNCIONES ---- #
+def shared_prefix(a:str, b:str) -> int:
+    """
+    Retorna el número de caracteres iniciales que comparten dos textos.
+
+    Args:
+        a (str): Primer texto.
+        b (str): Segundo texto.
+    Returns:
+        int: Longitud del prefijo común.
+    """
+    # Retorna la longitud del prefijo común.
+    return len(os.path.commonprefix([a, b]))
+
+
+def evaluate(prompt:str) -> Dict[str, float]:
+    """
+    Envía el prompt a Ollama generando un único token.
+
+    Args:
+        prompt (str): Prompt a evaluar.
+    Returns:
+        Dict[str, float]: Tokens evaluados y tiempo (ms) de evaluación del prompt.
+    """
+    # Envía el prompt.
+    response:requests.Response = requests.post(url=__URL, json={
+        'model': __MODEL,
+        'prompt': prompt,
+        'stream': False,
+        'keep_alive': '30m',
+        'options': {'num_predict': 1}
+    })
+    response.raise_for_status()
+    data:Dict = response.json()
+
+    # Retorna las medidas (sin tokens evaluados si todo el prompt estaba en caché).
+    return {
+        'count': data.get('prompt_eval_count', 0),
+        'duration': data.get('prompt_eval_duration', 0) / 1_000_000
+    }
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    # Comprueba los argumentos.
+    if len(sys.argv) != 2:
+        print(f"Uso: {sys.argv[0]} <fichero generado por context_runner.py>")
+        sys.exit(1)
+
+    # Lee las preguntas y su contexto.
+    with open(sys.argv[1], 'r', encoding='utf-8') as file:
+        items:List[Dict] = json.load(file)
+    requestsData:List[Dict] = [{'query': item['query'], 'context': [ContextDTO(**c) for c in item['context']]} for item in items]
+
+    print(f"{'disposición':>12} {'prefijo común':>14} {'tokens evaluados':>17} {'evaluación (ms)':>16}")
+
+    # Para cada disposición.
+    results:Dict[str, float] = {}
+    for layout in __LAYOUTS:
+        # Construye los prompts.
+        service:PromptService = PromptService(prompt_cfg=PromptConfig(layout=layout))
+        prompts:List[str] = [service.build_prompt(query=r['query'], context=r['context'], history=[]) for r in requestsData]
+
+        # Mide el prefijo común con la petición anterior.
+        prefix:float = mean(shared_prefix(a=a, b=b) / len(b) for a, b in zip(prompts, prompts[1:]))
+
+        # Evalúa los prompts (el primero carga el modelo y la caché, no se mide).
+        evaluate(prompt=prompts[0])
+        measures:List[Dict[str, float]] = [evaluate(prompt=prompt) for prompt in prompts[1:]]
+        results[layout] = mean(m['duration'] for m in measures)
+
+        print(f"{layout:>12} {prefix:>13.1%} {mean(m['count'] for m in measures):>17.1f} {results[layout]:>16.1f}")
+
+    # Muestra la reducción del tiempo de evaluación.
+    print(f"Reducción del tiempo de evaluación del prompt: {1 - results['PREFIX'] / results['DEFAULT']:.1%}")
\ No newline at end of file
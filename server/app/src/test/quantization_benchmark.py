@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: quantization_benchmark.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Compara la búsqueda exacta con la búsqueda sobre códigos cuantizados
+        (INT8 y BINARY) con repuntuación: memoria de los datos recorridos, recall@k y
+        latencia por consulta. Se ejecuta desde el directorio 'src'.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import sys
+import time
+import uuid
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+# Librerías externas
+import numpy as np
+# Librerías internas
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.rag.index.flat import FlatIndex
+
+
+# ---- PARÁMETROS ---- #
+__SIZE:int = 100000
+__DIM:int = 1024
+__CLUSTERS:int = 500
+__QUERIES:int = 100
+__TOP_K:int = 10
+__MODES:List[Tuple[str, int]] = [('INT8', 2), ('INT8', 4), ('BINARY', 4), ('BINARY', 10), ('BINARY', 20)]
+
+
+# ---- FUNCIONES ---- #
+def make_vectors(n:int, rng:np.random.Generator, centers:np.ndarray) -> np.ndarray:
+    """
+    Genera vectores agrupados alrededor de los centros, similar a embeddings de texto.
+
+    Args:
+        n (int): Número de vectores.
+        rng (np.random.Generator): Generador aleatorio.
+        centers (np.ndarray): Centros de los grupos.
+    Returns:
+        np.ndarray: Vectores generados.
+    """
+    # Retorna los centros con ruido.
+    return (centers[rng.integers(len(centers), size=n)] + 0.6 * rng.standard_normal((n, centers.shape[1]))).astype(np.float32)
+
+
+def measure(index:FlatIndex, queries:np.ndarray) -> Tuple[List[np.ndarray], float]:
+    """
+    Ejecuta las consultas y mide la latencia media.
+
+    Args:
+        index (FlatIndex): Índice a medir.
+        queries (np.ndarray): Vectores de consulta.
+    Returns:
+        Tuple[List[np.ndarray], float]: Posiciones obtenidas y latencia media (ms).
+    """
+    # Ejecuta las consultas.
+    results:List[np.ndarray] = []
+    start:float = time.perf_counter()
+    for query in queries:
+        results.append(index.search(query=query, top_k=__TOP_K)[0])
+    # Retorna los resultados y la latencia media.
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    # Genera el corpus y las consultas.
+    rng:np.random.Generator = np.random.default_rng(0)
+    centers:np.ndarray = rng.standard_normal((__CLUSTERS, __DIM)).astype(np.float32)
+    vectors:np.ndarray = make_vectors(n=__SIZE, rng=rng, centers=centers)
+    queries:np.ndarray = make_vectors(n=__QUERIES, rng=rng, centers=centers)
+    ids:List[str] = [str(uuid.uuid4()) for __ in range(__SIZE)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Crea el índice exacto como referencia.
+        flat:FlatIndex = FlatIndex(root_path=Path(tmp), embedding_dim=__DIM)
+        flat.add(ids=ids, vectors=vectors)
+        flat.save()
+        exact, latency = measure(index=flat, queries=queries)
+        full:int = flat.Capacity * __DIM * 4
+
+        print(f"{'índice':>12} {'MB':>8} {'reducción':>10} {'recall@k':>9} {'ms/consulta':>12}")
+        print(f"{'FLOAT32':>12} {full / 2**20:>8.1f} {1.0:>9.1f}x {1.0:>9.3f} {latency:>12.3f}")
+        del flat
+
+        # Para cada cuantización (se reutilizan los vectores almacenados).
+        for mode, factor in __MODES:
+            quantized:FlatIndex = FlatIndex(root_path=Path(tmp), embedding_dim=__DIM, quantization=mode, rescore_factor=factor)
+            approx, latency = measure(index=quantized, queries=queries)
+
+            # Calcula el recall@k frente a la búsqueda exacta.
+            recall:float = float(np.mean([len(np.intersect1d(a, e)) / len(e) for a, e in zip(approx, exact)]))
+            print(f"{f'{mode}/x{factor}':>12} {quantized.CodeBytes / 2**20:>8.1f} {full / quantized.CodeBytes:>9.1f}x "
+                  f"{recall:>9.3f} {latency:>12.3f}")
+            del quantized
\ No newline at end of file
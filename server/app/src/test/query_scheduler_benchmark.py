@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+
+"""
+*******************************************************************************************
+    Nombre del Módulo: query_scheduler_benchmark.py
+    Proyecto: Multimodal-IA-TFG
+    Autor: Pablo González García
+    Fecha: 2025-06-16
+    Descripción: Compara el embedding secuencial de consultas concurrentes con su
+        agrupación en lotes (QueryBatchScheduler). El modelo se simula con un coste fijo
+        por pasada y un coste por consulta, y se ejecuta en exclusión mutua como en una
+        CPU saturada. Se ejecuta desde el directorio 'src'.
+    Copyright (c) 2025 Pablo González García
+    Licencia: MIT License. Ver el archivo LICENCE en la raíz del proyecto.
+*******************************************************************************************
+"""
+
+
+# ---- MÓDULOS ---- #
+# Librerías estándar
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Callable, List
+from concurrent.futures import ThreadPoolExecutor
+# Librerías externas
+
+# Librerías internas
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.rag.embedding.scheduler import QueryBatchScheduler
+from config.schema.rag import QuerySchedulerConfig
+
+
+# ---- PARÁMETROS ---- #
+__PASS_COST:float = 0.010
+__QUERY_COST:float = 0.0005
+__QUERIES:int = 400
+__CLIENTS:List[int] = [1, 4, 16, 64]
+__LOCK:threading.Lock = threading.Lock()
+
+
+# ---- FUNCIONES ---- #
+def embed_texts(texts:List[str]) -> List[List[float]]:
+    """
+    Simula una pasada del modelo: coste fijo más un coste por texto.
+
+    Args:
+        texts (List[str]): Textos a embeber.
+    Returns:
+        List[List[float]]: Embeddings simulados.
+    """
+    # Ejecuta la pasada en exclusión mutua.
+    with __LOCK:
+        time.sleep(__PASS_COST + __QUERY_COST * len(texts))
+    # Retorna los embeddings.
+    return [[float(len(text))] for text in texts]
+
+
+def measure(embed:Callable[[str], List[float]], clients:int) -> float:
+    """
+    Ejecuta las consultas desde varios clientes concurrentes y mide el rendimiento.
+
+    Args:
+        embed (Callable[[str], List[float]]): Función que embebe una consulta.
+        clients (int): Número de clientes concurrentes.
+    Returns:
+        float: Consultas por segundo.
+    """
+    # Ejecuta las consultas.
+    start:float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(embed, [f"consulta {i}" for i in range(__QUERIES)]))
+    # Retorna el rendimiento.
+    return __QUERIES / (time.perf_counter() - start)
+
+
+# ---- FLUJO PRINCIPAL ---- #
+if __name__ == '__main__':
+
+    print(f"{'clientes':>9} {'secuencial/s':>13} {'agrupado/s':>11} {'lote medio':>11} {'aceleración':>12}")
+
+    # Para cada número de clientes.
+    for clients in __CLIENTS:
+        # Mide el embedding secuencial.
+        sequential:float = measure(embed=lambda query: embed_texts(texts=[query])[0], clients=clients)
+
+        # Mide el embedding agrupado.
+        scheduler:QueryBatchScheduler = QueryBatchScheduler(embed_fn=embed_texts, scheduler_cfg=QuerySchedulerConfig())
+        batched:float = measure(embed=lambda query: scheduler.embed(query=query), clients=clients)
+
+        print(f"{clients:>9} {sequential:>13.1f} {batched:>11.1f} {scheduler.MeanBatchSize:>11.1f} {batched / sequential:>11.2f}x")
\ No newline at end of file
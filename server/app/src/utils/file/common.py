@@ -17,6 +17,7 @@
 # ---- MÓDULOS ---- #
 # Librerías estándar
 import os
+import hashlib
 from pathlib import Path
 from typing import Dict
 # Librerías externas
@@ -24,6 +25,10 @@ from dotenv import dotenv_values
 # Librerías internas
 
 
+# ---- PARÁMETROS ---- #
+__BLOCK_SIZE:int = 1024 * 1024
+
+
 # ---- FUNCIONES ---- #
 def is_valid(file_path:Path, extension:str=None) -> bool:
     """
@@ -85,4 +90,48 @@ def load_env(file_path:Path) -> Dict[str,any]:
     # Si ocurre algún error.
     except Exception as e:
         # Lanza una excepción.
-        raise OSError(f"common::load_env() -> [{type(e).__name__}] No se pudo cargar el fichero <{file_path}>. Trace:{e}")
\ No newline at end of file
+        raise OSError(f"common::load_env() -> [{type(e).__name__}] No se pudo cargar el fichero <{file_path}>. Trace:{e}")
+
+def hash_file(file_path:Path) -> str:
+    """
+    Calcula el hash (SHA-256) del contenido de un fichero. El fichero se lee por bloques
+    para no cargarlo entero en memoria.
+    
+    Args:
+        file_path (Path): Ruta al fichero.
+    Raises:
+        OSError: En caso de que haya algún error.
+    Returns:
+        str: Hash del fichero en hexadecimal.
+    """
+    # Try-Except para manejo de errores.
+    try:
+        # Crea el objeto para calcular el hash.
+        digest = hashlib.sha256()
+        
+        # Abre el fichero en modo binario.
+        with open(file_path, mode='rb') as file:
+            # Lee el fichero por bloques.
+            for block in iter(lambda: file.read(__BLOCK_SIZE), b''):
+                # Actualiza el hash.
+                digest.update(block)
+        
+        # Retorna el hash.
+        return digest.hexdigest()
+    
+    # Si ocurre algún error.
+    except Exception as e:
+        # Lanza una excepción.
+        raise OSError(f"common::hash_file() -> [{type(e).__name__}] No se pudo calcular el hash del fichero <{file_path}>. Trace: {e}")
+
+def hash_text(text:str) -> str:
+    """
+    Calcula el hash (SHA-256) de un texto.
+    
+    Args:
+        text (str): Texto del que calcular el hash.
+    Returns:
+        str: Hash del texto en hexadecimal.
+    """
+    # Retorna el hash.
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
\ No newline at end of file